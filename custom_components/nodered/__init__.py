@@ -11,15 +11,29 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_TYPE
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity_registry import async_entries_for_device, async_get
 
-from .const import CONF_VERSION, DOMAIN, DOMAIN_DATA, STARTUP_MESSAGE, WEBHOOKS
+from .const import (
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_SENSOR,
+    CONF_SWITCH,
+    CONF_VERSION,
+    DOMAIN,
+    DOMAIN_DATA,
+    NODERED_OPTIONS_UPDATE,
+    STARTUP_MESSAGE,
+    WEBHOOKS,
+)
 from .discovery import (
     PLATFORMS_LOADED,
-    SUPPORTED_COMPONENTS,
+    async_load_platform,
     start_discovery,
     stop_discovery,
 )
+from .history import DATA_HISTORY_CACHE
+from .profiler import async_get_profiler
+from .registry import async_get_registry_tracker, async_stop_registry_tracker
 from .version import __version__
 from .websocket import register_websocket_handlers, unregister_all_webhooks
 
@@ -36,11 +50,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Initialize webhook tracking
     domain_data.setdefault(WEBHOOKS, set())
 
-    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_COMPONENTS)
-    domain_data[PLATFORMS_LOADED] = set(SUPPORTED_COMPONENTS)
+    async_get_profiler(hass).async_configure(entry.options)
+    async_get_registry_tracker(hass).async_start()
+
+    # Other platforms are set up when Node-RED first discovers an entity for
+    # them. The switch platform registers the trigger service, which
+    # automations may call before Node-RED connects, so it is always set up.
+    domain_data[PLATFORMS_LOADED] = set()
+    await async_load_platform(hass, entry, CONF_SWITCH)
+    if entry.options.get(CONF_DIAGNOSTIC_SENSORS):
+        await async_load_platform(hass, entry, CONF_SENSOR)
 
     register_websocket_handlers(hass)
-    await start_discovery(hass, domain_data)
+    await start_discovery(hass, domain_data, entry)
     hass.bus.async_fire(DOMAIN, {CONF_TYPE: "loaded", CONF_VERSION: __version__})
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
@@ -63,7 +85,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     if unloaded:
+        async_get_profiler(hass).async_configure({})
         stop_discovery(hass)
+        hass.data.pop(DATA_HISTORY_CACHE, None)
+        async_stop_registry_tracker(hass)
         hass.data.pop(DOMAIN_DATA)
         hass.bus.async_fire(DOMAIN, {CONF_TYPE: "unloaded"})
 
@@ -71,8 +96,15 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    """Apply changed options in place.
+
+    Entities, webhooks and websocket subscriptions stay alive, so Node-RED
+    does not have to rediscover everything after an options change.
+    """
+    async_get_profiler(hass).async_configure(entry.options)
+    if entry.options.get(CONF_DIAGNOSTIC_SENSORS):
+        await async_load_platform(hass, entry, CONF_SENSOR)
+    async_dispatcher_send(hass, NODERED_OPTIONS_UPDATE, entry.options)
 
 
 async def async_remove_config_entry_device(
@@ -67,6 +67,7 @@ class NodeRedBinarySensor(NodeRedEntity, BinarySensorEntity):
         STATE_UNLOCKED,
     )
     component = CONF_BINARY_SENSOR
+    _expirable = True
 
     def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
         """Initialize the binary sensor."""
@@ -1,8 +1,19 @@
 """Adds config flow for Node-RED."""
 
+import voluptuous as vol
+
 from homeassistant import config_entries
+from homeassistant.core import callback
 
-from .const import DOMAIN
+from .const import (
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_PROFILING,
+    CONF_PROFILING_SAMPLES,
+    CONF_PROFILING_THRESHOLD,
+    DEFAULT_PROFILING_SAMPLES,
+    DEFAULT_PROFILING_THRESHOLD,
+    DOMAIN,
+)
 
 
 @config_entries.HANDLERS.register(DOMAIN)
@@ -28,3 +39,50 @@ class NodeRedFlowHandler(config_entries.ConfigFlow):
         if user_input is None:
             return self.async_show_form(step_id="user")
         return self.async_create_entry(title="Node-RED", data={})
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> config_entries.OptionsFlow:
+        """Get the options flow for this handler."""
+        return NodeRedOptionsFlow()
+
+
+class NodeRedOptionsFlow(config_entries.OptionsFlow):
+    """Options flow for Node-RED."""
+
+    async def async_step_init(
+        self, user_input: dict | None = None
+    ) -> config_entries.ConfigFlowResult:
+        """Manage the integration options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_DIAGNOSTIC_SENSORS,
+                        default=options.get(CONF_DIAGNOSTIC_SENSORS, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_PROFILING, default=options.get(CONF_PROFILING, False)
+                    ): bool,
+                    vol.Optional(
+                        CONF_PROFILING_THRESHOLD,
+                        default=options.get(
+                            CONF_PROFILING_THRESHOLD, DEFAULT_PROFILING_THRESHOLD
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Optional(
+                        CONF_PROFILING_SAMPLES,
+                        default=options.get(
+                            CONF_PROFILING_SAMPLES, DEFAULT_PROFILING_SAMPLES
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=50)),
+                }
+            ),
+        )
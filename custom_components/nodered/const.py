@@ -15,36 +15,74 @@ ISSUE_URL = "https://github.com/zachowj/hass-node-red/issues"
 HA_MAX_STATE_LENGTH = 255
 
 # Configuration
+CONF_ACTIONS = "actions"
+CONF_AGGREGATE = "aggregate"
+CONF_AREAS = "areas"
+CONF_ATTRIBUTE_BUDGET = "attribute_budget"
+CONF_ATTRIBUTE_OFFLOAD = "attribute_offload"
+CONF_ATTRIBUTE_OVERFLOW = "attribute_overflow"
 CONF_ATTRIBUTES = "attributes"
+CONF_AVAILABLE = "available"
 CONF_BINARY_SENSOR = "binary_sensor"
 CONF_BUTTON = "button"
+CONF_CALLS = "calls"
 CONF_COMPONENT = "component"
+CONF_CONCURRENCY = "concurrency"
 CONF_CONFIG = "config"
 CONF_CONNECTION = "connection"
 CONF_DATA = "data"
+CONF_DEADBAND = "deadband"
+CONF_DEADBAND_PERCENT = "deadband_percent"
 CONF_DEVICE_INFO = "device_info"
 CONF_DEVICE_TRIGGER = "device_trigger"
+CONF_DEVICES = "devices"
+CONF_DIAGNOSTIC_SENSORS = "diagnostic_sensors"
+CONF_DOMAINS = "domains"
 CONF_ENABLED = "enabled"
+CONF_END_TIME = "end_time"
 CONF_ENTITY_PICTURE = "entity_picture"
+CONF_EPOCH = "epoch"
+CONF_EXCLUDE_FROM_RECORDER = "exclude_from_recorder"
+CONF_EXPIRE_AFTER = "expire_after"
+CONF_FUNCTION = "function"
+CONF_GROUP = "group"
+CONF_HISTORY = "history"
+CONF_LABELS = "labels"
 CONF_LAST_RESET = "last_reset"
+CONF_MAX_SILENCE = "max_silence"
 CONF_MESSAGE = "message"
+CONF_METHOD = "method"
 CONF_NAME = "name"
 CONF_NODE_ID = "node_id"
+CONF_NODE_IDS = "node_ids"
 CONF_NUMBER = "number"
 CONF_OPTIONS = "options"
 CONF_OUTPUT_PATH = "output_path"
+CONF_POINTS = "points"
+CONF_PROFILING = "profiling"
+CONF_PROFILING_SAMPLES = "profiling_samples"
+CONF_PROFILING_THRESHOLD = "profiling_threshold"
 CONF_REMOVE = "remove"
+CONF_ROUND = "round"
 CONF_SELECT = "select"
 CONF_SENSOR = "sensor"
 CONF_SERVER_ID = "server_id"
 CONF_SKIP_CONDITION = "skip_condition"
+CONF_START_TIME = "start_time"
 CONF_STATE_CLASS = "state_class"
+CONF_STATE_ONLY = "state_only"
 CONF_SUB_TYPE = "sub_type"
+CONF_SUBSCRIBE = "subscribe"
 CONF_SWITCH = "switch"
+CONF_TEMPLATE = "template"
+CONF_TEMPLATES = "templates"
 CONF_TEXT = "text"
 CONF_TIME = "time"
 CONF_TRIGGER_ENTITY_ID = "trigger_entity_id"
+CONF_UNRECORDED_ATTRIBUTES = "unrecorded_attributes"
+CONF_VARIABLES = "variables"
 CONF_VERSION = "version"
+CONF_WINDOW = "window"
 
 EVENT_VALUE_CHANGE = "value_change"
 
@@ -53,11 +91,36 @@ NODERED_DISCOVERY_NEW = "nodered_discovery_new_{}"
 NODERED_DISCOVERY_UPDATED = "nodered_discovery_updated_{}"
 NODERED_ENTITY = "nodered_entity_{}_{}"
 NODERED_CONFIG_UPDATE = "nodered_config_update_{}_{}"
+NODERED_OPTIONS_UPDATE = "nodered_options_update"
 
 SERVICE_TRIGGER = "trigger"
 
+# How attributes over an entity's attribute_budget are handled
+ATTRIBUTE_OVERFLOW_DROP = "drop"
+ATTRIBUTE_OVERFLOW_TRUNCATE = "truncate"
+
+# Aggregate functions for windowed sensors
+AGGREGATE_LAST = "last"
+AGGREGATE_MAX = "max"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+
+# Downsampling methods for recorder history
+DOWNSAMPLE_BUCKET = "bucket"
+DOWNSAMPLE_LTTB = "lttb"
+
+# Server id used for the integration's own diagnostic sensors
+DIAGNOSTICS_SERVER_ID = "diagnostics"
+
+NS_PER_MS = 1_000_000
+
 # Defaults
 NAME = "Node-RED Companion"
+DEFAULT_ACTION_CONCURRENCY = 10
+MAX_ACTION_CONCURRENCY = 100
+MAX_HISTORY_POINTS = 10_000
+DEFAULT_PROFILING_SAMPLES = 0
+DEFAULT_PROFILING_THRESHOLD = 50
 NUMBER_ICON = "mdi:numeric"
 SWITCH_ICON = "mdi:electric-switch-closed"
 SELECT_ICON = "mdi:format-list-bulleted"
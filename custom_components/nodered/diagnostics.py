@@ -0,0 +1,30 @@
+"""Diagnostics support for Node-RED."""
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN_DATA, VERSION
+from .discovery import ALREADY_DISCOVERED, PLATFORMS_LOADED, DiscoveryIndex
+from .stats import async_stats_snapshot
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_data = hass.data.get(DOMAIN_DATA, {})
+    index: DiscoveryIndex = domain_data.get(ALREADY_DISCOVERED, DiscoveryIndex())
+
+    return {
+        "version": VERSION,
+        "entry": {
+            "title": entry.title,
+            "options": dict(entry.options),
+        },
+        "platforms_loaded": sorted(domain_data.get(PLATFORMS_LOADED, ())),
+        "discovered": len(index),
+        "discovered_per_server": index.sizes(),
+        "stats": async_stats_snapshot(hass),
+    }
@@ -1,14 +1,18 @@
 """Support for Node-RED discovery."""
 
+import asyncio
 import logging
 from typing import Any
 
 from homeassistant.components.websocket_api.connection import ActiveConnection
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry, OperationNotAllowed
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
 )
+from homeassistant.helpers.entity_platform import async_get_platforms
 
 from .const import (
     CONF_BINARY_SENSOR,
@@ -29,6 +33,8 @@ from .const import (
     NODERED_DISCOVERY_NEW,
     NODERED_DISCOVERY_UPDATED,
 )
+from .profiler import KIND_DISCOVERY, async_get_profiler
+from .stats import async_get_stats
 
 SUPPORTED_COMPONENTS = [
     CONF_BINARY_SENSOR,
@@ -46,11 +52,83 @@ _LOGGER = logging.getLogger(__name__)
 ALREADY_DISCOVERED = "already_discovered"
 CHANGE_ENTITY_TYPE = "change_entity_type"
 PLATFORMS_LOADED = "platforms_loaded"
+PLATFORMS_PENDING = "platforms_pending"
 DISCOVERY_DISPATCHED = "discovery_dispatched"
 
 
-async def start_discovery(hass: HomeAssistant, hass_config: dict) -> None:
-    """Initialize of Node-RED Discovery."""
+class DiscoveryIndex:
+    """Discovered nodes, partitioned by Node-RED server.
+
+    Maps server_id -> node_id -> component. Entries are removed whenever the
+    entity for a node is removed so the index only tracks live nodes.
+    """
+
+    __slots__ = ("_servers", "_size")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._servers: dict[str, dict[str, str]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of discovered nodes."""
+        return self._size
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        """Return True if (server_id, node_id) has been discovered."""
+        server_id, node_id = key
+        return node_id in self._servers.get(server_id, ())
+
+    def add(self, server_id: str, node_id: str, component: str) -> None:
+        """Record a discovered node, replacing its component if already known."""
+        nodes = self._servers.setdefault(server_id, {})
+        if node_id not in nodes:
+            self._size += 1
+        nodes[node_id] = component
+
+    def get(self, server_id: str, node_id: str) -> str | None:
+        """Return the component of a discovered node."""
+        return self._servers.get(server_id, {}).get(node_id)
+
+    def remove(self, server_id: str, node_id: str) -> str | None:
+        """Forget a node, returning its component if it was discovered."""
+        if (nodes := self._servers.get(server_id)) is None:
+            return None
+        if (component := nodes.pop(node_id, None)) is not None:
+            self._size -= 1
+            if not nodes:
+                del self._servers[server_id]
+        return component
+
+    def nodes(self, server_id: str) -> list[str]:
+        """Return the discovered node ids of a server."""
+        return list(self._servers.get(server_id, ()))
+
+    def sizes(self) -> dict[str, int]:
+        """Return the number of discovered nodes per server."""
+        return {server_id: len(nodes) for server_id, nodes in self._servers.items()}
+
+
+@callback
+def async_get_discovery_index(hass: HomeAssistant) -> DiscoveryIndex:
+    """Return the discovery index, creating it on first use."""
+    data = hass.data[DOMAIN_DATA]
+    if (index := data.get(ALREADY_DISCOVERED)) is None:
+        index = data[ALREADY_DISCOVERED] = DiscoveryIndex()
+    return index
+
+
+async def start_discovery(
+    hass: HomeAssistant, hass_config: dict, entry: ConfigEntry
+) -> None:
+    """Initialize of Node-RED Discovery.
+
+    Platforms are set up the first time Node-RED discovers an entity for them.
+    Discovery messages arriving while a platform loads are queued, keeping
+    only the latest message per entity, and replayed once it is ready.
+    """
+    stats = async_get_stats(hass)
+    profiler = async_get_profiler(hass)
 
     async def async_device_message_received(
         msg: dict[str, Any], connection: ActiveConnection
@@ -69,29 +147,43 @@ async def start_discovery(hass: HomeAssistant, hass_config: dict) -> None:
 
         _LOGGER.debug("Discovery message: %s", msg)
 
-        if ALREADY_DISCOVERED not in data:
-            data[ALREADY_DISCOVERED] = set()
-
         # Check if already discovered
-        already_discovered = discovery_hash in data[ALREADY_DISCOVERED]
-
-        if already_discovered:
-            log_text = "Removing" if CONF_REMOVE in msg else "Updating"
+        if (
+            known_component := async_get_discovery_index(hass).get(server_id, node_id)
+        ) is not None:
+            if CONF_REMOVE not in msg and known_component != component:
+                # The node switched platforms, the entity migrates itself
+                msg[CONF_REMOVE] = CHANGE_ENTITY_TYPE
+                log_text = "Migrating"
+                stats.discovery["updated"] += 1
+            elif CONF_REMOVE in msg:
+                log_text = "Removing"
+                stats.discovery["removed"] += 1
+            else:
+                log_text = "Updating"
+                stats.discovery["updated"] += 1
 
             _LOGGER.info("%s %s %s %s", log_text, component, server_id, node_id)
 
-            async_dispatcher_send(
-                hass, NODERED_DISCOVERY_UPDATED.format(discovery_hash), msg, connection
+            profiler.run(
+                KIND_DISCOVERY,
+                component,
+                server_id,
+                node_id,
+                async_dispatcher_send,
+                hass,
+                NODERED_DISCOVERY_UPDATED.format(discovery_hash),
+                msg,
+                connection,
             )
+        elif component in data.setdefault(PLATFORMS_LOADED, set()):
+            _async_create_entity(hass, msg, connection)
+        elif component in (pending := data.setdefault(PLATFORMS_PENDING, {})):
+            # Platform is already loading, the latest message wins
+            pending[component][discovery_hash] = (msg, connection)
         else:
-            # Add component - ensure platform is set up first
-            _LOGGER.info("Creating %s %s %s", component, server_id, node_id)
-
-            data[ALREADY_DISCOVERED].add(discovery_hash)
-
-            async_dispatcher_send(
-                hass, NODERED_DISCOVERY_NEW.format(component), msg, connection
-            )
+            pending[component] = {discovery_hash: (msg, connection)}
+            await _async_setup_platform(hass, entry, component)
 
     hass.data[DOMAIN_DATA][DISCOVERY_DISPATCHED] = async_dispatcher_connect(
         hass,
@@ -100,6 +192,128 @@ async def start_discovery(hass: HomeAssistant, hass_config: dict) -> None:
     )
 
 
+async def async_load_platform(
+    hass: HomeAssistant, entry: ConfigEntry, component: str
+) -> None:
+    """Set up a platform unless it is already loaded or loading."""
+    data = hass.data[DOMAIN_DATA]
+    pending = data.setdefault(PLATFORMS_PENDING, {})
+    if component in data.setdefault(PLATFORMS_LOADED, set()) or component in pending:
+        return
+    pending[component] = {}
+    await _async_setup_platform(hass, entry, component)
+
+
+async def _async_setup_platform(
+    hass: HomeAssistant, entry: ConfigEntry, component: str
+) -> None:
+    """Set up a platform and replay the discovery messages queued for it."""
+    data = hass.data[DOMAIN_DATA]
+    _LOGGER.debug("Loading %s platform", component)
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, [component])
+    except OperationNotAllowed as err:
+        _LOGGER.warning("Unable to load %s platform: %s", component, err)
+        data[PLATFORMS_PENDING].pop(component, None)
+        return
+
+    data[PLATFORMS_LOADED].add(component)
+    index = async_get_discovery_index(hass)
+    for msg, connection in data[PLATFORMS_PENDING].pop(component, {}).values():
+        if (msg[CONF_SERVER_ID], msg[CONF_NODE_ID]) not in index:
+            _async_create_entity(hass, msg, connection)
+
+
+def _async_create_entity(
+    hass: HomeAssistant,
+    msg: dict[str, Any],
+    connection: ActiveConnection,
+) -> None:
+    """Dispatch a new entity to its platform."""
+    component = msg[CONF_COMPONENT]
+    server_id = msg[CONF_SERVER_ID]
+    node_id = msg[CONF_NODE_ID]
+
+    _LOGGER.info("Creating %s %s %s", component, server_id, node_id)
+
+    async_get_discovery_index(hass).add(server_id, node_id, component)
+    async_get_stats(hass).discovery["created"] += 1
+
+    async_get_profiler(hass).run(
+        KIND_DISCOVERY,
+        component,
+        server_id,
+        node_id,
+        async_dispatcher_send,
+        hass,
+        NODERED_DISCOVERY_NEW.format(component),
+        msg,
+        connection,
+    )
+
+
+async def async_remove_nodes(
+    hass: HomeAssistant, server_id: str, node_ids: list[str] | None
+) -> tuple[list[str], list[str]]:
+    """Remove the entities of several nodes in one pass.
+
+    With node_ids None every node of the server is removed. Returns the node
+    ids that were removed and those no entity was found for.
+    """
+    prefix = f"{DOMAIN}-{server_id}-"
+    data = hass.data[DOMAIN_DATA]
+    index = async_get_discovery_index(hass)
+    entity_registry = er.async_get(hass)
+
+    entities = {
+        entity.unique_id: entity
+        for platform in async_get_platforms(hass, DOMAIN)
+        for entity in platform.entities.values()
+        if entity.unique_id is not None and entity.unique_id.startswith(prefix)
+    }
+    registry_entries = {
+        entry.unique_id: entry.entity_id
+        for entry in entity_registry.entities.values()
+        if entry.platform == DOMAIN and entry.unique_id.startswith(prefix)
+    }
+    if node_ids is None:
+        node_ids = sorted(
+            {
+                *(unique_id.removeprefix(prefix) for unique_id in entities),
+                *(unique_id.removeprefix(prefix) for unique_id in registry_entries),
+                *index.nodes(server_id),
+            }
+        )
+
+    removed: list[str] = []
+    not_found: list[str] = []
+    to_remove = []
+    for node_id in node_ids:
+        unique_id = f"{prefix}{node_id}"
+        entity = entities.get(unique_id)
+        entity_id = registry_entries.get(unique_id)
+        discovered = index.remove(server_id, node_id) is not None
+        if not discovered and entity is None and entity_id is None:
+            not_found.append(node_id)
+            continue
+        removed.append(node_id)
+        for pending in data.get(PLATFORMS_PENDING, {}).values():
+            pending.pop(unique_id, None)
+        if entity is not None:
+            to_remove.append(entity.async_remove(force_remove=True))
+
+    # Remove all states first so the registry removals below do not trigger
+    # a second, per entity removal
+    await asyncio.gather(*to_remove)
+    for node_id in removed:
+        if (entity_id := registry_entries.get(f"{prefix}{node_id}")) is not None:
+            entity_registry.async_remove(entity_id)
+
+    async_get_stats(hass).discovery["removed"] += len(removed)
+    _LOGGER.info("Removed %s nodes of server %s", len(removed), server_id)
+    return removed, not_found
+
+
 def stop_discovery(hass: HomeAssistant) -> None:
     """Remove discovery dispatcher."""
     hass.data[DOMAIN_DATA][DISCOVERY_DISPATCHED]()
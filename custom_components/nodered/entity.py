@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
-from contextlib import suppress
+import logging
+from time import time
 from typing import TYPE_CHECKING, Any, ClassVar
 
 from homeassistant.const import (
     CONF_DEVICE_CLASS,
     CONF_ENTITY_CATEGORY,
     CONF_ICON,
+    CONF_STATE,
     CONF_UNIT_OF_MEASUREMENT,
+    MATCH_ALL,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
     EntityCategory,
 )
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback, split_entity_id
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.dispatcher import (
@@ -21,21 +26,30 @@ from homeassistant.helpers.dispatcher import (
 )
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_registry import async_get
+from homeassistant.helpers.event import async_call_later
 
 if TYPE_CHECKING:
     from homeassistant.components.websocket_api.connection import ActiveConnection
 
 from .const import (
+    ATTRIBUTE_OVERFLOW_TRUNCATE,
+    CONF_ATTRIBUTE_BUDGET,
+    CONF_ATTRIBUTE_OFFLOAD,
+    CONF_ATTRIBUTE_OVERFLOW,
     CONF_ATTRIBUTES,
     CONF_COMPONENT,
     CONF_CONFIG,
     CONF_DEVICE_INFO,
     CONF_ENTITY_PICTURE,
+    CONF_EXCLUDE_FROM_RECORDER,
+    CONF_EXPIRE_AFTER,
+    CONF_HISTORY,
     CONF_NAME,
     CONF_NODE_ID,
     CONF_OPTIONS,
     CONF_REMOVE,
     CONF_SERVER_ID,
+    CONF_UNRECORDED_ATTRIBUTES,
     DOMAIN,
     DOMAIN_DATA,
     NODERED_CONFIG_UPDATE,
@@ -43,18 +57,99 @@ from .const import (
     NODERED_DISCOVERY_UPDATED,
     NODERED_ENTITY,
 )
-from .discovery import ALREADY_DISCOVERED, CHANGE_ENTITY_TYPE
+from .discovery import ALREADY_DISCOVERED, CHANGE_ENTITY_TYPE, DiscoveryIndex
+from .expiry import async_get_expiry
+from .filters import DEADBAND_OPTIONS, Deadband, as_number
+from .history import MAX_HISTORY_SIZE, HistoryBuffer
+from .profiler import KIND_ENTITY, async_get_profiler
+from .stats import async_get_stats
+from .utils import apply_attribute_budget, intern_attributes
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DEVICE_INDEX = f"{DOMAIN}_device_index"
 
 
 class MissingConfigError(TypeError):
     """Raised when config is missing required values."""
 
 
+class DeviceIndex:
+    """Live entities grouped by the Node-RED device they belong to.
+
+    Keyed by the `device_info.id` sent by Node-RED. Also remembers which
+    devices were reported unavailable so entities added later start in the
+    same state.
+    """
+
+    __slots__ = ("_devices", "_unavailable")
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._devices: dict[str, set[NodeRedEntity]] = {}
+        self._unavailable: set[str] = set()
+
+    def add(self, device_id: str, entity: NodeRedEntity) -> None:
+        """Link an entity to a device."""
+        self._devices.setdefault(device_id, set()).add(entity)
+
+    def remove(self, device_id: str, entity: NodeRedEntity) -> None:
+        """Unlink an entity from a device."""
+        if (entities := self._devices.get(device_id)) is None:
+            return
+        entities.discard(entity)
+        if not entities:
+            del self._devices[device_id]
+
+    def entities(self, device_id: str) -> set[NodeRedEntity]:
+        """Return the entities linked to a device."""
+        return self._devices.get(device_id, set())
+
+    def is_available(self, device_id: str) -> bool:
+        """Return False if the device was last reported unavailable."""
+        return device_id not in self._unavailable
+
+    def set_available(self, device_id: str, available: bool) -> None:
+        """Record the availability reported for a device."""
+        if available:
+            self._unavailable.discard(device_id)
+        else:
+            self._unavailable.add(device_id)
+
+
+@callback
+def async_get_device_index(hass: HomeAssistant) -> DeviceIndex:
+    """Return the device index, creating it on first use."""
+    if (index := hass.data.get(DATA_DEVICE_INDEX)) is None:
+        index = hass.data[DATA_DEVICE_INDEX] = DeviceIndex()
+    return index
+
+
 class NodeRedEntity(Entity):
     """Base entity for Node-RED integration."""
 
     component: ClassVar[str] = ""
     _bidirectional = False
+    # Whether the entity belongs to a node discovered from Node-RED. Other
+    # entities take no Node-RED messages and are not counted as managed
+    _discovered = True
+    _attribute_budget = 0
+    # Whether the entity supports expire_after
+    _expirable = False
+    _expire_after: float = 0
+    # Availability is the conjunction of the device availability reported by
+    # Node-RED, the bidirectional connection and the expire_after deadline
+    _device_available = True
+    _connected = True
+    _expired = False
+    _deadband: Deadband | None = None
+    # Discovery options the deadband was built from
+    _deadband_options: tuple[Any, ...] | None = None
+    _cancel_deadband_flush: CALLBACK_TYPE | None = None
+    # Recent numeric states sent by Node-RED, kept when history is configured
+    history: HistoryBuffer | None = None
+    # Set by update_entity_state_attributes when the update changes nothing
+    _write_suppressed = False
 
     def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
         """Initialize the entity."""
@@ -62,6 +157,9 @@ class NodeRedEntity(Entity):
             msg = f"{type(self).__name__} must set class attribute `component`"
             raise TypeError(msg)
         self.hass = hass
+        self._stats = async_get_stats(hass)
+        self._profiler = async_get_profiler(hass)
+        self._expiry = async_get_expiry(hass)
         self._server_id = config.get(CONF_SERVER_ID)
         self._node_id = config.get(CONF_NODE_ID)
         if self._server_id is None or self._node_id is None:
@@ -69,9 +167,13 @@ class NodeRedEntity(Entity):
             raise MissingConfigError(msg)
         self._attr_unique_id = f"{DOMAIN}-{self._server_id}-{self._node_id}"
         self._attr_should_poll = False
+        # Original values of attributes kept out of the state by the budget
+        self._offloaded_attributes: dict[str, Any] = {}
+        self._warned_oversized = False
 
         device_info = config.get(CONF_DEVICE_INFO, {})
         device_id = device_info.get("id")
+        self._device_id: str | None = device_id or None
         if device_id:
             self._attr_device_info = DeviceInfo(
                 identifiers=generate_device_identifiers(device_id),
@@ -85,28 +187,174 @@ class NodeRedEntity(Entity):
             self._attr_device_info = None
 
         self.update_discovery_config(config)
+        self._record_history(config)
         self.update_entity_state_attributes(config)
 
     @callback
     def handle_config_update(self, msg: dict[str, Any]) -> None:
         """Handle an incoming config update and write state."""
+        self._profiler.run(
+            KIND_ENTITY,
+            self.entity_id,
+            self._server_id,
+            self._node_id,
+            self._async_config_update,
+            msg,
+        )
+
+    @callback
+    def _async_config_update(self, msg: dict[str, Any]) -> None:
+        """Apply a config update and write state."""
         self.update_config(msg)
+        self._stats.record_state_write()
         self.async_write_ha_state()
 
     @callback
     def handle_entity_update(self, msg: dict[str, Any]) -> None:
         """Update entity state attributes and write state."""
+        self._profiler.run(
+            KIND_ENTITY,
+            self.entity_id,
+            self._server_id,
+            self._node_id,
+            self._async_entity_update,
+            msg,
+        )
+
+    @callback
+    def _async_entity_update(self, msg: dict[str, Any]) -> None:
+        """Apply an entity update and write state."""
+        self._write_suppressed = False
+        self._record_history(msg)
         self.update_entity_state_attributes(msg)
+        if self._expire_after and self._expiry.touch(self._attr_unique_id):
+            self._expired = False
+            self._write_suppressed = False
+        if self._write_suppressed:
+            self._stats.suppressed_writes += 1
+            return
+        self._stats.record_state_write()
         self.async_write_ha_state()
 
+    def _record_history(self, msg: dict[str, Any]) -> None:
+        """Add a numeric state from Node-RED to the entity's history."""
+        if (
+            self.history is not None
+            and (value := as_number(msg.get(CONF_STATE))) is not None
+        ):
+            self.history.add(time(), value)
+
     def update_entity_state_attributes(self, msg: dict[str, Any]) -> None:
         """Set extra state attributes from incoming message."""
-        self._attr_extra_state_attributes = msg.get(CONF_ATTRIBUTES, {})
+        attributes = intern_attributes(msg.get(CONF_ATTRIBUTES, {}))
+        if self._attribute_budget:
+            attributes = self._apply_attribute_budget(attributes)
+        self._attr_extra_state_attributes = attributes
+
+    def _apply_attribute_budget(self, attributes: dict[str, Any]) -> dict[str, Any]:
+        """Drop or truncate attributes over the entity's byte budget."""
+        kept, overflow = apply_attribute_budget(
+            attributes,
+            self._attribute_budget,
+            self._config.get(CONF_ATTRIBUTE_OVERFLOW) == ATTRIBUTE_OVERFLOW_TRUNCATE,
+        )
+        if self._config.get(CONF_ATTRIBUTE_OFFLOAD):
+            self._offloaded_attributes = overflow
+        if overflow:
+            self._stats.oversized_attributes += 1
+            if not self._warned_oversized:
+                self._warned_oversized = True
+                _LOGGER.warning(
+                    "Attributes %s of %s exceed its budget of %s bytes "
+                    "(server_id: %s, node_id: %s)",
+                    sorted(overflow),
+                    self.entity_id or self.unique_id,
+                    self._attribute_budget,
+                    self._server_id,
+                    self._node_id,
+                )
+        return kept
+
+    def _update_deadband(self, config: dict[str, Any]) -> None:
+        """Rebuild the deadband when its discovery options changed."""
+        options = tuple(config.get(key) for key in DEADBAND_OPTIONS)
+        if options == self._deadband_options:
+            return
+        self._deadband_options = options
+        self._deadband = Deadband.from_config(config)
+        self._async_cancel_deadband_flush()
+
+    def _apply_deadband(
+        self,
+        value: Any,
+        previous_attributes: dict[str, Any] | None,
+        force: bool = False,
+    ) -> tuple[Any, bool]:
+        """Run a new state value through the entity's deadband.
+
+        Returns the value to publish and whether it should replace the current
+        state. The state write is skipped when the value is held back and the
+        attributes did not change either. A held back value is flushed once
+        max_silence has passed, even without further updates.
+        """
+        if self._deadband is None:
+            return value, True
+        value, publish = self._deadband.filter(value, force)
+        if publish:
+            self._async_cancel_deadband_flush()
+            return value, True
+        if previous_attributes == self._attr_extra_state_attributes:
+            self._write_suppressed = True
+        if (
+            self._cancel_deadband_flush is None
+            and self.platform is not None
+            and (delay := self._deadband.flush_delay()) is not None
+        ):
+            self._cancel_deadband_flush = async_call_later(
+                self.hass, delay, self._async_flush_deadband
+            )
+        return value, False
+
+    @callback
+    def _async_flush_deadband(self, _now: Any) -> None:
+        """Publish the value the deadband held back for max_silence."""
+        self._cancel_deadband_flush = None
+        if self._deadband is None or (value := self._deadband.flush()) is None:
+            return
+        # Deadbands are only configured on entities with a native value
+        self._attr_native_value = value
+        self._stats.record_state_write()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_deadband_flush(self) -> None:
+        """Cancel the pending deadband flush, if any."""
+        if self._cancel_deadband_flush is not None:
+            self._cancel_deadband_flush()
+            self._cancel_deadband_flush = None
+
+    def full_attributes(self) -> dict[str, Any]:
+        """Return the attributes including those offloaded from the state."""
+        return {
+            **(self._attr_extra_state_attributes or {}),
+            **self._offloaded_attributes,
+        }
+
+    @property
+    def available(self) -> bool:
+        """Return True if the device, connection and expiry all allow it."""
+        return self._device_available and self._connected and not self._expired
+
+    @callback
+    def handle_device_availability(self, available: bool) -> None:
+        """Apply the availability reported for the entity's device."""
+        self._device_available = available
+        self.async_write_ha_state()
 
     @callback
     def handle_lost_connection(self) -> None:
         """Mark entity unavailable after losing connection."""
-        self._attr_available = False
+        self._connected = False
         self.async_write_ha_state()
 
     @callback
@@ -116,33 +364,11 @@ class NodeRedEntity(Entity):
         """Update entity config/state based on discovery message."""
         if CONF_REMOVE in msg:
             if msg[CONF_REMOVE] == CHANGE_ENTITY_TYPE:
-
-                @callback
-                def recreate_entity() -> None:
-                    del msg[CONF_REMOVE]
-                    async_dispatcher_send(
-                        self.hass,
-                        NODERED_DISCOVERY.format(msg[CONF_COMPONENT]),
-                        msg,
-                        connection,
-                    )
-
-                self.async_on_remove(recreate_entity)
-                # Schedule entity removal; recreation will happen when the on_remove
-                # callback runs and re-dispatches discovery for the new entity
-                self.hass.async_create_task(self.async_remove())
-            else:
-
-                @callback
-                def cleanup_discovery() -> None:
-                    """Remove discovery tracking for this entity, if present."""
-                    with suppress(KeyError):
-                        del self.hass.data[DOMAIN_DATA][ALREADY_DISCOVERED][
-                            self.unique_id
-                        ]
-
-                self.async_on_remove(cleanup_discovery)
-
+                self.hass.async_create_task(
+                    self._async_migrate_entity_type(msg, connection)
+                )
+            # Otherwise the node stays in the discovery index until the entity
+            # is removed from Home Assistant
             return
 
         self.update_discovery_device_info(msg)
@@ -151,13 +377,87 @@ class NodeRedEntity(Entity):
 
         # Bidirectional subscription handling
         if self._bidirectional and "id" in msg:
-            self._attr_available = True
+            self._connected = True
             self._message_id = msg["id"]
             self._connection = connection
             self._connection.subscriptions[msg["id"]] = self.handle_lost_connection
 
         self.async_write_ha_state()
 
+    async def _async_migrate_entity_type(
+        self, msg: dict[str, Any], connection: ActiveConnection
+    ) -> None:
+        """Move this node to another platform in one step.
+
+        Registry entries cannot change domain, so the entry is recreated under
+        the new platform with the same object id, device, area, labels and
+        user overrides before the new entity is discovered. The last state is
+        carried over when the discovery message does not include one.
+        """
+        component = msg[CONF_COMPONENT]
+        entity_registry = async_get(self.hass)
+        old_entry = self.registry_entry
+        if CONF_STATE not in msg and self.state not in (
+            None,
+            STATE_UNAVAILABLE,
+            STATE_UNKNOWN,
+        ):
+            msg[CONF_STATE] = self.state
+
+        # Removing the entity also forgets it in the discovery index
+        await self.async_remove(force_remove=True)
+
+        if old_entry is not None:
+            entity_registry.async_remove(old_entry.entity_id)
+            config_entry = (
+                self.hass.config_entries.async_get_entry(old_entry.config_entry_id)
+                if old_entry.config_entry_id
+                else None
+            )
+            new_entry = entity_registry.async_get_or_create(
+                component,
+                DOMAIN,
+                old_entry.unique_id,
+                config_entry=config_entry,
+                device_id=old_entry.device_id,
+                disabled_by=old_entry.disabled_by,
+                hidden_by=old_entry.hidden_by,
+                suggested_object_id=split_entity_id(old_entry.entity_id)[1],
+            )
+            entity_registry.async_update_entity(
+                new_entry.entity_id,
+                aliases=old_entry.aliases,
+                area_id=old_entry.area_id,
+                icon=old_entry.icon,
+                labels=old_entry.labels,
+                name=old_entry.name,
+            )
+
+        del msg[CONF_REMOVE]
+        async_dispatcher_send(self.hass, NODERED_DISCOVERY, msg, connection)
+
+    @callback
+    def _async_add_to_discovery_index(self) -> None:
+        """Track this entity's node as discovered.
+
+        Entities are removed and added again when their entity id is renamed,
+        so the node is recorded again on every add.
+        """
+        index: DiscoveryIndex | None = self.hass.data.get(DOMAIN_DATA, {}).get(
+            ALREADY_DISCOVERED
+        )
+        if index is not None:
+            index.add(self._server_id, self._node_id, self.component)
+
+    @callback
+    def _async_remove_from_discovery_index(self) -> None:
+        """Remove discovery tracking for this entity, if present."""
+        index: DiscoveryIndex | None = self.hass.data.get(DOMAIN_DATA, {}).get(
+            ALREADY_DISCOVERED
+        )
+        if index is not None:
+            index.remove(self._server_id, self._node_id)
+
     def entity_category_mapper(self, category: str) -> None | EntityCategory:
         """Map Node-RED category strings to Home Assistant EntityCategory."""
         if category == "config":
@@ -178,6 +478,75 @@ class NodeRedEntity(Entity):
         self._attr_entity_picture = self._config.get(CONF_ENTITY_PICTURE)
         self._attr_unit_of_measurement = self._config.get(CONF_UNIT_OF_MEASUREMENT)
 
+        unrecorded = frozenset(self._config.get(CONF_UNRECORDED_ATTRIBUTES, ()))
+        if self._config.get(CONF_EXCLUDE_FROM_RECORDER):
+            unrecorded |= {MATCH_ALL}
+        self._nodered_unrecorded_attributes = unrecorded
+        self._async_apply_unrecorded_attributes()
+
+        budget = self._config.get(CONF_ATTRIBUTE_BUDGET)
+        self._attribute_budget = budget if type(budget) is int and budget > 0 else 0
+        if not self._config.get(CONF_ATTRIBUTE_OFFLOAD):
+            self._offloaded_attributes = {}
+
+        size = self._config.get(CONF_HISTORY)
+        if type(size) is not int or size <= 0:
+            self.history = None
+        else:
+            size = min(size, MAX_HISTORY_SIZE)
+            if self.history is None:
+                self.history = HistoryBuffer(size)
+            elif self.history.capacity != size:
+                self.history = self.history.resized(size)
+
+        expire_after = self._config.get(CONF_EXPIRE_AFTER)
+        self._expire_after = (
+            expire_after
+            if self._expirable
+            and type(expire_after) in (int, float)
+            and expire_after > 0
+            else 0
+        )
+        if self.platform is not None:
+            self._async_track_expiry()
+
+    @callback
+    def _async_track_expiry(self) -> None:
+        """Register the entity's expire_after with the expiry scheduler.
+
+        Registering restarts the deadline, so the entity is no longer expired.
+        """
+        self._expired = False
+        if not self._expire_after:
+            self._expiry.async_remove(self._attr_unique_id)
+            return
+        self._expiry.async_add(
+            self._attr_unique_id, self._expire_after, self._async_expire
+        )
+
+    @callback
+    def _async_expire(self) -> None:
+        """Mark the entity unavailable after no update within expire_after."""
+        self._expired = True
+        self.async_write_ha_state()
+
+    @callback
+    def _async_apply_unrecorded_attributes(self) -> None:
+        """Merge the discovery unrecorded attributes into the state info.
+
+        Home Assistant only reads `_unrecorded_attributes` when the class is
+        created, so per entity exclusions are applied to the state info the
+        recorder sees. It only exists once the entity is added to a platform.
+        """
+        if self._state_info is None:
+            return
+        cls = type(self)
+        self._state_info = {
+            "unrecorded_attributes": cls._entity_component_unrecorded_attributes
+            | cls._unrecorded_attributes
+            | self._nodered_unrecorded_attributes
+        }
+
     def update_config(self, msg: dict[str, Any]) -> None:
         """Apply runtime config updates to the entity."""
         config = msg.get(CONF_CONFIG, {})
@@ -202,6 +571,7 @@ class NodeRedEntity(Entity):
             self.unique_id,
         )
         device_info = msg.get(CONF_DEVICE_INFO)
+        self._async_link_device((device_info or {}).get("id") or None)
 
         # Exit early when there is no device info. If an entity existed, dissociate it from any device.
         if device_info is None:
@@ -235,8 +605,34 @@ class NodeRedEntity(Entity):
         if entity_id is not None:
             entity_registry.async_update_entity(entity_id, device_id=device.id)
 
+    @callback
+    def _async_link_device(self, device_id: str | None) -> None:
+        """Move the entity to another device in the device index."""
+        if device_id == self._device_id:
+            return
+        index = async_get_device_index(self.hass)
+        if self._device_id is not None:
+            index.remove(self._device_id, self)
+        self._device_id = device_id
+        self._device_available = True
+        if device_id is not None:
+            index.add(device_id, self)
+            self._device_available = index.is_available(device_id)
+
     async def async_added_to_hass(self) -> None:
         """Register dispatcher listeners when added to Home Assistant."""
+        self._async_apply_unrecorded_attributes()
+        if not self._discovered:
+            # The integration's own entities take no messages from Node-RED
+            return
+        self._stats.entity_added(self.component)
+        self._async_add_to_discovery_index()
+        if self._device_id is not None:
+            index = async_get_device_index(self.hass)
+            index.add(self._device_id, self)
+            self._device_available = index.is_available(self._device_id)
+        if self._expire_after:
+            self._async_track_expiry()
         self._remove_signal_entity_update = async_dispatcher_connect(
             self.hass,
             NODERED_ENTITY.format(self._server_id, self._node_id),
@@ -255,6 +651,14 @@ class NodeRedEntity(Entity):
 
     async def async_will_remove_from_hass(self) -> None:
         """Remove dispatcher listeners when the entity is removed from hass."""
+        self._async_cancel_deadband_flush()
+        if not self._discovered:
+            return
+        self._stats.entity_removed(self.component)
+        self._async_remove_from_discovery_index()
+        self._expiry.async_remove(self._attr_unique_id)
+        if self._device_id is not None:
+            async_get_device_index(self.hass).remove(self._device_id, self)
         if self._remove_signal_entity_update is not None:
             self._remove_signal_entity_update()
         if self._remove_signal_discovery_update is not None:
@@ -0,0 +1,119 @@
+"""Shared expiry scheduling for entities that go stale without updates."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import heapq
+from time import time
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import DOMAIN
+
+DATA_EXPIRY = f"{DOMAIN}_expiry"
+
+# How often deadlines are checked; expiry fires up to this late
+EXPIRY_RESOLUTION = timedelta(seconds=1)
+
+
+class _Timer:
+    """Deadline of a single tracked entity."""
+
+    __slots__ = ("callback", "deadline", "expire_after", "expired", "scheduled")
+
+    def __init__(self, expire_after: float, expired: Callable[[], None]) -> None:
+        """Initialize the timer."""
+        self.callback = expired
+        self.expire_after = expire_after
+        self.deadline = time() + expire_after
+        self.expired = False
+        # Deadline of this timer's live heap entry, None when not in the heap
+        self.scheduled: float | None = None
+
+
+class ExpiryScheduler:
+    """Expire entities that have not been touched in time.
+
+    All deadlines share one heap checked by a single periodic callback, so
+    an update only stores a new deadline instead of cancelling and creating
+    a timer. Each tracked key has at most one live heap entry; when it comes
+    due and the deadline has moved, it is pushed back with the new one.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._timers: dict[str, _Timer] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._cancel_interval: CALLBACK_TYPE | None = None
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._timers)
+
+    @callback
+    def async_add(
+        self, key: str, expire_after: float, expired: Callable[[], None]
+    ) -> None:
+        """Track key, calling expired when it is not touched in time."""
+        timer = self._timers[key] = _Timer(expire_after, expired)
+        self._schedule(key, timer)
+        if self._cancel_interval is None:
+            self._cancel_interval = async_track_time_interval(
+                self.hass, self._async_check, EXPIRY_RESOLUTION
+            )
+
+    @callback
+    def async_remove(self, key: str) -> None:
+        """Stop tracking key."""
+        if self._timers.pop(key, None) is None or self._timers:
+            return
+        self._heap.clear()
+        if self._cancel_interval is not None:
+            self._cancel_interval()
+            self._cancel_interval = None
+
+    def touch(self, key: str) -> bool:
+        """Push back the deadline of key, returning True if it had expired."""
+        if (timer := self._timers.get(key)) is None:
+            return False
+        timer.deadline = time() + timer.expire_after
+        if not timer.expired:
+            return False
+        timer.expired = False
+        self._schedule(key, timer)
+        return True
+
+    def _schedule(self, key: str, timer: _Timer) -> None:
+        """Add the heap entry for a timer."""
+        timer.scheduled = timer.deadline
+        heapq.heappush(self._heap, (timer.deadline, key))
+
+    @callback
+    def _async_check(self, now: datetime) -> None:
+        """Expire every timer whose deadline has passed."""
+        now_ts = now.timestamp()
+        heap = self._heap
+        timers = self._timers
+        while heap and heap[0][0] <= now_ts:
+            scheduled, key = heapq.heappop(heap)
+            timer = timers.get(key)
+            if timer is None or timer.scheduled != scheduled:
+                # Stale entry for a removed or re-added key
+                continue
+            if timer.deadline > now_ts:
+                self._schedule(key, timer)
+                continue
+            timer.scheduled = None
+            timer.expired = True
+            timer.callback()
+
+
+@callback
+def async_get_expiry(hass: HomeAssistant) -> ExpiryScheduler:
+    """Return the shared expiry scheduler, creating it on first use."""
+    if (expiry := hass.data.get(DATA_EXPIRY)) is None:
+        expiry = hass.data[DATA_EXPIRY] = ExpiryScheduler(hass)
+    return expiry
@@ -0,0 +1,227 @@
+"""Filters applied to numeric entity states before they are written."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping
+from math import fsum, isfinite
+from time import monotonic
+from typing import Any
+
+from .const import (
+    AGGREGATE_LAST,
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_FUNCTION,
+    CONF_MAX_SILENCE,
+    CONF_ROUND,
+    CONF_WINDOW,
+)
+
+# Samples kept per window; older samples are overwritten once it is full
+WINDOW_CAPACITY = 1024
+
+AGGREGATE_FUNCTIONS = frozenset(
+    (AGGREGATE_LAST, AGGREGATE_MAX, AGGREGATE_MEAN, AGGREGATE_MIN)
+)
+
+# Discovery config keys a Deadband and a WindowAggregator are built from
+DEADBAND_OPTIONS = (CONF_DEADBAND, CONF_DEADBAND_PERCENT, CONF_ROUND, CONF_MAX_SILENCE)
+WINDOW_OPTIONS = (CONF_WINDOW, CONF_FUNCTION)
+
+
+def as_number(value: Any) -> float | None:
+    """Return value as a float, None if it is not numeric."""
+    if type(value) is int or type(value) is float:
+        return value
+    if type(value) is str:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _positive(value: Any) -> float:
+    """Return a positive number from the config, 0 when unset or invalid."""
+    if type(value) in (int, float) and value > 0:
+        return value
+    return 0
+
+
+class Deadband:
+    """Suppress numeric state changes too small to be worth a state write.
+
+    A value is published when it differs from the last published value by
+    more than the absolute deadband or the percentage of the last value, or
+    when max_silence seconds have passed since the last publish. Values are
+    rounded first when a number of digits is configured, so jitter below the
+    precision never counts as a change. Non numeric values are always
+    published.
+
+    The last value held back is kept so it can be flushed once max_silence
+    has passed even when no further value arrives.
+    """
+
+    __slots__ = (
+        "_absolute",
+        "_digits",
+        "_held",
+        "_last",
+        "_last_time",
+        "_max_silence",
+        "_percent",
+    )
+
+    def __init__(
+        self,
+        absolute: float = 0,
+        percent: float = 0,
+        digits: int | None = None,
+        max_silence: float = 0,
+    ) -> None:
+        """Initialize the filter."""
+        self._absolute = absolute
+        self._percent = percent
+        self._digits = digits
+        self._max_silence = max_silence
+        self._last: float | None = None
+        self._last_time = 0.0
+        self._held: float | None = None
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> Deadband | None:
+        """Return a filter for the discovery config, None if none is set."""
+        absolute = _positive(config.get(CONF_DEADBAND))
+        percent = _positive(config.get(CONF_DEADBAND_PERCENT))
+        digits = config.get(CONF_ROUND)
+        if type(digits) is not int:
+            digits = None
+        if not absolute and not percent and digits is None:
+            return None
+        return cls(absolute, percent, digits, _positive(config.get(CONF_MAX_SILENCE)))
+
+    def filter(self, value: Any, force: bool = False) -> tuple[Any, bool]:
+        """Return the value to publish and whether it should be published.
+
+        A forced value is published however small the change. Non finite
+        numbers cannot be rounded or compared, so they pass through unchanged.
+        """
+        if (number := as_number(value)) is None or not isfinite(number):
+            self._last = None
+            self._held = None
+            return value, True
+        if self._digits is not None:
+            value = number = round(number, self._digits)
+            if self._digits <= 0:
+                value = int(number)
+
+        now = monotonic()
+        last = self._last
+        if (
+            not force
+            and last is not None
+            and abs(number - last)
+            <= max(self._absolute, abs(last) * self._percent / 100)
+            and (not self._max_silence or now - self._last_time < self._max_silence)
+        ):
+            self._held = value
+            return value, False
+        self._last = number
+        self._last_time = now
+        self._held = None
+        return value, True
+
+    def flush_delay(self) -> float | None:
+        """Return seconds until a held back value is due, None if none is."""
+        if self._held is None or not self._max_silence:
+            return None
+        return max(self._last_time + self._max_silence - monotonic(), 0)
+
+    def flush(self) -> float | None:
+        """Publish the value held back since the last publish, if any."""
+        if (value := self._held) is None:
+            return None
+        self._last = value
+        self._last_time = monotonic()
+        self._held = None
+        return value
+
+
+class WindowAggregator:
+    """Aggregate numeric samples over a fixed time window.
+
+    Samples are stored in a preallocated array used as a ring buffer, so a
+    busy window costs eight bytes per sample and no allocations. When more
+    than the capacity arrive within one window the oldest are overwritten and
+    the aggregate covers the most recent ones; the count still reports every
+    sample received.
+    """
+
+    __slots__ = (
+        "_buffer",
+        "_capacity",
+        "_count",
+        "_index",
+        "_last",
+        "function",
+        "window",
+    )
+
+    def __init__(
+        self, window: float, function: str, capacity: int = WINDOW_CAPACITY
+    ) -> None:
+        """Initialize the buffer."""
+        self.window = window
+        self.function = function
+        self._capacity = capacity
+        self._buffer = array("d", bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+        self._last = 0.0
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> WindowAggregator | None:
+        """Return an aggregator for the discovery config, None if none is set."""
+        if not (window := _positive(config.get(CONF_WINDOW))):
+            return None
+        function = config.get(CONF_FUNCTION, AGGREGATE_MEAN)
+        if function not in AGGREGATE_FUNCTIONS:
+            function = AGGREGATE_MEAN
+        return cls(window, function)
+
+    def __len__(self) -> int:
+        """Return the number of samples received in the current window."""
+        return self._count
+
+    def add(self, value: float) -> None:
+        """Add a sample to the current window."""
+        self._buffer[self._index] = value
+        self._index = (self._index + 1) % self._capacity
+        self._count += 1
+        self._last = value
+
+    def flush(self) -> tuple[float, dict[str, Any]] | None:
+        """Return the aggregate and stats of the window and start a new one.
+
+        Returns None when no samples were received.
+        """
+        if not (count := self._count):
+            return None
+        samples = self._buffer if count >= self._capacity else self._buffer[:count]
+        low = min(samples)
+        high = max(samples)
+        if self.function == AGGREGATE_MEAN:
+            value = fsum(samples) / len(samples)
+        elif self.function == AGGREGATE_MIN:
+            value = low
+        elif self.function == AGGREGATE_MAX:
+            value = high
+        else:
+            value = self._last
+        self._index = 0
+        self._count = 0
+        return value, {"window_min": low, "window_max": high, "window_count": count}
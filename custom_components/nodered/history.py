@@ -0,0 +1,288 @@
+"""History of numeric entity states, in memory and from the recorder."""
+
+from __future__ import annotations
+
+from array import array
+import asyncio
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime
+from math import fsum, isfinite
+from time import monotonic
+from typing import Any, NamedTuple
+
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DOWNSAMPLE_BUCKET
+from .filters import as_number
+
+DATA_HISTORY_CACHE = f"{DOMAIN}_history_cache"
+
+# Upper bound on the samples kept per entity; two doubles each
+MAX_HISTORY_SIZE = 10_000
+
+# Downsampled recorder query results kept for identical queries
+HISTORY_CACHE_SIZE = 32
+# Seconds a result is reused when its range reaches the present, and when it
+# is wholly in the past and can no longer change
+HISTORY_CACHE_TTL = 30
+HISTORY_CACHE_PAST_TTL = 600
+
+
+class HistoryBuffer:
+    """Ring buffer of timestamped numeric samples.
+
+    Timestamps and values live in two preallocated arrays, so each sample
+    costs sixteen bytes and recording one never allocates. Once full the
+    oldest samples are overwritten. Timestamps are expected to be added in
+    order, which lets windows be found by bisection.
+    """
+
+    __slots__ = ("_count", "_index", "_times", "_values", "capacity")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize the buffer."""
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Record a sample, overwriting the oldest when full."""
+        self._times[self._index] = timestamp
+        self._values[self._index] = value
+        self._index = (self._index + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def resized(self, capacity: int) -> HistoryBuffer:
+        """Return a buffer of another capacity holding the newest samples."""
+        buffer = HistoryBuffer(capacity)
+        times, values = self.window()
+        for timestamp, value in zip(times[-capacity:], values[-capacity:], strict=True):
+            buffer.add(timestamp, value)
+        return buffer
+
+    def window(self, start: float | None = None) -> tuple[array[float], array[float]]:
+        """Return the timestamps and values from start onwards, oldest first."""
+        if self._count < self.capacity:
+            times = self._times[: self._count]
+            values = self._values[: self._count]
+        else:
+            index = self._index
+            times = self._times[index:] + self._times[:index]
+            values = self._values[index:] + self._values[:index]
+        if start is not None and (first := bisect_left(times, start)):
+            return times[first:], values[first:]
+        return times, values
+
+    def aggregate(self, start: float | None = None) -> dict[str, Any]:
+        """Return aggregates of the samples from start onwards."""
+        times, values = self.window(start)
+        if not values:
+            return {"count": 0}
+        return {
+            "count": len(values),
+            "start": times[0],
+            "end": times[-1],
+            "first": values[0],
+            "last": values[-1],
+            "min": min(values),
+            "max": max(values),
+            "mean": fsum(values) / len(values),
+        }
+
+
+def lttb(
+    times: Sequence[float], values: Sequence[float], points: int
+) -> list[tuple[float, float]]:
+    """Downsample with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last samples and, from each of the buckets between
+    them, the sample forming the largest triangle with the previously kept
+    sample and the average of the next bucket. This preserves the visual
+    shape of the series, including its peaks.
+    """
+    count = len(times)
+    if points >= count or points < 3:
+        return list(zip(times, values, strict=True))
+
+    sampled = [(times[0], values[0])]
+    every = (count - 2) / (points - 2)
+    kept = 0
+    for bucket in range(points - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, count)
+        next_size = next_end - end
+        avg_time = fsum(times[end:next_end]) / next_size
+        avg_value = fsum(values[end:next_end]) / next_size
+
+        kept_time = times[kept]
+        kept_value = values[kept]
+        dt = kept_time - avg_time
+        dv = avg_value - kept_value
+        best_area = -1.0
+        best = start
+        for index in range(start, end):
+            area = abs(
+                dt * (values[index] - kept_value) - (kept_time - times[index]) * dv
+            )
+            if area > best_area:
+                best_area = area
+                best = index
+        sampled.append((times[best], values[best]))
+        kept = best
+    sampled.append((times[-1], values[-1]))
+    return sampled
+
+
+def bucket_downsample(
+    times: Sequence[float], values: Sequence[float], points: int
+) -> list[tuple[float, float, float, float]]:
+    """Downsample into equal time buckets.
+
+    Returns the start, mean, min and max of each bucket holding samples.
+    Samples must be in time order.
+    """
+    if not times:
+        return []
+    first = times[0]
+    width = (times[-1] - first) / points
+    buckets: list[tuple[float, float, float, float]] = []
+    low = 0
+    for bucket in range(points):
+        if bucket == points - 1:
+            high = len(times)
+        else:
+            high = bisect_left(times, first + (bucket + 1) * width, low)
+        if high > low:
+            chunk = values[low:high]
+            buckets.append(
+                (
+                    first + bucket * width,
+                    fsum(chunk) / len(chunk),
+                    min(chunk),
+                    max(chunk),
+                )
+            )
+        low = high
+    return buckets
+
+
+class HistoryQuery(NamedTuple):
+    """A recorder history query, also used as its cache key."""
+
+    entity_ids: tuple[str, ...]
+    start_time: datetime
+    end_time: datetime | None
+    points: int | None
+    method: str
+
+
+def fetch_recorder_history(
+    hass: HomeAssistant, query: HistoryQuery
+) -> dict[str, list[Any]]:
+    """Query numeric states from the recorder and downsample them.
+
+    Must run in the recorder executor. Non numeric states are skipped.
+    """
+    from homeassistant.components.recorder import history  # noqa: PLC0415
+
+    states = history.get_significant_states(
+        hass,
+        query.start_time,
+        query.end_time,
+        list(query.entity_ids),
+        include_start_time_state=True,
+        significant_changes_only=False,
+        minimal_response=True,
+        no_attributes=True,
+        compressed_state_format=True,
+    )
+    result: dict[str, list[Any]] = {}
+    for entity_id, rows in states.items():
+        times = array("d")
+        values = array("d")
+        for row in rows:
+            value = as_number(row[COMPRESSED_STATE_STATE])  # type: ignore[index]
+            if value is not None and isfinite(value):
+                times.append(row[COMPRESSED_STATE_LAST_UPDATED])  # type: ignore[index]
+                values.append(value)
+        if query.points is None:
+            result[entity_id] = list(zip(times, values, strict=True))
+        elif query.method == DOWNSAMPLE_BUCKET:
+            result[entity_id] = bucket_downsample(times, values, query.points)
+        else:
+            result[entity_id] = lttb(times, values, query.points)
+    return result
+
+
+class HistoryCache:
+    """Least recently used cache of pending and finished history queries.
+
+    Futures are cached rather than results, so identical queries made while
+    one is still running share it. Every entry expires, sooner when its range
+    reaches the present. Failed queries are dropped.
+    """
+
+    __slots__ = ("_entries", "_max_size", "_past_ttl", "_ttl")
+
+    def __init__(
+        self,
+        max_size: int = HISTORY_CACHE_SIZE,
+        ttl: float = HISTORY_CACHE_TTL,
+        past_ttl: float = HISTORY_CACHE_PAST_TTL,
+    ) -> None:
+        """Initialize the cache."""
+        self._max_size = max_size
+        self._ttl = ttl
+        self._past_ttl = past_ttl
+        self._entries: OrderedDict[HistoryQuery, tuple[asyncio.Future[Any], float]] = (
+            OrderedDict()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of cached queries."""
+        return len(self._entries)
+
+    def get(self, key: HistoryQuery) -> asyncio.Future[Any] | None:
+        """Return the future result of a query, None if missing or expired."""
+        if (entry := self._entries.get(key)) is None:
+            return None
+        future, expires = entry
+        if monotonic() >= expires:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return future
+
+    def add(self, key: HistoryQuery, future: asyncio.Future[Any], live: bool) -> None:
+        """Cache a query, with the shorter TTL when its range is live."""
+        ttl = self._ttl if live else self._past_ttl
+        self._entries[key] = (future, monotonic() + ttl)
+        if len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+        def discard_failed(done: asyncio.Future[Any]) -> None:
+            if done.cancelled() or done.exception() is not None:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] is done:
+                    del self._entries[key]
+
+        future.add_done_callback(discard_failed)
+
+
+@callback
+def async_get_history_cache(hass: HomeAssistant) -> HistoryCache:
+    """Return the history query cache, creating it on first use."""
+    if (cache := hass.data.get(DATA_HISTORY_CACHE)) is None:
+        cache = hass.data[DATA_HISTORY_CACHE] = HistoryCache()
+    return cache
@@ -33,6 +33,7 @@ from .const import (
     NUMBER_ICON,
 )
 from .entity import NodeRedEntity
+from .filters import as_number
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -86,6 +87,8 @@ class NodeRedNumber(NodeRedEntity, RestoreNumber):
     _attr_mode = NumberMode.AUTO
     _bidirectional = True
     component = CONF_NUMBER
+    # Value last set from Home Assistant, shown even within the deadband
+    _commanded_value: float | None = None
 
     def __init__(
         self,
@@ -99,7 +102,6 @@ class NodeRedNumber(NodeRedEntity, RestoreNumber):
         self._connection = connection
 
         self._attr_icon = self._config.get(CONF_ICON, NUMBER_ICON)
-        self._attr_native_value = config.get(CONF_STATE)
 
         self._attr_native_min_value = self._config.get(
             CONF_MIN_VALUE, DEFAULT_MIN_VALUE
@@ -112,6 +114,7 @@ class NodeRedNumber(NodeRedEntity, RestoreNumber):
 
     async def async_set_native_value(self, value: float) -> None:
         """Set new value."""
+        self._commanded_value = value
         self._connection.send_message(
             event_message(
                 self._message_id, {CONF_TYPE: EVENT_VALUE_CHANGE, CONF_VALUE: value}
@@ -130,8 +133,18 @@ class NodeRedNumber(NodeRedEntity, RestoreNumber):
 
     def update_entity_state_attributes(self, msg: dict[str, Any]) -> None:
         """Update the entity state attributes."""
+        previous_attributes = getattr(self, "_attr_extra_state_attributes", None)
         super().update_entity_state_attributes(msg)
-        self._attr_native_value = msg.get(CONF_STATE)
+        value = msg.get(CONF_STATE)
+        commanded = (
+            self._commanded_value is not None
+            and as_number(value) == self._commanded_value
+        )
+        if commanded:
+            self._commanded_value = None
+        value, publish = self._apply_deadband(value, previous_attributes, commanded)
+        if publish:
+            self._attr_native_value = value
 
     def update_config(self, msg: dict[str, Any]) -> None:
         """Update entity config."""
@@ -165,3 +178,4 @@ class NodeRedNumber(NodeRedEntity, RestoreNumber):
         self._attr_native_unit_of_measurement = self._config.get(
             CONF_UNIT_OF_MEASUREMENT
         )
+        self._update_deadband(self._config)
@@ -0,0 +1,219 @@
+"""Opt-in profiling of Node-RED handlers."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Mapping
+import cProfile
+import heapq
+import logging
+from pathlib import Path
+from time import perf_counter_ns, time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import slugify
+
+from .const import (
+    CONF_PROFILING,
+    CONF_PROFILING_SAMPLES,
+    CONF_PROFILING_THRESHOLD,
+    DEFAULT_PROFILING_SAMPLES,
+    DEFAULT_PROFILING_THRESHOLD,
+    DOMAIN,
+    NS_PER_MS,
+)
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+    from homeassistant.components.websocket_api.const import WebSocketCommandHandler
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_PROFILER = f"{DOMAIN}_profiler"
+PROFILE_DIR = "nodered_profiles"
+
+# Only one in this many invocations runs under cProfile to bound the overhead
+PROFILE_SAMPLE_INTERVAL = 20
+
+KIND_DISCOVERY = "discovery"
+KIND_ENTITY = "entity"
+KIND_WEBSOCKET = "websocket"
+
+
+class NodeRedProfiler:
+    """Time handlers and keep cProfile traces of the slowest invocations."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the profiler, disabled until configured."""
+        self.hass = hass
+        self.enabled = False
+        self._threshold_ns = DEFAULT_PROFILING_THRESHOLD * NS_PER_MS
+        self._samples = 0
+        self._calls = 0
+        # Min-heap of (elapsed_ns, path) for the traces kept on disk
+        self._slowest: list[tuple[int, str]] = []
+
+    @callback
+    def async_configure(self, options: Mapping[str, Any]) -> None:
+        """Apply the profiling options of the config entry."""
+        self.enabled = options.get(CONF_PROFILING, False)
+        self._threshold_ns = (
+            options.get(CONF_PROFILING_THRESHOLD, DEFAULT_PROFILING_THRESHOLD)
+            * NS_PER_MS
+        )
+        self._samples = options.get(CONF_PROFILING_SAMPLES, DEFAULT_PROFILING_SAMPLES)
+        self._calls = 0
+        self._slowest = []
+
+    def run(
+        self,
+        kind: str,
+        label: str | None,
+        server_id: str | None,
+        node_id: str | None,
+        func: Callable[..., Any],
+        *args: Any,
+    ) -> Any:
+        """Call func, logging it when slower than the threshold."""
+        if not self.enabled:
+            return func(*args)
+
+        profile = self._start_sample()
+        start = perf_counter_ns()
+        try:
+            return func(*args)
+        finally:
+            self._finish(
+                profile,
+                perf_counter_ns() - start,
+                kind=kind,
+                label=label,
+                server_id=server_id,
+                node_id=node_id,
+            )
+
+    async def async_run(
+        self,
+        kind: str,
+        label: str | None,
+        server_id: str | None,
+        node_id: str | None,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+    ) -> Any:
+        """Await func, logging it when slower than the threshold.
+
+        The time covers the whole coroutine, including its awaits. A sampled
+        trace is active across those awaits, so it can also include other work
+        the event loop ran in between.
+        """
+        if not self.enabled:
+            return await func(*args)
+
+        profile = self._start_sample()
+        start = perf_counter_ns()
+        try:
+            return await func(*args)
+        finally:
+            self._finish(
+                profile,
+                perf_counter_ns() - start,
+                kind=kind,
+                label=label,
+                server_id=server_id,
+                node_id=node_id,
+            )
+
+    def _finish(
+        self,
+        profile: cProfile.Profile | None,
+        elapsed: int,
+        *,
+        kind: str,
+        label: str | None,
+        server_id: str | None,
+        node_id: str | None,
+    ) -> None:
+        """Stop a sampled trace and report the invocation if it was slow."""
+        if profile is not None:
+            profile.disable()
+        if elapsed >= self._threshold_ns:
+            _LOGGER.warning(
+                "Slow %s handler %s took %.1f ms (server_id: %s, node_id: %s)",
+                kind,
+                label,
+                elapsed / NS_PER_MS,
+                server_id,
+                node_id,
+            )
+            if profile is not None:
+                self._keep_sample(profile, kind, label, elapsed)
+
+    def wrap_handler(
+        self, command: str, handler: WebSocketCommandHandler
+    ) -> WebSocketCommandHandler:
+        """Wrap a websocket handler so it runs through the profiler."""
+
+        def wrapper(
+            hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+        ) -> None:
+            self.run(
+                KIND_WEBSOCKET,
+                command,
+                msg.get("server_id"),
+                msg.get("node_id"),
+                handler,
+                hass,
+                connection,
+                msg,
+            )
+
+        return wrapper
+
+    def _start_sample(self) -> cProfile.Profile | None:
+        """Start a cProfile trace for every PROFILE_SAMPLE_INTERVAL call."""
+        if not self._samples:
+            return None
+        self._calls += 1
+        if self._calls % PROFILE_SAMPLE_INTERVAL:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. the HA profiler integration) is active
+            return None
+        return profile
+
+    def _keep_sample(
+        self, profile: cProfile.Profile, kind: str, label: str | None, elapsed: int
+    ) -> None:
+        """Keep the trace if it is one of the slowest seen so far."""
+        replaced: str | None = None
+        if len(self._slowest) >= self._samples:
+            if elapsed <= self._slowest[0][0]:
+                return
+            replaced = heapq.heappop(self._slowest)[1]
+
+        path = self.hass.config.path(
+            PROFILE_DIR, f"{kind}_{slugify(label or '')}_{int(time() * 1000)}.prof"
+        )
+        heapq.heappush(self._slowest, (elapsed, path))
+        self.hass.async_add_executor_job(_write_profile, profile, path, replaced)
+
+
+def _write_profile(profile: cProfile.Profile, path: str, replaced: str | None) -> None:
+    """Write a trace to disk, removing the one it replaces."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    profile.dump_stats(path)
+    if replaced is not None:
+        Path(replaced).unlink(missing_ok=True)
+    _LOGGER.info("Profile written to %s", path)
+
+
+@callback
+def async_get_profiler(hass: HomeAssistant) -> NodeRedProfiler:
+    """Return the integration profiler, creating it on first use."""
+    if (profiler := hass.data.get(DATA_PROFILER)) is None:
+        profiler = hass.data[DATA_PROFILER] = NodeRedProfiler(hass)
+    return profiler
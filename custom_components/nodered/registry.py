@@ -0,0 +1,236 @@
+"""Versioned change stream of the area, device, entity and label registries."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+from uuid import uuid4
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    label_registry as lr,
+)
+
+from .const import DOMAIN
+
+DATA_REGISTRY_TRACKER = f"{DOMAIN}_registry_tracker"
+
+# Changes kept for clients catching up; older clients get a new snapshot
+MAX_REGISTRY_CHANGES = 1000
+
+REGISTRY_AREA = "area"
+REGISTRY_DEVICE = "device"
+REGISTRY_ENTITY = "entity"
+REGISTRY_LABEL = "label"
+
+ACTION_REMOVE = "remove"
+
+Change = dict[str, Any]
+
+
+def _area(entry: ar.AreaEntry) -> dict[str, Any]:
+    return {
+        "area_id": entry.id,
+        "name": entry.name,
+        "floor_id": entry.floor_id,
+        "icon": entry.icon,
+        "labels": sorted(entry.labels),
+    }
+
+
+def _device(entry: dr.DeviceEntry) -> dict[str, Any]:
+    return {
+        "id": entry.id,
+        "name": entry.name_by_user or entry.name,
+        "area_id": entry.area_id,
+        "labels": sorted(entry.labels),
+        "manufacturer": entry.manufacturer,
+        "model": entry.model,
+        "via_device_id": entry.via_device_id,
+        "disabled_by": entry.disabled_by,
+    }
+
+
+def _entity(entry: er.RegistryEntry) -> dict[str, Any]:
+    return {
+        "entity_id": entry.entity_id,
+        "name": entry.name or entry.original_name,
+        "platform": entry.platform,
+        "device_id": entry.device_id,
+        "area_id": entry.area_id,
+        "labels": sorted(entry.labels),
+        "disabled_by": entry.disabled_by,
+        "hidden_by": entry.hidden_by,
+    }
+
+
+def _label(entry: lr.LabelEntry) -> dict[str, Any]:
+    return {
+        "label_id": entry.label_id,
+        "name": entry.name,
+        "color": entry.color,
+        "icon": entry.icon,
+    }
+
+
+class RegistryTracker:
+    """Number every registry change and keep the most recent ones.
+
+    The tracker listens to the registries from config entry setup until
+    unload, whether or not a client is subscribed, so a reconnecting client
+    can catch up from its last version. The version counts changes since the
+    tracker started. Each start has a new epoch, so versions from a previous
+    run, or from before changes went unrecorded, are never mistaken for
+    current ones.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self.epoch = uuid4().hex
+        self.version = 0
+        self._changes: deque[tuple[int, Change]] = deque(maxlen=MAX_REGISTRY_CHANGES)
+        self._listeners: set[Callable[[int, Change], None]] = set()
+        self._unsubscribes: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening to the registries with a new epoch."""
+        if self._unsubscribes:
+            return
+        self.epoch = uuid4().hex
+        self.version = 0
+        self._changes.clear()
+        bus = self.hass.bus
+        self._unsubscribes = [
+            bus.async_listen(ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area),
+            bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device),
+            bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity),
+            bus.async_listen(lr.EVENT_LABEL_REGISTRY_UPDATED, self._async_label),
+        ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening to the registries and drop all listeners."""
+        self._listeners.clear()
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes = []
+
+    @callback
+    def async_snapshot(self) -> dict[str, Any]:
+        """Return the compact contents of all registries."""
+        hass = self.hass
+        return {
+            "epoch": self.epoch,
+            "version": self.version,
+            "areas": [_area(entry) for entry in ar.async_get(hass).async_list_areas()],
+            "devices": [
+                _device(entry) for entry in dr.async_get(hass).devices.values()
+            ],
+            "entities": [
+                _entity(entry) for entry in er.async_get(hass).entities.values()
+            ],
+            "labels": [
+                _label(entry) for entry in lr.async_get(hass).async_list_labels()
+            ],
+        }
+
+    def changes_since(self, epoch: str | None, version: int) -> list[Change] | None:
+        """Return the changes after a version, None if they are not all kept."""
+        if epoch != self.epoch or version > self.version:
+            return None
+        if version == self.version:
+            return []
+        if not self._changes or self._changes[0][0] > version + 1:
+            return None
+        return [change for number, change in self._changes if number > version]
+
+    @callback
+    def async_listen(self, listener: Callable[[int, Change], None]) -> CALLBACK_TYPE:
+        """Call listener with the version and change of each new change."""
+        self._listeners.add(listener)
+        return lambda: self._listeners.discard(listener)
+
+    @callback
+    def _async_record(
+        self, registry: str, action: str, key: str, data: dict[str, Any] | None
+    ) -> None:
+        """Number a change and pass it to the listeners."""
+        self.version += 1
+        change: Change = {"registry": registry, "action": action, "id": key}
+        if data is not None:
+            change["data"] = data
+        self._changes.append((self.version, change))
+        for listener in list(self._listeners):
+            listener(self.version, change)
+
+    @callback
+    def _async_area(self, event: Event[ar.EventAreaRegistryUpdatedData]) -> None:
+        area_id = event.data["area_id"]
+        entry = ar.async_get(self.hass).async_get_area(area_id)
+        self._async_record_entry(
+            REGISTRY_AREA, event.data["action"], area_id, entry, _area
+        )
+
+    @callback
+    def _async_device(self, event: Event[dr.EventDeviceRegistryUpdatedData]) -> None:
+        device_id = event.data["device_id"]
+        entry = dr.async_get(self.hass).async_get(device_id)
+        self._async_record_entry(
+            REGISTRY_DEVICE, event.data["action"], device_id, entry, _device
+        )
+
+    @callback
+    def _async_entity(self, event: Event[er.EventEntityRegistryUpdatedData]) -> None:
+        data = event.data
+        entity_id = data["entity_id"]
+        if (old_entity_id := data.get("old_entity_id")) is not None:
+            # Renames are a removal of the old id and an update of the new one
+            self._async_record(REGISTRY_ENTITY, ACTION_REMOVE, old_entity_id, None)
+        entry = er.async_get(self.hass).async_get(entity_id)
+        self._async_record_entry(
+            REGISTRY_ENTITY, data["action"], entity_id, entry, _entity
+        )
+
+    @callback
+    def _async_label(self, event: Event[lr.EventLabelRegistryUpdatedData]) -> None:
+        label_id = event.data["label_id"]
+        entry = lr.async_get(self.hass).async_get_label(label_id)
+        self._async_record_entry(
+            REGISTRY_LABEL, event.data["action"], label_id, entry, _label
+        )
+
+    @callback
+    def _async_record_entry(
+        self,
+        registry: str,
+        action: str,
+        key: str,
+        entry: Any,
+        compact: Callable[[Any], dict[str, Any]],
+    ) -> None:
+        """Record a change with the entry's current data, if it still exists."""
+        if action == ACTION_REMOVE or entry is None:
+            self._async_record(registry, ACTION_REMOVE, key, None)
+        else:
+            self._async_record(registry, action, key, compact(entry))
+
+
+@callback
+def async_get_registry_tracker(hass: HomeAssistant) -> RegistryTracker:
+    """Return the registry tracker, creating it on first use."""
+    if (tracker := hass.data.get(DATA_REGISTRY_TRACKER)) is None:
+        tracker = hass.data[DATA_REGISTRY_TRACKER] = RegistryTracker(hass)
+    return tracker
+
+
+@callback
+def async_stop_registry_tracker(hass: HomeAssistant) -> None:
+    """Stop and drop the registry tracker, if it was created."""
+    if (tracker := hass.data.pop(DATA_REGISTRY_TRACKER, None)) is not None:
+        tracker.async_stop()
@@ -21,6 +21,7 @@ from .const import (
     SELECT_ICON,
 )
 from .entity import NodeRedEntity
+from .utils import intern_string
 
 CONF_STATE = "state"
 
@@ -84,7 +85,7 @@ class NodeRedSelect(NodeRedEntity, SelectEntity):
     def update_entity_state_attributes(self, msg: dict[str, Any]) -> None:
         """Update the entity state attributes."""
         super().update_entity_state_attributes(msg)
-        self._attr_current_option = msg.get(CONF_STATE)
+        self._attr_current_option = intern_string(msg.get(CONF_STATE))
 
     def update_discovery_config(self, msg: dict[str, Any]) -> None:
         """Update the entity config."""
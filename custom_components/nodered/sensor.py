@@ -1,31 +1,67 @@
 """Sensor platform for nodered."""
 
-from datetime import date, datetime, timezone
+from collections.abc import Mapping
+from datetime import date, datetime, timedelta, timezone
 import logging
 from typing import Any
 
-from dateutil import parser
 from propcache.api import cached_property
 
 from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_STATE, CONF_UNIT_OF_MEASUREMENT, EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_ENTITY_CATEGORY,
+    CONF_ICON,
+    CONF_STATE,
+    CONF_UNIT_OF_MEASUREMENT,
+    EntityCategory,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
     CONF_CONFIG,
+    CONF_DIAGNOSTIC_SENSORS,
     CONF_LAST_RESET,
+    CONF_NAME,
+    CONF_NODE_ID,
     CONF_SENSOR,
+    CONF_SERVER_ID,
     CONF_STATE_CLASS,
+    DIAGNOSTICS_SERVER_ID,
     NODERED_DISCOVERY_NEW,
+    NODERED_OPTIONS_UPDATE,
 )
 from .entity import NodeRedEntity
+from .filters import WINDOW_OPTIONS, WindowAggregator, as_number
+from .utils import intern_string
 
 _LOGGER = logging.getLogger(__name__)
 
+DIAGNOSTIC_UPDATE_INTERVAL = timedelta(minutes=1)
+
+# node_id: (name, unit, icon) for each throughput sensor; node_id matches the
+# key returned by NodeRedStats.throughput()
+DIAGNOSTIC_SENSORS = {
+    "messages_per_minute": ("Messages per minute", "messages/min", "mdi:message"),
+    "state_writes_per_minute": (
+        "State writes per minute",
+        "writes/min",
+        "mdi:database-edit",
+    ),
+    "webhook_requests_per_minute": (
+        "Webhook requests per minute",
+        "requests/min",
+        "mdi:webhook",
+    ),
+    "average_handler_latency": ("Average handler latency", "ms", "mdi:timer"),
+    "managed_entities": ("Managed entities", None, "mdi:counter"),
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -47,6 +83,36 @@ async def async_setup_entry(
         )
     )
 
+    diagnostic_sensors: list[NodeRedDiagnosticSensor] = []
+
+    @callback
+    def async_update_diagnostic_sensors(options: Mapping[str, Any]) -> None:
+        """Add or remove the diagnostic sensors to match the options."""
+        if options.get(CONF_DIAGNOSTIC_SENSORS):
+            if not diagnostic_sensors:
+                diagnostic_sensors.extend(
+                    NodeRedDiagnosticSensor(hass, node_id)
+                    for node_id in DIAGNOSTIC_SENSORS
+                )
+                async_add_entities(diagnostic_sensors)
+            return
+
+        # Removing the registry entry also removes the entity from hass
+        entity_registry = er.async_get(hass)
+        for sensor in diagnostic_sensors:
+            if sensor.registry_entry is not None:
+                entity_registry.async_remove(sensor.entity_id)
+            else:
+                hass.async_create_task(sensor.async_remove(force_remove=True))
+        diagnostic_sensors.clear()
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, NODERED_OPTIONS_UPDATE, async_update_diagnostic_sensors
+        )
+    )
+    async_update_diagnostic_sensors(config_entry.options)
+
 
 async def _async_setup_entity(
     hass: HomeAssistant,
@@ -61,15 +127,23 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
     """Node-RED Sensor class."""
 
     component = CONF_SENSOR
+    _expirable = True
+    _aggregator: WindowAggregator | None = None
+    # Discovery options the aggregator was built from
+    _window_options: tuple[Any, ...] | None = None
+    _cancel_window: CALLBACK_TYPE | None = None
+    # Stats of the last published window, kept in the state attributes under
+    # those sent by Node-RED, which take precedence
+    _window_attributes: dict[str, Any] | None = None
+    _node_attributes: dict[str, Any] | None = None
 
     def __init__(self, hass: HomeAssistant, config: dict[str, Any]) -> None:
         """Initialize the sensor."""
         super().__init__(hass, config)
         self._attr_unit_of_measurement = None
-        # Only attempt conversion if a state was provided in discovery/config
-        if CONF_STATE in config:
-            self._attr_native_value = self.convert_state(config.get(CONF_STATE))
-        else:
+        # A state provided in discovery/config was already converted and
+        # filtered by update_entity_state_attributes
+        if CONF_STATE not in config:
             self._attr_native_value = None
         self._attr_native_unit_of_measurement = self._config.get(
             CONF_UNIT_OF_MEASUREMENT
@@ -135,6 +209,9 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
                     self.entity_id,
                 )
                 return None
+            # dateutil is imported on first use to keep it off the startup path
+            from dateutil import parser  # noqa: PLC0415
+
             try:
                 parsed = parser.parse(state)
             except (ValueError, TypeError):
@@ -149,15 +226,33 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
                     return parsed.date()
                 return parsed
 
-        return state
+        return intern_string(state)
 
     def update_entity_state_attributes(self, msg: dict[str, Any]) -> None:
         """Update entity state attributes."""
+        previous_attributes = getattr(self, "_attr_extra_state_attributes", None)
         super().update_entity_state_attributes(msg)
+        self._node_attributes = self._attr_extra_state_attributes
+        if self._window_attributes:
+            self._attr_extra_state_attributes = {
+                **self._window_attributes,
+                **self._node_attributes,
+            }
         # Only update native value when a state key is present; this avoids
         # overwriting existing values when messages only include attributes.
-        if CONF_STATE in msg:
-            self._attr_native_value = self.convert_state(msg.get(CONF_STATE))
+        if CONF_STATE not in msg:
+            return
+        value = self.convert_state(msg.get(CONF_STATE))
+        if self._aggregator is not None and (number := as_number(value)) is not None:
+            # Published with the window aggregate instead
+            self._aggregator.add(number)
+            self._write_suppressed = (
+                previous_attributes == self._attr_extra_state_attributes
+            )
+            return
+        value, publish = self._apply_deadband(value, previous_attributes)
+        if publish:
+            self._attr_native_value = value
 
     def update_discovery_config(self, msg: dict[str, Any]) -> None:
         """Update entity config."""
@@ -166,6 +261,8 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
         self._attr_native_unit_of_measurement = config.get(CONF_UNIT_OF_MEASUREMENT)
         self._attr_unit_of_measurement = None
         self._attr_state_class = config.get(CONF_STATE_CLASS)
+        self._update_deadband(config)
+        self._update_aggregator(config)
         # Validate and cache last_reset from discovery config to surface invalid
         # values immediately and to ensure the cached property reflects updates.
         last = config.get(CONF_LAST_RESET)
@@ -194,11 +291,61 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
                 if "last_reset" in self.__dict__:
                     del self.__dict__["last_reset"]
 
+    def _update_aggregator(self, config: dict[str, Any]) -> None:
+        """Rebuild the aggregator and its timer when its options changed."""
+        options = tuple(config.get(key) for key in WINDOW_OPTIONS)
+        if options == self._window_options:
+            return
+        self._window_options = options
+        self._aggregator = WindowAggregator.from_config(config)
+        self._window_attributes = None
+        if self.platform is not None:
+            self._async_schedule_window()
+
+    async def async_added_to_hass(self) -> None:
+        """Start publishing window aggregates when configured."""
+        await super().async_added_to_hass()
+        self._async_schedule_window()
+        self.async_on_remove(self._async_cancel_window)
+
+    @callback
+    def _async_schedule_window(self) -> None:
+        """Restart the window timer to match the aggregator."""
+        self._async_cancel_window()
+        if self._aggregator is not None:
+            self._cancel_window = async_track_time_interval(
+                self.hass,
+                self._async_publish_window,
+                timedelta(seconds=self._aggregator.window),
+            )
+
+    @callback
+    def _async_cancel_window(self) -> None:
+        """Stop the window timer, if running."""
+        if self._cancel_window is not None:
+            self._cancel_window()
+            self._cancel_window = None
+
+    @callback
+    def _async_publish_window(self, _now: datetime) -> None:
+        """Publish the aggregate of the samples received in the window."""
+        if self._aggregator is None or (result := self._aggregator.flush()) is None:
+            return
+        self._attr_native_value, self._window_attributes = result
+        self._attr_extra_state_attributes = {
+            **self._window_attributes,
+            **(self._node_attributes or {}),
+        }
+        self._stats.record_state_write()
+        self.async_write_ha_state()
+
     def _validate_and_cache_last_reset(self, last: str) -> None:
         """Validate a last_reset ISO string and cache the parsed value.
 
         Keeps the same logging and cache-invalidation behaviour as before.
         """
+        from dateutil import parser  # noqa: PLC0415
+
         try:
             parsed = parser.parse(last)
         except (ValueError, TypeError):
@@ -227,3 +374,43 @@ class NodeRedSensor(NodeRedEntity, SensorEntity):
         if category == "diagnostic":
             return EntityCategory.DIAGNOSTIC
         return None
+
+
+class NodeRedDiagnosticSensor(NodeRedSensor):
+    """Sensor reporting the integration's own throughput."""
+
+    _discovered = False
+
+    def __init__(self, hass: HomeAssistant, node_id: str) -> None:
+        """Initialize the diagnostic sensor."""
+        name, unit, icon = DIAGNOSTIC_SENSORS[node_id]
+        super().__init__(
+            hass,
+            {
+                CONF_SERVER_ID: DIAGNOSTICS_SERVER_ID,
+                CONF_NODE_ID: node_id,
+                CONF_CONFIG: {
+                    CONF_NAME: f"Node-RED {name}",
+                    CONF_ICON: icon,
+                    CONF_ENTITY_CATEGORY: "diagnostic",
+                    CONF_UNIT_OF_MEASUREMENT: unit,
+                    CONF_STATE_CLASS: "measurement",
+                },
+            },
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Publish the current value and start the update interval."""
+        await super().async_added_to_hass()
+        self._attr_native_value = self._stats.throughput()[self._node_id]
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._async_publish, DIAGNOSTIC_UPDATE_INTERVAL
+            )
+        )
+
+    @callback
+    def _async_publish(self, _now: datetime) -> None:
+        """Write the latest value without counting it as a Node-RED write."""
+        self._attr_native_value = self._stats.throughput()[self._node_id]
+        self.async_write_ha_state()
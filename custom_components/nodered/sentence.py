@@ -1,17 +1,16 @@
 """Sentence platform for nodered."""
 
+from __future__ import annotations
+
 import asyncio
 from enum import Enum
 import logging
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from hassil.expression import Sentence
-from hassil.recognize import RecognizeResult
 import voluptuous as vol
 
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.components.websocket_api.decorators import (
-    async_response,
     require_admin,
     websocket_command,
 )
@@ -25,6 +24,10 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import config_validation as cv
 
 from .const import CONF_SERVER_ID
+from .stats import async_get_stats, async_response
+
+if TYPE_CHECKING:
+    from hassil.recognize import RecognizeResult
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,6 +65,7 @@ async def websocket_sentence(
     response = msg["response"]
     response_timeout = msg["response_timeout"]
     response_type = msg["response_type"]
+    command_stats = async_get_stats(hass).command("nodered/sentence")
 
     @callback
     async def handle_trigger(
@@ -77,6 +81,7 @@ async def websocket_sentence(
         # RecognizeResult in 2024.12 is not serializable,
         # so we need to convert it to a serializable format
         serialized = convert_recognize_result_to_dict(result)
+        command_stats.events += 1
 
         _LOGGER.debug("Sentence trigger: %s", sentence)
         connection.send_message(
@@ -128,6 +133,7 @@ async def websocket_sentence(
 
         hass.async_create_task(_remove_future())
         _remove_trigger()
+        command_stats.subscriptions -= 1
         _LOGGER.info("Sentence trigger removed: %s", sentences)
 
     try:
@@ -180,6 +186,7 @@ async def websocket_sentence(
         connection.send_message(error_message(message_id, "runtime_error", str(err)))
         return
 
+    command_stats.subscriptions += 1
     if response_type == ResponseType.FIXED:
         _LOGGER.info("Sentence trigger created: %s", sentences)
     else:
@@ -230,6 +237,8 @@ async def websocket_sentence_response(
 
 def convert_recognize_result_to_dict(result: Any) -> dict:
     """Serialize a RecognizeResult object into a JSON-serializable dictionary."""
+    # hassil is only needed once a sentence triggers, keep it off the import path
+    from hassil.expression import Sentence  # noqa: PLC0415
 
     def serialize(obj: Any) -> Any:
         if isinstance(obj, Sentence):
@@ -0,0 +1,164 @@
+"""Filtering and projection of states sent to Node-RED."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import fnmatch
+import re
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.json import json_fragment
+
+
+class StateMatcher:
+    """Match entity ids against ids, globs, domains, areas, labels and devices.
+
+    Selectors are combined with OR; a matcher without selectors matches every
+    entity. Exact ids and domains are set lookups and all globs are compiled
+    into one regular expression. Area, label and device membership needs
+    registry lookups, so results are cached per entity id until the
+    registries change.
+    """
+
+    __slots__ = (
+        "_areas",
+        "_cache",
+        "_devices",
+        "_domains",
+        "_entity_ids",
+        "_hass",
+        "_labels",
+        "_pattern",
+        "match_all",
+    )
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        entity_ids: Iterable[str] = (),
+        domains: Iterable[str] = (),
+        areas: Iterable[str] = (),
+        labels: Iterable[str] = (),
+        devices: Iterable[str] = (),
+    ) -> None:
+        """Compile the selectors."""
+        self._hass = hass
+        exact: set[str] = set()
+        globs: list[str] = []
+        for entity_id in entity_ids:
+            if any(char in entity_id for char in "*?["):
+                globs.append(fnmatch.translate(entity_id))
+            else:
+                exact.add(entity_id)
+        self._entity_ids = frozenset(exact)
+        self._pattern = re.compile("|".join(globs)) if globs else None
+        self._domains = frozenset(domains)
+        self._areas = frozenset(areas)
+        self._labels = frozenset(labels)
+        self._devices = frozenset(devices)
+        self._cache: dict[str, bool] = {}
+        self.match_all = not (
+            self._entity_ids
+            or self._pattern
+            or self._domains
+            or self._areas
+            or self._labels
+            or self._devices
+        )
+
+    def __call__(self, entity_id: str) -> bool:
+        """Return True if the entity matches."""
+        if self.match_all:
+            return True
+        if (matched := self._cache.get(entity_id)) is None:
+            matched = self._cache[entity_id] = self._match(entity_id)
+        return matched
+
+    @property
+    def _uses_registries(self) -> bool:
+        """Return True if matching needs the entity or device registry."""
+        return bool(self._areas or self._labels or self._devices)
+
+    def _match(self, entity_id: str) -> bool:
+        """Evaluate the selectors for an entity."""
+        if (
+            entity_id in self._entity_ids
+            or entity_id.partition(".")[0] in self._domains
+            or (self._pattern is not None and self._pattern.match(entity_id))
+        ):
+            return True
+        if not self._uses_registries:
+            return False
+        entry = er.async_get(self._hass).async_get(entity_id)
+        if entry is None:
+            return False
+        if self._labels & entry.labels or entry.device_id in self._devices:
+            return True
+        area_id = entry.area_id
+        if area_id is None and entry.device_id is not None:
+            device = dr.async_get(self._hass).async_get(entry.device_id)
+            area_id = device.area_id if device is not None else None
+        return area_id in self._areas
+
+    @callback
+    def async_states(self) -> list[State]:
+        """Return the current states of all matching entities."""
+        states = self._hass.states
+        if self.match_all:
+            return states.async_all()
+        if not (self._pattern or self._domains or self._uses_registries):
+            # Only exact ids: look them up instead of scanning every state
+            return [
+                state
+                for entity_id in self._entity_ids
+                if (state := states.get(entity_id)) is not None
+            ]
+        return [state for state in states.async_all() if self(state.entity_id)]
+
+    @callback
+    def async_track_registries(self) -> CALLBACK_TYPE:
+        """Forget cached results whenever registry entries change.
+
+        Returns a callback that stops tracking.
+        """
+        if not self._uses_registries:
+            return lambda: None
+
+        @callback
+        def invalidate(_event: Any) -> None:
+            self._cache.clear()
+
+        bus = self._hass.bus
+        unsubs = [
+            bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, invalidate),
+            bus.async_listen(dr.EVENT_DEVICE_REGISTRY_UPDATED, invalidate),
+        ]
+
+        @callback
+        def stop() -> None:
+            for unsub in unsubs:
+                unsub()
+
+        return stop
+
+
+def project_state(state: State | None, attributes: frozenset[str] | None) -> Any:
+    """Return a state for JSON encoding, keeping only the given attributes.
+
+    Without a projection the state's cached JSON is reused as a fragment so
+    it is not encoded again.
+    """
+    if state is None:
+        return None
+    if attributes is None:
+        return json_fragment(state.as_dict_json)
+    state_attributes = state.attributes
+    return {
+        **state.as_dict(),
+        "attributes": {
+            key: state_attributes[key] for key in attributes if key in state_attributes
+        },
+    }
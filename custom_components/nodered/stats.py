@@ -0,0 +1,303 @@
+"""Runtime counters for the Node-RED integration."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import wraps
+from time import monotonic, perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.websocket_api.decorators import (
+    async_response as websocket_async_response,
+)
+from homeassistant.const import CONF_TYPE
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, DOMAIN_DATA, NS_PER_MS, WEBHOOKS
+from .profiler import KIND_WEBSOCKET, async_get_profiler
+
+if TYPE_CHECKING:
+    from homeassistant.components.websocket_api.connection import ActiveConnection
+    from homeassistant.components.websocket_api.const import (
+        AsyncWebSocketCommandHandler,
+        WebSocketCommandHandler,
+    )
+
+# Stats outlive config entry reloads so counters cover the whole HA run
+DATA_STATS = f"{DOMAIN}_stats"
+
+# Window covered by the rolling counters, in one second buckets
+WINDOW_SECONDS = 60
+
+# Set on handlers decorated with async_response, which time themselves
+ASYNC_HANDLER = "_nodered_async_handler"
+
+
+class RollingCounter:
+    """Sum of values over a sliding window of one second buckets.
+
+    Adding is O(1): a bucket is reset lazily the first time it is reused for a
+    new second, so no timer is needed to age out old values.
+    """
+
+    __slots__ = ("_buckets", "_seconds", "_size")
+
+    def __init__(self, size: int = WINDOW_SECONDS) -> None:
+        """Initialize the buckets."""
+        self._size = size
+        self._buckets = [0] * size
+        self._seconds = [-1] * size
+
+    def add(self, value: int = 1) -> None:
+        """Add value to the bucket for the current second."""
+        second = int(monotonic())
+        index = second % self._size
+        if self._seconds[index] != second:
+            self._seconds[index] = second
+            self._buckets[index] = 0
+        self._buckets[index] += value
+
+    def total(self) -> int:
+        """Return the sum of values added within the window."""
+        oldest = int(monotonic()) - self._size
+        return sum(
+            value
+            for value, second in zip(self._buckets, self._seconds, strict=True)
+            if second > oldest
+        )
+
+
+class CommandStats:
+    """Counters for a single websocket command type."""
+
+    __slots__ = (
+        "dispatch_ns",
+        "events",
+        "invalid",
+        "messages",
+        "recent_messages",
+        "subscriptions",
+        "validation_ns",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.dispatch_ns = 0
+        self.events = 0
+        self.invalid = 0
+        self.messages = 0
+        self.recent_messages = RollingCounter()
+        self.subscriptions = 0
+        self.validation_ns = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters with derived rates and averages."""
+        messages = self.messages
+        return {
+            "messages": messages,
+            "messages_per_second": round(
+                self.recent_messages.total() / WINDOW_SECONDS, 3
+            ),
+            "invalid": self.invalid,
+            "events": self.events,
+            "active_subscriptions": self.subscriptions,
+            "validation_time_ms": round(self.validation_ns / NS_PER_MS, 3),
+            "dispatch_time_ms": round(self.dispatch_ns / NS_PER_MS, 3),
+            "avg_dispatch_time_ms": (
+                round(self.dispatch_ns / messages / NS_PER_MS, 4) if messages else 0.0
+            ),
+        }
+
+
+class NodeRedStats:
+    """Monotonic counters updated from the integration hot paths."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.started = monotonic()
+        self.commands: dict[str, CommandStats] = {}
+        self.discovery: dict[str, int] = {"created": 0, "updated": 0, "removed": 0}
+        self.entities: dict[str, int] = {}
+        self.state_writes = 0
+        self.suppressed_writes = 0
+        self.oversized_attributes = 0
+        # Rolling counters backing the throughput sensors
+        self.recent_messages = RollingCounter()
+        self.recent_dispatch_ns = RollingCounter()
+        self.recent_state_writes = RollingCounter()
+        self.recent_webhook_requests = RollingCounter()
+
+    def record_state_write(self) -> None:
+        """Count an entity state write."""
+        self.state_writes += 1
+        self.recent_state_writes.add()
+
+    def record_webhook_request(self) -> None:
+        """Count a webhook request forwarded to Node-RED."""
+        self.command("nodered/webhook").events += 1
+        self.recent_webhook_requests.add()
+
+    def record_dispatch(self, command: str, elapsed_ns: int) -> None:
+        """Count the time taken to handle a websocket message."""
+        self.command(command).dispatch_ns += elapsed_ns
+        self.recent_dispatch_ns.add(elapsed_ns)
+
+    def command(self, command: str) -> CommandStats:
+        """Return the counters for a command, creating them if needed."""
+        if (command_stats := self.commands.get(command)) is None:
+            command_stats = self.commands[command] = CommandStats()
+        return command_stats
+
+    def entity_added(self, component: str) -> None:
+        """Count an entity added to Home Assistant."""
+        self.entities[component] = self.entities.get(component, 0) + 1
+
+    def entity_removed(self, component: str) -> None:
+        """Count an entity removed from Home Assistant."""
+        self.entities[component] = max(self.entities.get(component, 0) - 1, 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable snapshot of the counters."""
+        uptime = monotonic() - self.started
+        return {
+            "uptime": round(uptime, 3),
+            "commands": {
+                command: command_stats.as_dict()
+                for command, command_stats in sorted(self.commands.items())
+            },
+            "discovery": dict(self.discovery),
+            "entities": dict(sorted(self.entities.items())),
+            "state_writes": self.state_writes,
+            "suppressed_writes": self.suppressed_writes,
+            "oversized_attributes": self.oversized_attributes,
+            "throughput": self.throughput(),
+        }
+
+    def throughput(self) -> dict[str, float | int]:
+        """Return the load over the last minute."""
+        messages = self.recent_messages.total()
+        dispatch_ns = self.recent_dispatch_ns.total()
+        return {
+            "messages_per_minute": messages,
+            "state_writes_per_minute": self.recent_state_writes.total(),
+            "webhook_requests_per_minute": self.recent_webhook_requests.total(),
+            "average_handler_latency": (
+                round(dispatch_ns / messages / NS_PER_MS, 3) if messages else 0.0
+            ),
+            "managed_entities": sum(self.entities.values()),
+        }
+
+
+@callback
+def async_get_stats(hass: HomeAssistant) -> NodeRedStats:
+    """Return the integration stats, creating them on first use."""
+    if (stats := hass.data.get(DATA_STATS)) is None:
+        stats = hass.data[DATA_STATS] = NodeRedStats()
+    return stats
+
+
+@callback
+def async_stats_snapshot(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the stats combined with live integration state."""
+    snapshot = async_get_stats(hass).as_dict()
+    snapshot["webhooks"] = len(hass.data.get(DOMAIN_DATA, {}).get(WEBHOOKS, ()))
+    return snapshot
+
+
+def timed_handler(
+    handler: WebSocketCommandHandler, stats: NodeRedStats, command: str
+) -> WebSocketCommandHandler:
+    """Wrap a websocket handler to count messages and dispatch time."""
+    command_stats = stats.command(command)
+    recent_messages = stats.recent_messages
+    recent_dispatch_ns = stats.recent_dispatch_ns
+
+    def wrapper(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        command_stats.messages += 1
+        command_stats.recent_messages.add()
+        recent_messages.add()
+        start = perf_counter_ns()
+        try:
+            handler(hass, connection, msg)
+        finally:
+            elapsed = perf_counter_ns() - start
+            command_stats.dispatch_ns += elapsed
+            recent_dispatch_ns.add(elapsed)
+
+    return wrapper
+
+
+def counted_handler(
+    handler: WebSocketCommandHandler, stats: NodeRedStats, command: str
+) -> WebSocketCommandHandler:
+    """Wrap an async websocket handler to count messages.
+
+    Calling an async handler only schedules its task, so its time is recorded
+    by async_response around the awaited coroutine instead.
+    """
+    command_stats = stats.command(command)
+    recent_messages = stats.recent_messages
+
+    def wrapper(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        command_stats.messages += 1
+        command_stats.recent_messages.add()
+        recent_messages.add()
+        handler(hass, connection, msg)
+
+    return wrapper
+
+
+def async_response(func: AsyncWebSocketCommandHandler) -> WebSocketCommandHandler:
+    """Decorate an async websocket handler, timing and profiling its coroutine.
+
+    Used in place of the websocket_api decorator, whose handler returns as
+    soon as the task is scheduled. The time until the coroutine finishes is
+    recorded as the command's dispatch time.
+    """
+
+    @wraps(func)
+    async def timed(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        start = perf_counter_ns()
+        try:
+            await async_get_profiler(hass).async_run(
+                KIND_WEBSOCKET,
+                msg[CONF_TYPE],
+                msg.get("server_id"),
+                msg.get("node_id"),
+                func,
+                hass,
+                connection,
+                msg,
+            )
+        finally:
+            async_get_stats(hass).record_dispatch(
+                msg[CONF_TYPE], perf_counter_ns() - start
+            )
+
+    handler = websocket_async_response(timed)
+    setattr(handler, ASYNC_HANDLER, True)
+    return handler
+
+
+def timed_schema(
+    schema: Callable[[dict[str, Any]], dict[str, Any]], command_stats: CommandStats
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Wrap a websocket schema to count validation time and failures."""
+
+    def validate(msg: dict[str, Any]) -> dict[str, Any]:
+        start = perf_counter_ns()
+        try:
+            return schema(msg)
+        except Exception:
+            command_stats.invalid += 1
+            raise
+        finally:
+            command_stats.validation_ns += perf_counter_ns() - start
+
+    return validate
@@ -0,0 +1,95 @@
+"""Compiled template cache for Node-RED template rendering."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.template import Template
+
+from .const import DOMAIN
+
+DATA_TEMPLATE_CACHE = f"{DOMAIN}_template_cache"
+
+TEMPLATE_CACHE_SIZE = 256
+
+
+class TemplateCache:
+    """Least recently used cache of templates keyed by their source.
+
+    A Template compiles its source on first render and keeps the result, so
+    reusing the object skips compilation for templates that are rendered
+    again.
+    """
+
+    __slots__ = ("_hass", "_max_size", "_templates")
+
+    def __init__(
+        self, hass: HomeAssistant, max_size: int = TEMPLATE_CACHE_SIZE
+    ) -> None:
+        """Initialize the cache."""
+        self._hass = hass
+        self._max_size = max_size
+        self._templates: OrderedDict[str, Template] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached templates."""
+        return len(self._templates)
+
+    def get(self, source: str) -> Template:
+        """Return the template for a source, creating it if needed."""
+        templates = self._templates
+        if (template := templates.get(source)) is not None:
+            templates.move_to_end(source)
+            return template
+        template = templates[source] = Template(source, self._hass)
+        if len(templates) > self._max_size:
+            templates.popitem(last=False)
+        return template
+
+
+def render_result(result: Any) -> dict[str, Any]:
+    """Return a render result, or the error it holds, for a response."""
+    if isinstance(result, TemplateError):
+        return {"error": str(result)}
+    return {"result": result}
+
+
+def render_template(
+    template: Template, variables: Mapping[str, Any] | None
+) -> dict[str, Any]:
+    """Render a template, returning its result or error."""
+    try:
+        return render_result(template.async_render(variables))
+    except TemplateError as err:
+        return render_result(err)
+
+
+async def async_render_will_timeout(
+    template: Template, variables: Mapping[str, Any] | None, timeout: float
+) -> bool:
+    """Return True if rendering the template takes longer than timeout seconds.
+
+    The trial render runs in the executor, like Home Assistant's own
+    render_template command. Errors are left for the real render to report.
+    """
+    try:
+        return await template.async_render_will_timeout(timeout, variables)
+    except TemplateError:
+        return False
+
+
+def timeout_result(timeout: float) -> dict[str, Any]:
+    """Return the error for a template that exceeded its timeout."""
+    return {"error": f"Exceeded maximum execution time of {timeout}s"}
+
+
+@callback
+def async_get_template_cache(hass: HomeAssistant) -> TemplateCache:
+    """Return the template cache, creating it on first use."""
+    if (cache := hass.data.get(DATA_TEMPLATE_CACHE)) is None:
+        cache = hass.data[DATA_TEMPLATE_CACHE] = TemplateCache(hass)
+    return cache
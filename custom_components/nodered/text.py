@@ -21,6 +21,7 @@ from .const import (
 )
 from .entity import NodeRedEntity
 from .number import CONF_VALUE
+from .utils import intern_string
 
 CONF_MAX_LENGTH = "max_length"
 CONF_MIN_LENGTH = "min_length"
@@ -130,7 +131,7 @@ class NodeRedText(NodeRedEntity, RestoreText):
                 )
                 value = value[:effective_max]
 
-        self._attr_native_value = value
+        self._attr_native_value = intern_string(value)
 
     def update_discovery_config(self, msg: dict[str, Any]) -> None:
         """Update the entity config."""
@@ -4,8 +4,6 @@ from datetime import time
 import logging
 from typing import Any
 
-from dateutil import parser
-
 from homeassistant.components.time import TimeEntity
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.components.websocket_api.messages import event_message
@@ -66,6 +64,9 @@ def _convert_string_to_time(value: str | None) -> None | time:
     """Convert string to time."""
     if value is None:
         return None
+    # dateutil is imported on first use to keep it off the startup path
+    from dateutil import parser  # noqa: PLC0415
+
     try:
         return parser.parse(value).time()
     except ValueError:
@@ -3,7 +3,15 @@
 from datetime import timedelta
 from typing import Any
 
-from homeassistant.helpers.json import JSONEncoder
+from homeassistant.helpers.json import JSONEncoder, json_bytes
+
+# Only short strings are worth pooling; long values (timestamps, serialized
+# payloads) rarely repeat and would just churn the pool.
+INTERN_MAX_LENGTH = 64
+INTERN_MAX_SIZE = 4096
+
+# Bytes added around each attribute when it is encoded: quotes, colon, comma
+ATTRIBUTE_OVERHEAD = 4
 
 
 class NodeRedJSONEncoder(JSONEncoder):
@@ -18,3 +26,101 @@ class NodeRedJSONEncoder(JSONEncoder):
             return o.total_seconds()
 
         return JSONEncoder.default(self, o)
+
+
+class StringPool:
+    """Bounded pool of shared string instances.
+
+    Unlike `sys.intern`, the pool has a fixed upper size so unique values
+    cannot grow it without limit. When full it is cleared and repopulated by
+    whatever strings keep repeating.
+    """
+
+    __slots__ = ("_max_length", "_max_size", "_pool")
+
+    def __init__(
+        self, max_size: int = INTERN_MAX_SIZE, max_length: int = INTERN_MAX_LENGTH
+    ) -> None:
+        """Initialize the pool."""
+        self._max_length = max_length
+        self._max_size = max_size
+        self._pool: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pooled strings."""
+        return len(self._pool)
+
+    def intern(self, value: Any) -> Any:
+        """Return the pooled instance of a short string, or value unchanged."""
+        if type(value) is not str or len(value) > self._max_length:
+            return value
+        if (pooled := self._pool.get(value)) is not None:
+            return pooled
+        if len(self._pool) >= self._max_size:
+            self._pool.clear()
+        self._pool[value] = value
+        return value
+
+    def intern_attributes(self, attributes: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of attributes with pooled keys and short string values."""
+        intern = self.intern
+        return {intern(key): intern(value) for key, value in attributes.items()}
+
+
+STRING_POOL = StringPool()
+intern_string = STRING_POOL.intern
+intern_attributes = STRING_POOL.intern_attributes
+
+
+def _json_size(value: Any) -> int | None:
+    """Return the encoded JSON size of value, None if it cannot be encoded."""
+    try:
+        return len(json_bytes(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _truncate(value: Any, budget: int) -> Any:
+    """Return the longest prefix of a string or list encoding within budget."""
+    if isinstance(value, str):
+        # Two bytes for the quotes; escaping may make the result slightly larger
+        encoded = value.encode()[: max(budget - 2, 0)]
+        return encoded.decode(errors="ignore")
+    if isinstance(value, (list, tuple)):
+        kept: list[Any] = []
+        used = 2
+        for item in value:
+            if (size := _json_size(item)) is None or used + size + 1 > budget:
+                break
+            kept.append(item)
+            used += size + 1
+        return kept
+    return None
+
+
+def apply_attribute_budget(
+    attributes: dict[str, Any], budget: int, truncate: bool
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Fit attributes within an approximate JSON byte budget.
+
+    Attributes are kept in order until the budget is used up. Those that no
+    longer fit are dropped, or cut down when truncate is set and they are
+    strings or lists. Returns the attributes to keep and the original values
+    of those that were dropped or truncated.
+    """
+    kept: dict[str, Any] = {}
+    overflow: dict[str, Any] = {}
+    remaining = budget
+    for key, value in attributes.items():
+        key_size = len(key.encode()) + ATTRIBUTE_OVERHEAD
+        size = _json_size(value)
+        if size is not None and key_size + size <= remaining:
+            kept[key] = value
+            remaining -= key_size + size
+            continue
+        overflow[key] = value
+        if truncate and size is not None and remaining > key_size:
+            if (cut := _truncate(value, remaining - key_size)) is not None:
+                kept[key] = cut
+                remaining -= key_size + (_json_size(cut) or 0)
+    return kept, overflow
@@ -0,0 +1,123 @@
+"""Fast validation for hot websocket commands."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from homeassistant.const import CONF_ID, CONF_TYPE
+
+Predicate = Callable[[Any], bool]
+
+# Types accepted by vol.Any(bool, str, int, float, None) for entity states
+STATE_TYPES = frozenset((bool, str, int, float))
+
+
+def is_bool(value: Any) -> bool:
+    """Return True for plain booleans."""
+    return type(value) is bool
+
+
+def is_dict(value: Any) -> bool:
+    """Return True for plain dicts."""
+    return type(value) is dict
+
+
+def is_state(value: Any) -> bool:
+    """Return True for values accepted as an entity state."""
+    return value is None or type(value) in STATE_TYPES
+
+
+def is_string(value: Any) -> bool:
+    """Return True for plain strings."""
+    return type(value) is str
+
+
+def is_string_list(value: Any) -> bool:
+    """Return True for plain lists of plain strings."""
+    return type(value) is list and all(type(item) is str for item in value)
+
+
+def never(_value: Any) -> bool:
+    """Send the key to the full schema."""
+    return False
+
+
+class FastSchema:
+    """Validator that accepts well formed messages without running voluptuous.
+
+    Messages made only of plain JSON types that already match the schema are
+    shallow copied with defaults filled in. Anything else, including every
+    message that needs coercion or would be rejected, goes through the full
+    voluptuous schema so acceptance and error messages are unchanged.
+    """
+
+    __slots__ = ("_command", "_defaults", "_keys", "_optional", "_required", "schema")
+
+    def __init__(
+        self,
+        schema: Callable[[dict[str, Any]], dict[str, Any]],
+        command: str,
+        required: Mapping[str, Predicate],
+        optional: Mapping[str, Predicate],
+        dict_defaults: Iterable[str],
+    ) -> None:
+        """Initialize the validator."""
+        self.schema = schema
+        self._command = command
+        self._required = tuple(required.items())
+        self._optional = tuple(optional.items())
+        self._defaults = tuple(dict_defaults)
+        self._keys = frozenset(
+            (CONF_ID, CONF_TYPE, *required, *optional, *self._defaults)
+        )
+
+    def __call__(self, msg: dict[str, Any]) -> dict[str, Any]:
+        """Validate a websocket message."""
+        if (
+            type(msg) is not dict
+            or not msg.keys() <= self._keys
+            or type(msg_id := msg.get(CONF_ID)) is not int
+            or msg_id < 0
+            or msg.get(CONF_TYPE) != self._command
+        ):
+            return self.schema(msg)
+        for key, check in self._required:
+            if key not in msg or not check(msg[key]):
+                return self.schema(msg)
+        for key, check in self._optional:
+            if key in msg and not check(msg[key]):
+                return self.schema(msg)
+        validated = msg.copy()
+        for key in self._defaults:
+            if key not in validated:
+                validated[key] = {}
+            elif type(validated[key]) is not dict:
+                return self.schema(msg)
+        return validated
+
+
+def fast_schema(
+    *,
+    required: Mapping[str, Predicate],
+    optional: Mapping[str, Predicate] | None = None,
+    dict_defaults: Iterable[str] = (),
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Attach a FastSchema in front of a websocket command's schema.
+
+    Must be applied above `websocket_command`. `required` and `optional` map
+    keys to predicates matching the schema's validator for plain values;
+    `dict_defaults` are optional dict keys that default to `{}`.
+    """
+
+    def decorate(func: Callable[..., Any]) -> Callable[..., Any]:
+        func._ws_schema = FastSchema(  # type: ignore[attr-defined]  # noqa: SLF001
+            func._ws_schema,  # type: ignore[attr-defined]  # noqa: SLF001
+            func._ws_command,  # type: ignore[attr-defined]  # noqa: SLF001
+            required,
+            optional or {},
+            dict_defaults,
+        )
+        return func
+
+    return decorate
@@ -1,20 +1,16 @@
 """Websocket API for Node-RED."""
 
+import asyncio
 import contextlib
+from datetime import timedelta
 import json
 import logging
+from time import perf_counter_ns, time
 from typing import Any
 
 from aiohttp.web import Request, Response
 import voluptuous as vol
 
-from homeassistant.components import device_automation
-from homeassistant.components.device_automation import DeviceAutomationType
-from homeassistant.components.device_automation.exceptions import (
-    DeviceNotFound,
-    InvalidDeviceAutomationConfig,
-)
-from homeassistant.components.device_automation.trigger import TRIGGER_SCHEMA
 from homeassistant.components.webhook import (
     SUPPORTED_METHODS,
     async_register as webhook_async_register,
@@ -22,8 +18,18 @@ from homeassistant.components.webhook import (
 )
 from homeassistant.components.websocket_api import async_register_command
 from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.components.websocket_api.const import (
+    ERR_HOME_ASSISTANT_ERROR,
+    ERR_INVALID_FORMAT,
+    ERR_NOT_FOUND,
+    ERR_NOT_SUPPORTED,
+    ERR_SERVICE_VALIDATION_ERROR,
+    ERR_TEMPLATE_ERROR,
+    ERR_UNAUTHORIZED,
+    ERR_UNKNOWN_ERROR,
+    WebSocketCommandHandler,
+)
 from homeassistant.components.websocket_api.decorators import (
-    async_response,
     require_admin,
     websocket_command,
 )
@@ -33,46 +39,138 @@ from homeassistant.components.websocket_api.messages import (
     result_message,
 )
 from homeassistant.const import (
+    ATTR_ENTITY_ID,
     CONF_DOMAIN,
     CONF_ID,
     CONF_NAME,
+    CONF_SERVICE,
+    CONF_SERVICE_DATA,
     CONF_STATE,
+    CONF_TARGET,
+    CONF_TIMEOUT,
     CONF_TYPE,
     CONF_WEBHOOK_ID,
+    EVENT_STATE_CHANGED,
 )
-from homeassistant.core import Context, HomeAssistant, callback
-from homeassistant.helpers import (
-    config_validation as cv,
-    device_registry as dr,
-    trigger,
+from homeassistant.core import (
+    Context,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
 )
+from homeassistant.exceptions import (
+    HomeAssistantError,
+    ServiceNotFound,
+    ServiceValidationError,
+    TemplateError,
+    Unauthorized,
+)
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.helpers.entity_registry import async_entries_for_device, async_get
+from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
+    async_track_template_result,
+)
+from homeassistant.helpers.json import json_bytes, json_dumps_sorted
+from homeassistant.helpers.template import Template
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    CONF_ACTIONS,
+    CONF_AGGREGATE,
+    CONF_AREAS,
     CONF_ATTRIBUTES,
+    CONF_AVAILABLE,
+    CONF_CALLS,
     CONF_COMPONENT,
+    CONF_CONCURRENCY,
     CONF_CONFIG,
     CONF_DEVICE_INFO,
     CONF_DEVICE_TRIGGER,
+    CONF_DEVICES,
+    CONF_DOMAINS,
+    CONF_END_TIME,
+    CONF_EPOCH,
+    CONF_GROUP,
+    CONF_LABELS,
+    CONF_METHOD,
     CONF_NODE_ID,
+    CONF_NODE_IDS,
+    CONF_POINTS,
     CONF_REMOVE,
     CONF_SERVER_ID,
+    CONF_START_TIME,
+    CONF_STATE_ONLY,
     CONF_SUB_TYPE,
+    CONF_SUBSCRIBE,
+    CONF_TEMPLATE,
+    CONF_TEMPLATES,
+    CONF_UNRECORDED_ATTRIBUTES,
+    CONF_VARIABLES,
+    CONF_VERSION,
+    CONF_WINDOW,
+    DEFAULT_ACTION_CONCURRENCY,
     DOMAIN,
     DOMAIN_DATA,
+    DOWNSAMPLE_BUCKET,
+    DOWNSAMPLE_LTTB,
+    MAX_ACTION_CONCURRENCY,
+    MAX_HISTORY_POINTS,
     NODERED_CONFIG_UPDATE,
     NODERED_DISCOVERY,
     NODERED_ENTITY,
     VERSION,
     WEBHOOKS,
 )
+from .discovery import async_remove_nodes
+from .entity import NodeRedEntity, async_get_device_index
+from .history import HistoryQuery, async_get_history_cache, fetch_recorder_history
+from .profiler import async_get_profiler
+from .registry import async_get_registry_tracker
 from .sentence import websocket_sentence, websocket_sentence_response
+from .states import StateMatcher, project_state
+from .stats import (
+    ASYNC_HANDLER,
+    NS_PER_MS,
+    async_get_stats,
+    async_response,
+    async_stats_snapshot,
+    counted_handler,
+    timed_handler,
+    timed_schema,
+)
+from .templates import (
+    async_get_template_cache,
+    async_render_will_timeout,
+    render_result,
+    render_template,
+    timeout_result,
+)
 from .utils import NodeRedJSONEncoder
+from .validation import (
+    fast_schema,
+    is_bool,
+    is_dict,
+    is_state,
+    is_string,
+    is_string_list,
+    never,
+)
 
 CONF_ALLOWED_METHODS = "allowed_methods"
 CONF_LOCAL_ONLY = "local_only"
 
+DISCOVERY_CONFIG_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_UNRECORDED_ATTRIBUTES): vol.All(cv.ensure_list, [cv.string]),
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -93,18 +191,254 @@ def unregister_all_webhooks(hass: HomeAssistant) -> None:
     domain_data[WEBHOOKS] = set()
 
 
+def _device_trigger_schema(value: Any) -> Any:
+    """Validate a device trigger, importing device automation on first use."""
+    from homeassistant.components.device_automation.trigger import TRIGGER_SCHEMA  # noqa: PLC0415
+
+    return TRIGGER_SCHEMA(value)
+
+
+def _is_discovery_config(value: Any) -> bool:
+    """Return True for discovery configs the full schema leaves unchanged."""
+    return is_dict(value) and is_string_list(value.get(CONF_UNRECORDED_ATTRIBUTES, []))
+
+
+def _history_method_schema(value: dict[str, Any]) -> dict[str, Any]:
+    """Validate that bucket downsampling is given a number of points."""
+    if value[CONF_METHOD] == DOWNSAMPLE_BUCKET and CONF_POINTS not in value:
+        raise vol.Invalid("points is required with the bucket method")
+    return value
+
+
 def register_websocket_handlers(hass: HomeAssistant) -> None:
     """Register the websocket handlers."""
-    async_register_command(hass, websocket_device_action)
-    async_register_command(hass, websocket_device_remove)
-    async_register_command(hass, websocket_device_trigger)
-    async_register_command(hass, websocket_discovery)
-    async_register_command(hass, websocket_entity)
-    async_register_command(hass, websocket_config_update)
-    async_register_command(hass, websocket_version)
-    async_register_command(hass, websocket_webhook)
-    async_register_command(hass, websocket_sentence)
-    async_register_command(hass, websocket_sentence_response)
+    _async_register_command(hass, websocket_call_services)
+    _async_register_command(hass, websocket_device_action)
+    _async_register_command(hass, websocket_device_action_batch)
+    _async_register_command(hass, websocket_device_availability)
+    _async_register_command(hass, websocket_device_remove)
+    _async_register_command(hass, websocket_device_trigger)
+    _async_register_command(hass, websocket_discovery)
+    _async_register_command(hass, websocket_discovery_remove_batch)
+    _async_register_command(hass, websocket_entity)
+    _async_register_command(hass, websocket_entity_attributes)
+    _async_register_command(hass, websocket_entity_history)
+    _async_register_command(hass, websocket_config_update)
+    _async_register_command(hass, websocket_get_states)
+    _async_register_command(hass, websocket_history)
+    _async_register_command(hass, websocket_registry_subscribe)
+    _async_register_command(hass, websocket_render_templates)
+    _async_register_command(hass, websocket_stats)
+    _async_register_command(hass, websocket_subscribe_states)
+    _async_register_command(hass, websocket_version)
+    _async_register_command(hass, websocket_webhook)
+    _async_register_command(hass, websocket_sentence)
+    _async_register_command(hass, websocket_sentence_response)
+
+
+@callback
+def _async_get_entity(hass: HomeAssistant, entity_id: str) -> NodeRedEntity | None:
+    """Return the live Node-RED entity with an entity id."""
+    for platform in async_get_platforms(hass, DOMAIN):
+        if isinstance(entity := platform.entities.get(entity_id), NodeRedEntity):
+            return entity
+    return None
+
+
+def _async_register_command(
+    hass: HomeAssistant, handler: WebSocketCommandHandler
+) -> None:
+    """Register a websocket command wrapped with the integration counters."""
+    command = handler._ws_command  # type: ignore[attr-defined]  # noqa: SLF001
+    schema = handler._ws_schema  # type: ignore[attr-defined]  # noqa: SLF001
+    stats = async_get_stats(hass)
+    command_stats = stats.command(command)
+    profiler = async_get_profiler(hass)
+    if getattr(handler, ASYNC_HANDLER, False):
+        # Async handlers time and profile their own coroutine
+        wrapped = counted_handler(handler, stats, command)
+    else:
+        wrapped = timed_handler(profiler.wrap_handler(command, handler), stats, command)
+    async_register_command(
+        hass,
+        command,
+        wrapped,
+        # Commands without parameters have no schema to time
+        timed_schema(schema, command_stats) if schema is not False else schema,
+    )
+
+
+async def _async_run_device_action(
+    hass: HomeAssistant, platform: Any, action: dict[str, Any], context: Context
+) -> tuple[str, str] | None:
+    """Run a device action, returning an error code and message on failure."""
+    from homeassistant.components.device_automation.exceptions import (  # noqa: PLC0415
+        DeviceNotFound,
+        InvalidDeviceAutomationConfig,
+    )
+
+    try:
+        if "entity_id" in action:
+            entity_entry = async_get(hass).async_get(action["entity_id"])
+            if entity_entry is None:
+                return "entity_not_found", f"Entity '{action['entity_id']}' not found"
+            action["entity_id"] = entity_entry.entity_id
+
+        await platform.async_call_action_from_config(hass, action, {}, context)
+    except InvalidDeviceAutomationConfig as err:
+        return "invalid_config", str(err)
+    except DeviceNotFound as err:
+        return "device_not_found", str(err)
+    except ServiceNotFound as err:
+        return ERR_NOT_FOUND, str(err)
+    except vol.Invalid as err:
+        return ERR_INVALID_FORMAT, str(err)
+    except ServiceValidationError as err:
+        return ERR_SERVICE_VALIDATION_ERROR, str(err)
+    except Unauthorized as err:
+        return ERR_UNAUTHORIZED, str(err)
+    except HomeAssistantError as err:
+        return ERR_HOME_ASSISTANT_ERROR, str(err)
+    except ValueError as err:
+        return "value_error", str(err)
+    except RuntimeError as err:
+        return "runtime_error", str(err)
+    except Exception as err:
+        _LOGGER.exception("Unexpected error running device action %s", action)
+        return ERR_UNKNOWN_ERROR, str(err)
+    return None
+
+
+def _group_service_calls(
+    calls: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any], list[int]]]:
+    """Merge calls to the same service with the same data into one call.
+
+    Returns each call to make with the indexes of the requested calls it
+    covers. Only calls whose target is made of plain ids are merged; their
+    target lists are combined without duplicates.
+    """
+    groups: list[tuple[dict[str, Any], list[int]]] = []
+    by_key: dict[tuple[str, str, str], tuple[dict[str, Any], list[int]]] = {}
+    for index, call in enumerate(calls):
+        target = call.get(CONF_TARGET)
+        if not target or not all(
+            isinstance(ids, str)
+            or (isinstance(ids, list) and all(isinstance(i, str) for i in ids))
+            for ids in target.values()
+        ):
+            groups.append((call, [index]))
+            continue
+        key = (
+            call[CONF_DOMAIN],
+            call[CONF_SERVICE],
+            json_dumps_sorted(call[CONF_SERVICE_DATA]),
+        )
+        if (group := by_key.get(key)) is None:
+            group = by_key[key] = ({**call, CONF_TARGET: {}}, [])
+            groups.append(group)
+        merged, indexes = group
+        for field, ids in target.items():
+            merged_ids = merged[CONF_TARGET].setdefault(field, [])
+            merged_ids.extend(i for i in cv.ensure_list(ids) if i not in merged_ids)
+        indexes.append(index)
+    return groups
+
+
+async def _async_call_service(
+    hass: HomeAssistant, call: dict[str, Any], context: Context
+) -> dict[str, Any]:
+    """Make one service call, returning its result and duration."""
+    start = perf_counter_ns()
+    result: dict[str, Any] = {"success": True}
+    try:
+        await hass.services.async_call(
+            call[CONF_DOMAIN],
+            call[CONF_SERVICE],
+            call[CONF_SERVICE_DATA],
+            blocking=True,
+            context=context,
+            target=call.get(CONF_TARGET),
+        )
+    except ServiceNotFound as err:
+        result = _service_error(ERR_NOT_FOUND, str(err))
+    except vol.Invalid as err:
+        result = _service_error(ERR_INVALID_FORMAT, str(err))
+    except ServiceValidationError as err:
+        result = _service_error(ERR_SERVICE_VALIDATION_ERROR, str(err))
+    except HomeAssistantError as err:
+        result = _service_error(ERR_HOME_ASSISTANT_ERROR, str(err))
+    except Exception as err:
+        _LOGGER.exception(
+            "Unexpected error calling %s.%s", call[CONF_DOMAIN], call[CONF_SERVICE]
+        )
+        result = _service_error(ERR_UNKNOWN_ERROR, str(err))
+    result["duration_ms"] = round((perf_counter_ns() - start) / NS_PER_MS, 3)
+    return result
+
+
+def _service_error(code: str, message: str) -> dict[str, Any]:
+    """Return the result of a failed service call."""
+    return {"success": False, "error": {"code": code, "message": message}}
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/call_services",
+        vol.Required(CONF_CALLS): [
+            {
+                vol.Required(CONF_DOMAIN): cv.string,
+                vol.Required(CONF_SERVICE): cv.string,
+                vol.Optional(CONF_SERVICE_DATA, default={}): dict,
+                vol.Optional(CONF_TARGET): dict,
+            }
+        ],
+        vol.Optional(CONF_GROUP, default=False): cv.boolean,
+        vol.Optional(CONF_CONCURRENCY, default=DEFAULT_ACTION_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_ACTION_CONCURRENCY)
+        ),
+    }
+)
+@async_response
+async def websocket_call_services(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Make many service calls concurrently and return all results at once.
+
+    All calls share the message's context. With group set, calls to the
+    same service with the same data are merged into one call targeting all
+    of their entities, and each merged call reports the shared result.
+    """
+    start = perf_counter_ns()
+    calls: list[dict[str, Any]] = msg[CONF_CALLS]
+    context = connection.context(msg)
+    groups = (
+        _group_service_calls(calls)
+        if msg[CONF_GROUP]
+        else [(call, [index]) for index, call in enumerate(calls)]
+    )
+    semaphore = asyncio.Semaphore(msg[CONF_CONCURRENCY])
+
+    async def run(call: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            return await _async_call_service(hass, call, context)
+
+    results: list[dict[str, Any]] = [{}] * len(calls)
+    group_results = await asyncio.gather(*(run(call) for call, _ in groups))
+    for (_, indexes), result in zip(groups, group_results, strict=True):
+        for index in indexes:
+            results[index] = result
+    connection.send_message(
+        result_message(
+            msg[CONF_ID],
+            {
+                "context": context,
+                "results": results,
+                "duration_ms": round((perf_counter_ns() - start) / NS_PER_MS, 3),
+            },
+        )
+    )
 
 
 @require_admin
@@ -119,38 +453,106 @@ async def websocket_device_action(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Execute a device action."""
+    # Device automation is only imported once Node-RED uses it, keeping it off
+    # the integration's startup path
+    from homeassistant.components import device_automation  # noqa: PLC0415
+    from homeassistant.components.device_automation import DeviceAutomationType  # noqa: PLC0415
+
     context = connection.context(msg)
     platform = await device_automation.async_get_device_automation_platform(
         hass, msg["action"][CONF_DOMAIN], DeviceAutomationType.ACTION
     )
 
-    try:
-        if "entity_id" in msg["action"]:
-            entity_registry = async_get(hass)
-            entity_entry = entity_registry.async_get(msg["action"]["entity_id"])
-            if entity_entry is None:
-                connection.send_message(
-                    error_message(
-                        msg[CONF_ID],
-                        "entity_not_found",
-                        f"Entity '{msg['action']['entity_id']}' not found",
-                    )
+    error = await _async_run_device_action(hass, platform, msg["action"], context)
+    if error is None:
+        connection.send_message(result_message(msg[CONF_ID]))
+    else:
+        connection.send_message(error_message(msg[CONF_ID], *error))
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/device/action/batch",
+        vol.Required(CONF_ACTIONS): [cv.DEVICE_ACTION_SCHEMA],
+        vol.Optional(CONF_CONCURRENCY, default=DEFAULT_ACTION_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_ACTION_CONCURRENCY)
+        ),
+    }
+)
+@async_response
+async def websocket_device_action_batch(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Execute many device actions concurrently.
+
+    Each device automation platform is resolved once per batch. Results are
+    returned in the order of the actions, one per action.
+    """
+    from homeassistant.components import device_automation  # noqa: PLC0415
+    from homeassistant.components.device_automation import DeviceAutomationType  # noqa: PLC0415
+    from homeassistant.components.device_automation.exceptions import (  # noqa: PLC0415
+        InvalidDeviceAutomationConfig,
+    )
+
+    actions: list[dict[str, Any]] = msg[CONF_ACTIONS]
+    context = connection.context(msg)
+
+    platforms: dict[str, Any] = {}
+    platform_errors: dict[str, tuple[str, str]] = {}
+    for domain in dict.fromkeys(action[CONF_DOMAIN] for action in actions):
+        try:
+            platforms[
+                domain
+            ] = await device_automation.async_get_device_automation_platform(
+                hass, domain, DeviceAutomationType.ACTION
+            )
+        except InvalidDeviceAutomationConfig as err:
+            platform_errors[domain] = ("invalid_config", str(err))
+
+    semaphore = asyncio.Semaphore(msg[CONF_CONCURRENCY])
+
+    async def run(action: dict[str, Any]) -> dict[str, Any]:
+        domain = action[CONF_DOMAIN]
+        if (error := platform_errors.get(domain)) is None:
+            async with semaphore:
+                error = await _async_run_device_action(
+                    hass, platforms[domain], action, context
                 )
-                return
-            msg["action"]["entity_id"] = entity_entry.entity_id
+        if error is None:
+            return {"success": True}
+        code, message = error
+        return {"success": False, "error": {"code": code, "message": message}}
 
-        await platform.async_call_action_from_config(hass, msg["action"], {}, context)
-        connection.send_message(result_message(msg[CONF_ID]))
-    except InvalidDeviceAutomationConfig as err:
-        connection.send_message(error_message(msg[CONF_ID], "invalid_config", str(err)))
-    except DeviceNotFound as err:
-        connection.send_message(
-            error_message(msg[CONF_ID], "device_not_found", str(err))
+    results = await asyncio.gather(*(run(action) for action in actions))
+    connection.send_message(result_message(msg[CONF_ID], {"results": results}))
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/device/availability",
+        vol.Required(CONF_NODE_ID): cv.string,
+        vol.Required(CONF_AVAILABLE): cv.boolean,
+    }
+)
+def websocket_device_availability(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Set the availability of every entity of a device at once."""
+    device_id = msg[CONF_NODE_ID]
+    available = msg[CONF_AVAILABLE]
+    index = async_get_device_index(hass)
+    index.set_available(device_id, available)
+    entities = index.entities(device_id)
+    for entity in entities:
+        entity.handle_device_availability(available)
+    connection.send_message(
+        result_message(
+            msg[CONF_ID],
+            {"entity_ids": sorted(entity.entity_id for entity in entities)},
         )
-    except ValueError as err:
-        connection.send_message(error_message(msg[CONF_ID], "value_error", str(err)))
-    except RuntimeError as err:
-        connection.send_message(error_message(msg[CONF_ID], "runtime_error", str(err)))
+    )
 
 
 @require_admin
@@ -183,18 +585,36 @@ async def websocket_device_remove(
 
 
 @require_admin
+@fast_schema(
+    required={
+        CONF_COMPONENT: is_string,
+        CONF_SERVER_ID: is_string,
+        CONF_NODE_ID: is_string,
+    },
+    optional={
+        CONF_CONFIG: _is_discovery_config,
+        CONF_STATE: is_state,
+        CONF_ATTRIBUTES: is_dict,
+        CONF_REMOVE: is_bool,
+        CONF_DEVICE_INFO: is_dict,
+        # Device triggers always need the full trigger schema
+        CONF_DEVICE_TRIGGER: never,
+        CONF_SUB_TYPE: is_string,
+    },
+    dict_defaults=(CONF_CONFIG,),
+)
 @websocket_command(
     {
         vol.Required(CONF_TYPE): "nodered/discovery",
         vol.Required(CONF_COMPONENT): cv.string,
         vol.Required(CONF_SERVER_ID): cv.string,
         vol.Required(CONF_NODE_ID): cv.string,
-        vol.Optional(CONF_CONFIG, default={}): dict,
+        vol.Optional(CONF_CONFIG, default={}): DISCOVERY_CONFIG_SCHEMA,
         vol.Optional(CONF_STATE): vol.Any(bool, str, int, float, None),
         vol.Optional(CONF_ATTRIBUTES): dict,
         vol.Optional(CONF_REMOVE): bool,
         vol.Optional(CONF_DEVICE_INFO): dict,
-        vol.Optional(CONF_DEVICE_TRIGGER): TRIGGER_SCHEMA,
+        vol.Optional(CONF_DEVICE_TRIGGER): _device_trigger_schema,
         vol.Optional(CONF_SUB_TYPE): str,
     }
 )
@@ -209,6 +629,35 @@ def websocket_discovery(
 
 
 @require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/discovery/remove_batch",
+        vol.Required(CONF_SERVER_ID): cv.string,
+        vol.Optional(CONF_NODE_IDS): [cv.string],
+    }
+)
+@async_response
+async def websocket_discovery_remove_batch(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Remove many discovered nodes, or every node of a server, at once."""
+    removed, not_found = await async_remove_nodes(
+        hass, msg[CONF_SERVER_ID], msg.get(CONF_NODE_IDS)
+    )
+    connection.send_message(
+        result_message(msg[CONF_ID], {"removed": removed, "not_found": not_found})
+    )
+
+
+@require_admin
+@fast_schema(
+    required={
+        CONF_SERVER_ID: is_string,
+        CONF_NODE_ID: is_string,
+        CONF_STATE: is_state,
+    },
+    dict_defaults=(CONF_ATTRIBUTES,),
+)
 @websocket_command(
     {
         vol.Required(CONF_TYPE): "nodered/entity",
@@ -229,6 +678,77 @@ def websocket_entity(
 
 
 @require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/entity/attributes",
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+    }
+)
+def websocket_entity_attributes(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return all attributes of an entity, including offloaded ones."""
+    entity_id = msg[ATTR_ENTITY_ID]
+    if (entity := _async_get_entity(hass, entity_id)) is None:
+        connection.send_message(
+            error_message(
+                msg[CONF_ID], "entity_not_found", f"Entity '{entity_id}' not found"
+            )
+        )
+        return
+    connection.send_message(result_message(msg[CONF_ID], entity.full_attributes()))
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/entity/history",
+        vol.Required(ATTR_ENTITY_ID): cv.entity_id,
+        vol.Optional(CONF_WINDOW): cv.positive_float,
+        vol.Optional(CONF_AGGREGATE, default=False): cv.boolean,
+    }
+)
+def websocket_entity_history(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return recent states of an entity from its in-memory history.
+
+    The window is the number of seconds back from now to cover, the whole
+    history when omitted. With aggregate set, only the aggregates over the
+    window are returned instead of its samples.
+    """
+    entity_id = msg[ATTR_ENTITY_ID]
+    if (entity := _async_get_entity(hass, entity_id)) is None:
+        connection.send_message(
+            error_message(
+                msg[CONF_ID], "entity_not_found", f"Entity '{entity_id}' not found"
+            )
+        )
+        return
+    if (history := entity.history) is None:
+        connection.send_message(
+            error_message(
+                msg[CONF_ID],
+                ERR_NOT_SUPPORTED,
+                f"History is not enabled for entity '{entity_id}'",
+            )
+        )
+        return
+
+    start = time() - msg[CONF_WINDOW] if CONF_WINDOW in msg else None
+    if msg[CONF_AGGREGATE]:
+        result = history.aggregate(start)
+    else:
+        times, values = history.window(start)
+        result = {"samples": list(zip(times, values, strict=True))}
+    connection.send_message(json_bytes(result_message(msg[CONF_ID], result)))
+
+
+@require_admin
+@fast_schema(
+    required={CONF_SERVER_ID: is_string, CONF_NODE_ID: is_string},
+    dict_defaults=(CONF_CONFIG,),
+)
 @websocket_command(
     {
         vol.Required(CONF_TYPE): "nodered/entity/update_config",
@@ -247,6 +767,255 @@ def websocket_config_update(
     connection.send_message(result_message(msg[CONF_ID]))
 
 
+@require_admin
+@websocket_command(
+    vol.All(
+        vol.Schema(
+            {
+                vol.Required(CONF_TYPE): "nodered/history",
+                vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+                vol.Required(CONF_START_TIME): cv.datetime,
+                vol.Optional(CONF_END_TIME): cv.datetime,
+                vol.Optional(CONF_POINTS): vol.All(
+                    vol.Coerce(int), vol.Range(min=3, max=MAX_HISTORY_POINTS)
+                ),
+                vol.Optional(CONF_METHOD, default=DOWNSAMPLE_LTTB): vol.In(
+                    [DOWNSAMPLE_BUCKET, DOWNSAMPLE_LTTB]
+                ),
+            }
+        ),
+        _history_method_schema,
+    )
+)
+@async_response
+async def websocket_history(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return recorded numeric states of entities, downsampled to points.
+
+    Each entity maps to `[timestamp, value]` samples chosen by lttb, or to
+    `[start, mean, min, max]` time buckets with the bucket method. The query
+    and downsampling run in the recorder executor and downsampled results are
+    cached for identical queries.
+    """
+    if "recorder" not in hass.config.components:
+        connection.send_message(
+            error_message(msg[CONF_ID], ERR_NOT_SUPPORTED, "Recorder is not loaded")
+        )
+        return
+
+    from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+
+    end_time = dt_util.as_utc(msg[CONF_END_TIME]) if CONF_END_TIME in msg else None
+    query = HistoryQuery(
+        tuple(msg[ATTR_ENTITY_ID]),
+        dt_util.as_utc(msg[CONF_START_TIME]),
+        end_time,
+        msg.get(CONF_POINTS),
+        msg[CONF_METHOD],
+    )
+    instance = get_instance(hass)
+    if query.points is None:
+        # Raw results are unbounded in size, so they are never cached
+        result = await instance.async_add_executor_job(
+            fetch_recorder_history, hass, query
+        )
+        connection.send_message(json_bytes(result_message(msg[CONF_ID], result)))
+        return
+
+    cache = async_get_history_cache(hass)
+    if (future := cache.get(query)) is None:
+        future = instance.async_add_executor_job(fetch_recorder_history, hass, query)
+        # States are committed on an interval, so a range ending within it of
+        # now may still gain rows and is only reused briefly
+        committed = dt_util.utcnow() - timedelta(seconds=instance.commit_interval)
+        cache.add(query, future, end_time is None or end_time > committed)
+    # Shielded so a closed connection does not cancel a query others share
+    result = await asyncio.shield(future)
+    connection.send_message(json_bytes(result_message(msg[CONF_ID], result)))
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/registry/subscribe",
+        vol.Inclusive(CONF_EPOCH, "since"): cv.string,
+        vol.Inclusive(CONF_VERSION, "since"): cv.positive_int,
+    }
+)
+def websocket_registry_subscribe(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stream the area, device, entity and label registries.
+
+    Sends a snapshot followed by a diff for every registry change. A client
+    passing the epoch and version of the last message it saw only gets the
+    changes since then, or a new snapshot if they are no longer kept.
+    """
+    message_id = msg[CONF_ID]
+    tracker = async_get_registry_tracker(hass)
+    command_stats = async_get_stats(hass).command("nodered/registry/subscribe")
+
+    def send(payload: dict[str, Any]) -> None:
+        connection.send_message(json_bytes(event_message(message_id, payload)))
+
+    @callback
+    def forward_change(version: int, change: dict[str, Any]) -> None:
+        command_stats.events += 1
+        send(
+            {
+                "type": "diff",
+                "epoch": tracker.epoch,
+                "version": version,
+                "changes": [change],
+            }
+        )
+
+    remove_listener = tracker.async_listen(forward_change)
+
+    @callback
+    def unsubscribe() -> None:
+        remove_listener()
+        command_stats.subscriptions -= 1
+
+    command_stats.subscriptions += 1
+    connection.subscriptions[message_id] = unsubscribe
+    connection.send_message(result_message(message_id))
+
+    changes = (
+        tracker.changes_since(msg[CONF_EPOCH], msg[CONF_VERSION])
+        if CONF_VERSION in msg
+        else None
+    )
+    if changes is None:
+        send({"type": "snapshot", **tracker.async_snapshot()})
+    else:
+        send(
+            {
+                "type": "diff",
+                "epoch": tracker.epoch,
+                "version": tracker.version,
+                "changes": changes,
+            }
+        )
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/render_templates",
+        vol.Required(CONF_TEMPLATES): [
+            {
+                vol.Required(CONF_TEMPLATE): cv.string,
+                vol.Optional(CONF_VARIABLES, default={}): dict,
+            }
+        ],
+        vol.Optional(CONF_SUBSCRIBE, default=False): cv.boolean,
+        vol.Optional(CONF_TIMEOUT): vol.Coerce(float),
+    }
+)
+@async_response
+async def websocket_render_templates(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Render a batch of templates, reusing compiled templates.
+
+    Results are returned in the order of the templates. With subscribe set,
+    the results are sent as an event instead and each template is rendered
+    again only when an entity it references changes. With a timeout, each
+    template is first rendered in the executor and one that takes longer is
+    reported as an error instead of being rendered in the event loop.
+    """
+    message_id = msg[CONF_ID]
+    cache = async_get_template_cache(hass)
+    items: list[dict[str, Any]] = msg[CONF_TEMPLATES]
+    timeout: float | None = msg.get(CONF_TIMEOUT)
+    timed_out = [False] * len(items)
+    if timeout:
+        timed_out = await asyncio.gather(
+            *(
+                async_render_will_timeout(
+                    cache.get(item[CONF_TEMPLATE]), item[CONF_VARIABLES], timeout
+                )
+                for item in items
+            )
+        )
+
+    if not msg[CONF_SUBSCRIBE]:
+        results = [
+            timeout_result(timeout)
+            if timeout and item_timed_out
+            else render_template(cache.get(item[CONF_TEMPLATE]), item[CONF_VARIABLES])
+            for item, item_timed_out in zip(items, timed_out, strict=True)
+        ]
+        connection.send_message(
+            json_bytes(result_message(message_id, {"results": results}))
+        )
+        return
+
+    if timeout and any(timed_out):
+        connection.send_message(
+            error_message(
+                message_id,
+                ERR_TEMPLATE_ERROR,
+                f"Template {timed_out.index(True)} exceeded maximum execution "
+                f"time of {timeout}s",
+            )
+        )
+        return
+
+    command_stats = async_get_stats(hass).command("nodered/render_templates")
+    track_templates: list[TrackTemplate] = []
+    indexes: dict[int, int] = {}
+    for index, item in enumerate(items):
+        template = cache.get(item[CONF_TEMPLATE])
+        if id(template) in indexes:
+            # Each tracked template must be its own object
+            template = Template(item[CONF_TEMPLATE], hass)
+        indexes[id(template)] = index
+        track_templates.append(TrackTemplate(template, item[CONF_VARIABLES]))
+
+    @callback
+    def forward_results(
+        _event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        command_stats.events += 1
+        results = [
+            {"index": indexes[id(update.template)], **render_result(update.result)}
+            for update in updates
+        ]
+        connection.send_message(
+            json_bytes(event_message(message_id, {"results": results}))
+        )
+
+    try:
+        info = async_track_template_result(hass, track_templates, forward_results)
+    except TemplateError as err:
+        connection.send_message(error_message(message_id, ERR_TEMPLATE_ERROR, str(err)))
+        return
+
+    @callback
+    def unsubscribe() -> None:
+        info.async_remove()
+        command_stats.subscriptions -= 1
+
+    command_stats.subscriptions += 1
+    connection.subscriptions[message_id] = unsubscribe
+    connection.send_message(result_message(message_id))
+    # The first results are sent once the subscription is confirmed
+    hass.loop.call_soon(info.async_refresh)
+
+
+@require_admin
+@websocket_command({vol.Required(CONF_TYPE): "nodered/stats"})
+def websocket_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Stats command."""
+    connection.send_message(result_message(msg[CONF_ID], async_stats_snapshot(hass)))
+
+
 @require_admin
 @websocket_command({vol.Required(CONF_TYPE): "nodered/version"})
 def websocket_version(
@@ -256,6 +1025,115 @@ def websocket_version(
     connection.send_message(result_message(msg[CONF_ID], VERSION))
 
 
+def _state_matcher(hass: HomeAssistant, msg: dict[str, Any]) -> StateMatcher:
+    """Return a matcher for the entity selectors of a message."""
+    return StateMatcher(
+        hass,
+        entity_ids=msg.get(ATTR_ENTITY_ID, ()),
+        domains=msg.get(CONF_DOMAINS, ()),
+        areas=msg.get(CONF_AREAS, ()),
+        labels=msg.get(CONF_LABELS, ()),
+        devices=msg.get(CONF_DEVICES, ()),
+    )
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/get_states",
+        vol.Optional(ATTR_ENTITY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_AREAS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_LABELS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Exclusive(CONF_ATTRIBUTES, "projection"): vol.All(
+            cv.ensure_list, [cv.string]
+        ),
+        vol.Exclusive(CONF_STATE_ONLY, "projection"): cv.boolean,
+    }
+)
+def websocket_get_states(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the states of matching entities.
+
+    Takes the same selectors as nodered/subscribe_states. With state_only the
+    result maps entity ids to their state; with attributes only those
+    attributes are included. The response is encoded in one pass, reusing
+    the cached JSON of unprojected states.
+    """
+    states = _state_matcher(hass, msg).async_states()
+    result: Any
+    if msg.get(CONF_STATE_ONLY):
+        result = {state.entity_id: state.state for state in states}
+    else:
+        attributes = frozenset(msg[CONF_ATTRIBUTES]) if CONF_ATTRIBUTES in msg else None
+        result = [project_state(state, attributes) for state in states]
+    connection.send_message(json_bytes(result_message(msg[CONF_ID], result)))
+
+
+@require_admin
+@websocket_command(
+    {
+        vol.Required(CONF_TYPE): "nodered/subscribe_states",
+        vol.Optional(ATTR_ENTITY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_AREAS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_LABELS): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_DEVICES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_ATTRIBUTES): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+def websocket_subscribe_states(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Forward state changes of matching entities only.
+
+    Entities are selected by exact ids or globs, domains, areas, labels and
+    devices; with attributes set, only those attributes are sent.
+    """
+    message_id = msg[CONF_ID]
+    matcher = _state_matcher(hass, msg)
+    attributes = frozenset(msg[CONF_ATTRIBUTES]) if CONF_ATTRIBUTES in msg else None
+    command_stats = async_get_stats(hass).command("nodered/subscribe_states")
+
+    @callback
+    def event_filter(event_data: EventStateChangedData) -> bool:
+        return matcher(event_data["entity_id"])
+
+    @callback
+    def forward_state(event: Event[EventStateChangedData]) -> None:
+        command_stats.events += 1
+        data = event.data
+        connection.send_message(
+            json_bytes(
+                event_message(
+                    message_id,
+                    {
+                        "entity_id": data["entity_id"],
+                        "old_state": project_state(data["old_state"], attributes),
+                        "new_state": project_state(data["new_state"], attributes),
+                    },
+                )
+            )
+        )
+
+    remove_listener = hass.bus.async_listen(
+        EVENT_STATE_CHANGED, forward_state, event_filter
+    )
+    stop_tracking = matcher.async_track_registries()
+
+    @callback
+    def unsubscribe() -> None:
+        remove_listener()
+        stop_tracking()
+        command_stats.subscriptions -= 1
+
+    command_stats.subscriptions += 1
+    connection.subscriptions[message_id] = unsubscribe
+    connection.send_message(result_message(message_id))
+
+
 @require_admin
 @websocket_command(
     {
@@ -277,6 +1155,8 @@ async def websocket_webhook(
     """Create webhook command."""
     webhook_id = msg[CONF_WEBHOOK_ID]
     allowed_methods = msg.get(CONF_ALLOWED_METHODS)
+    stats = async_get_stats(hass)
+    command_stats = stats.command("nodered/webhook")
 
     @callback
     async def handle_webhook(
@@ -295,6 +1175,7 @@ async def websocket_webhook(
             "params": dict(request.query),
         }
 
+        stats.record_webhook_request()
         _LOGGER.debug("Webhook received %s..: %s", webhook_id[:15], data)
         connection.send_message(event_message(msg[CONF_ID], {"data": data}))
 
@@ -307,6 +1188,7 @@ async def websocket_webhook(
         if DOMAIN_DATA in hass.data:
             hass.data[DOMAIN_DATA].get(WEBHOOKS, set()).discard(webhook_id)
 
+        command_stats.subscriptions -= 1
         _LOGGER.info("Webhook removed: %s..", webhook_id[:15])
         connection.send_message(result_message(msg[CONF_ID]))
 
@@ -327,6 +1209,7 @@ async def websocket_webhook(
     if DOMAIN_DATA in hass.data:
         hass.data[DOMAIN_DATA].setdefault(WEBHOOKS, set()).add(webhook_id)
 
+    command_stats.subscriptions += 1
     _LOGGER.info("Webhook created: %s..", webhook_id[:15])
     connection.subscriptions[msg[CONF_ID]] = remove_webhook
     connection.send_message(result_message(msg[CONF_ID]))
@@ -345,11 +1228,16 @@ async def websocket_device_trigger(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Create device trigger."""
+    # Imported on first use, see websocket_device_action
+    from homeassistant.helpers import trigger  # noqa: PLC0415
+
     node_id = msg[CONF_NODE_ID]
     trigger_data = msg[CONF_DEVICE_TRIGGER]
+    command_stats = async_get_stats(hass).command("nodered/device/trigger")
 
     def forward_trigger(event: dict[str, Any], _context: Context | None = None) -> None:
         """Forward events to websocket."""
+        command_stats.events += 1
         message = event_message(
             msg[CONF_ID],
             {"type": "device_trigger", "data": event["trigger"]},
@@ -363,6 +1251,7 @@ async def websocket_device_trigger(
         """Remove device trigger."""
         if remove_trigger is not None:
             remove_trigger()
+        command_stats.subscriptions -= 1
         _LOGGER.info("Device trigger removed: %s", node_id)
 
     try:
@@ -408,6 +1297,7 @@ async def websocket_device_trigger(
         )
         return
 
+    command_stats.subscriptions += 1
     _LOGGER.info("Device trigger created: %s", node_id)
     _LOGGER.debug("Device trigger config for %s: %s", node_id, trigger_data)
     connection.subscriptions[msg[CONF_ID]] = unsubscribe
@@ -6,7 +6,11 @@ from unittest.mock import patch
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.nodered.const import DOMAIN
+from custom_components.nodered.const import (
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_PROFILING,
+    DOMAIN,
+)
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
@@ -95,3 +99,21 @@ async def test_abort_if_in_data(hass: HomeAssistant) -> None:
     # Check that the config flow shows abort
     assert result.get("type") == FlowResultType.ABORT
     assert result.get("reason") == "single_instance_allowed"
+
+
+async def test_options_flow(hass: HomeAssistant) -> None:
+    """Test the options flow toggles the diagnostic sensors."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Node-RED", data={})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result.get("type") == FlowResultType.FORM
+    assert result.get("step_id") == "init"
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input={CONF_DIAGNOSTIC_SENSORS: True}
+    )
+
+    assert result.get("type") == FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_DIAGNOSTIC_SENSORS] is True
+    assert entry.options[CONF_PROFILING] is False
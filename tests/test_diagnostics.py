@@ -0,0 +1,37 @@
+"""Tests for the Node-RED diagnostics platform."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nodered.const import DOMAIN, VERSION
+from custom_components.nodered.diagnostics import async_get_config_entry_diagnostics
+from homeassistant.core import HomeAssistant
+
+
+async def test_config_entry_diagnostics(hass: HomeAssistant) -> None:
+    """Diagnostics should include the loaded platforms and counters."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={}, title="Node-RED")
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert result["version"] == VERSION
+    assert result["entry"]["title"] == "Node-RED"
+    assert result["platforms_loaded"] == ["switch"]
+    assert result["discovered"] == 0
+    assert result["discovered_per_server"] == {}
+    assert result["stats"]["webhooks"] == 0
+    assert "nodered/entity" in result["stats"]["commands"]
+
+
+async def test_config_entry_diagnostics_without_domain_data(
+    hass: HomeAssistant,
+) -> None:
+    """Diagnostics should not fail when the integration data is missing."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+
+    result = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert result["platforms_loaded"] == []
+    assert result["discovered"] == 0
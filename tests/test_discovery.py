@@ -3,6 +3,8 @@
 from typing import Any
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
 
 from custom_components.nodered.const import (
     CONF_COMPONENT,
@@ -10,6 +12,7 @@ from custom_components.nodered.const import (
     CONF_REMOVE,
     CONF_SENSOR,
     CONF_SERVER_ID,
+    DOMAIN,
     DOMAIN_DATA,
     NODERED_DISCOVERY,
     NODERED_DISCOVERY_NEW,
@@ -17,10 +20,13 @@ from custom_components.nodered.const import (
 )
 from custom_components.nodered.discovery import (
     ALREADY_DISCOVERED,
+    PLATFORMS_LOADED,
+    DiscoveryIndex,
     start_discovery,
     stop_discovery,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.dispatcher import (
     async_dispatcher_connect,
     async_dispatcher_send,
@@ -30,8 +36,8 @@ from homeassistant.helpers.dispatcher import (
 @pytest.mark.asyncio
 async def test_start_discovery_creates_and_dispatches_new(hass: HomeAssistant) -> None:
     """When a new discovery message arrives it should send a NEW signal and record discovery."""
-    hass.data[DOMAIN_DATA] = {}
-    await start_discovery(hass, hass.data[DOMAIN_DATA])
+    hass.data[DOMAIN_DATA] = {PLATFORMS_LOADED: {CONF_SENSOR}}
+    await start_discovery(hass, hass.data[DOMAIN_DATA], MockConfigEntry(domain=DOMAIN))
 
     events: list[Any] = []
 
@@ -49,9 +55,8 @@ async def test_start_discovery_creates_and_dispatches_new(hass: HomeAssistant) -
     assert len(events) == 1
     assert events[0][0] == msg
 
-    # Discovery hash should be recorded
-    discovery_hash = "nodered-srv-node"
-    assert discovery_hash in hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
+    # The node should be recorded in the discovery index
+    assert ("srv", "node") in hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
 
 
 @pytest.mark.asyncio
@@ -59,11 +64,12 @@ async def test_start_discovery_updates_when_already_discovered(
     hass: HomeAssistant,
 ) -> None:
     """When a message for an already discovered device is received it should send UPDATED."""
-    hass.data[DOMAIN_DATA] = {}
+    hass.data[DOMAIN_DATA] = {PLATFORMS_LOADED: {CONF_SENSOR}}
     discovery_hash = "nodered-srv-node2"
-    hass.data[DOMAIN_DATA][ALREADY_DISCOVERED] = {discovery_hash}
+    hass.data[DOMAIN_DATA][ALREADY_DISCOVERED] = DiscoveryIndex()
+    hass.data[DOMAIN_DATA][ALREADY_DISCOVERED].add("srv", "node2", CONF_SENSOR)
 
-    await start_discovery(hass, hass.data[DOMAIN_DATA])
+    await start_discovery(hass, hass.data[DOMAIN_DATA], MockConfigEntry(domain=DOMAIN))
 
     events: list[Any] = []
 
@@ -91,8 +97,8 @@ async def test_start_discovery_ignores_unsupported_component(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
     """Unsupported components should be ignored and logged."""
-    hass.data[DOMAIN_DATA] = {}
-    await start_discovery(hass, hass.data[DOMAIN_DATA])
+    hass.data[DOMAIN_DATA] = {PLATFORMS_LOADED: {CONF_SENSOR}}
+    await start_discovery(hass, hass.data[DOMAIN_DATA], MockConfigEntry(domain=DOMAIN))
 
     async_dispatcher_connect(
         hass,
@@ -113,8 +119,8 @@ async def test_start_discovery_ignores_unsupported_component(
 @pytest.mark.asyncio
 async def test_stop_discovery_unregisters(hass: HomeAssistant) -> None:
     """stop_discovery should unregister so subsequent messages don't dispatch."""
-    hass.data[DOMAIN_DATA] = {}
-    await start_discovery(hass, hass.data[DOMAIN_DATA])
+    hass.data[DOMAIN_DATA] = {PLATFORMS_LOADED: {CONF_SENSOR}}
+    await start_discovery(hass, hass.data[DOMAIN_DATA], MockConfigEntry(domain=DOMAIN))
 
     events: list[Any] = []
     async_dispatcher_connect(
@@ -144,3 +150,61 @@ async def test_stop_discovery_unregisters(hass: HomeAssistant) -> None:
     )
     await hass.async_block_till_done()
     assert not events
+
+
+def test_discovery_index_add_lookup_remove() -> None:
+    """The index tracks nodes per server and forgets removed ones."""
+    index = DiscoveryIndex()
+    index.add("srv", "a", CONF_SENSOR)
+    index.add("srv", "b", CONF_SENSOR)
+    index.add("other", "a", "switch")
+    # Re-adding a node only updates its component
+    index.add("srv", "a", "binary_sensor")
+
+    assert len(index) == 3
+    assert ("srv", "a") in index
+    assert ("missing", "a") not in index
+    assert index.get("srv", "a") == "binary_sensor"
+    assert index.nodes("srv") == ["a", "b"]
+    assert index.sizes() == {"srv": 2, "other": 1}
+
+    assert index.remove("other", "a") == "switch"
+    assert index.remove("other", "a") is None
+    assert index.remove("missing", "a") is None
+    assert len(index) == 2
+    assert index.sizes() == {"srv": 2}
+
+
+async def test_removed_entity_is_forgotten_and_rediscovered(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Removing an entity from the registry evicts it from the index."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+    msg = {
+        "type": "nodered/discovery",
+        "component": CONF_SENSOR,
+        "server_id": "srv",
+        "node_id": "node",
+        "config": {"name": "node"},
+    }
+
+    await client.send_json({"id": 1, **msg})
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    index = hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
+    assert ("srv", "node") in index
+
+    er.async_get(hass).async_remove("sensor.node")
+    await hass.async_block_till_done()
+    assert ("srv", "node") not in index
+    assert hass.states.get("sensor.node") is None
+
+    await client.send_json({"id": 2, **msg})
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    assert ("srv", "node") in index
+    assert hass.states.get("sensor.node") is not None
@@ -7,34 +7,44 @@ from typing import Any, cast
 from unittest.mock import patch
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
 
 from custom_components.nodered.const import (
+    ATTRIBUTE_OVERFLOW_TRUNCATE,
+    CONF_ATTRIBUTE_BUDGET,
+    CONF_ATTRIBUTE_OFFLOAD,
+    CONF_ATTRIBUTE_OVERFLOW,
     CONF_ATTRIBUTES,
-    CONF_COMPONENT,
     CONF_CONFIG,
     CONF_DEVICE_INFO,
+    CONF_EXCLUDE_FROM_RECORDER,
     CONF_NAME,
     CONF_NODE_ID,
     CONF_OPTIONS,
     CONF_REMOVE,
     CONF_SERVER_ID,
+    CONF_UNRECORDED_ATTRIBUTES,
     DOMAIN,
     DOMAIN_DATA,
     NODERED_CONFIG_UPDATE,
     NODERED_DISCOVERY_UPDATED,
     NODERED_ENTITY,
 )
-from custom_components.nodered.discovery import ALREADY_DISCOVERED, CHANGE_ENTITY_TYPE
+from custom_components.nodered.discovery import ALREADY_DISCOVERED, DiscoveryIndex
 from custom_components.nodered.entity import NodeRedEntity, generate_device_identifiers
+from custom_components.nodered.stats import async_get_stats
 from homeassistant.const import (
     CONF_DEVICE_CLASS,
     CONF_ENTITY_CATEGORY,
     CONF_ICON,
     CONF_ID,
     CONF_UNIT_OF_MEASUREMENT,
+    MATCH_ALL,
     EntityCategory,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 from tests.helpers import FakeConnection
 
 
@@ -56,70 +66,102 @@ class DummyEntity(NodeRedEntity):
         self.platform = None  # type: ignore[assignment]
 
 
-@patch("homeassistant.helpers.dispatcher.async_dispatcher_send")
-def test_handle_discovery_update_recreate_entity(
-    mock_dispatcher: Any,
-    hass: HomeAssistant,
-    fake_connection: FakeConnection,
+async def test_change_entity_type_migrates_registry_entry(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
-    ent = DummyEntity(hass, {"server_id": "s", "node_id": "n1", "config": {}})
-    # give the entity an id so hass.state removal won't error during teardown
-    ent.entity_id = f"sensor.nodered_{ent._node_id}"
-    captured: dict[str, Any] = {}
-
-    # Capture the callback passed to async_on_remove
-    def fake_async_on_remove(cb: Any) -> None:
-        captured["cb"] = cb
-
-    ent.async_on_remove = fake_async_on_remove  # type: ignore[attr-defined]
-    tasks: list[Any] = []
-    hass.async_create_task = tasks.append  # type: ignore[attr-defined]
+    """Switching a node's component keeps its registry settings and state."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+    discovery = {
+        "type": "nodered/discovery",
+        "server_id": "s",
+        "node_id": "n1",
+        "config": {"name": "node"},
+        "device_info": {"id": "dev-1", "name": "Device"},
+    }
 
-    sent: list[tuple] = []
-    mock_dispatcher.side_effect = lambda _h, sig, msg, conn=None: sent.append(
-        (sig, msg, conn)
+    await client.send_json({"id": 1, **discovery, "component": "sensor", "state": "on"})
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    ent_reg = er.async_get(hass)
+    old_entry = ent_reg.async_update_entity(
+        "sensor.node", name="Custom", icon="mdi:custom"
     )
+    assert old_entry.device_id is not None
+
+    await client.send_json({"id": 2, **discovery, "component": "binary_sensor"})
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+
+    assert ent_reg.async_get("sensor.node") is None
+    assert hass.states.get("sensor.node") is None
+    new_entry = ent_reg.async_get("binary_sensor.node")
+    assert new_entry is not None
+    assert new_entry.unique_id == old_entry.unique_id
+    assert new_entry.device_id == old_entry.device_id
+    assert new_entry.name == "Custom"
+    assert new_entry.icon == "mdi:custom"
+    state = hass.states.get("binary_sensor.node")
+    assert state is not None
+    assert state.state == "on"
+    index = hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
+    assert index.get("s", "n1") == "binary_sensor"
+
+
+def test_handle_discovery_update_remove_keeps_node_until_removed(
+    hass: HomeAssistant,
+) -> None:
+    ent = DummyEntity(hass, {"server_id": "s", "node_id": "n2", "config": {}})
+    index = hass.data.setdefault(DOMAIN_DATA, {})[ALREADY_DISCOVERED] = DiscoveryIndex()
+    index.add("s", "n2", "sensor")
 
-    msg = {CONF_REMOVE: CHANGE_ENTITY_TYPE, CONF_COMPONENT: "switch", CONF_ID: "mid"}
-    ent.handle_discovery_update(msg, fake_connection)
+    with patch.object(ent, "async_on_remove") as mock_on_remove:
+        ent.handle_discovery_update({CONF_REMOVE: "permanent"}, None)  # type: ignore[arg-type]
+    mock_on_remove.assert_not_called()
+    assert ("s", "n2") in index
 
-    # async_on_remove should have been called with a recreate callback
-    assert "cb" in captured
-    assert callable(captured["cb"])
-    # A task scheduling the entity removal should have been created
-    assert tasks
-    assert hasattr(tasks[0], "__await__")
-    # dispatcher_send not executed yet — recreate_entity will run when the
-    # on_remove callback is invoked
-    assert not sent
+    hass.loop.run_until_complete(ent.async_will_remove_from_hass())
+    assert ("s", "n2") not in index
+    assert len(index) == 0
 
 
-def test_handle_discovery_update_cleanup_discovery(hass: HomeAssistant) -> None:
-    ent = DummyEntity(hass, {"server_id": "s", "node_id": "n2", "config": {}})
-    # ensure teardown won't fail when hass removes entities
-    ent._remove_signal_entity_update = None
-    ent._remove_signal_discovery_update = None
-    ent._remove_signal_config_update = None
-    # Prepare discovery tracking with the entity present
-    hass.data.setdefault(DOMAIN_DATA, {})[ALREADY_DISCOVERED] = {
-        ent.unique_id: {"x": 1}
+async def test_renamed_entity_stays_discovered(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Renaming re-adds the entity, which must keep receiving discovery."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+    discovery = {
+        "type": "nodered/discovery",
+        "component": "sensor",
+        "server_id": "s",
+        "node_id": "n1",
     }
 
-    captured: dict[str, Any] = {}
-
-    def fake_async_on_remove(cb: Any) -> None:
-        captured["cb"] = cb
-
-    ent.async_on_remove = fake_async_on_remove  # type: ignore[attr-defined]
+    await client.send_json({"id": 1, **discovery, "config": {"name": "node"}})
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    er.async_get(hass).async_update_entity(
+        "sensor.node", new_entity_id="sensor.renamed"
+    )
+    await hass.async_block_till_done()
 
-    msg = {CONF_REMOVE: "permanent"}
-    ent.handle_discovery_update(msg, None)  # type: ignore[arg-type]
+    index = hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
+    assert index.get("s", "n1") == "sensor"
 
-    # Call the registered cleanup callback and assert it removes discovery entry
-    assert "cb" in captured
-    assert callable(captured["cb"])
-    captured["cb"]()
-    assert ent.unique_id not in hass.data[DOMAIN_DATA].get(ALREADY_DISCOVERED, {})
+    await client.send_json(
+        {"id": 2, **discovery, "config": {"name": "node", "icon": "mdi:new"}}
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.renamed").attributes["icon"] == "mdi:new"
+    assert len(hass.states.async_entity_ids("sensor")) == 1
 
 
 def test_handle_discovery_update_bidirectional_sets_connection_subscription(
@@ -134,7 +176,7 @@ def test_handle_discovery_update_bidirectional_sets_connection_subscription(
     ent._bidirectional = True
     msg = {CONF_CONFIG: {}, CONF_ID: "msg-1"}
     ent.handle_discovery_update(msg, fake_connection)
-    assert ent._attr_available is True
+    assert ent.available is True
     assert getattr(ent, "_message_id", None) == "msg-1"
     assert fake_connection.subscriptions.get("msg-1") == ent.handle_lost_connection
 
@@ -616,3 +658,111 @@ def test_update_config_ignores_empty_values(hass: HomeAssistant) -> None:
     assert ent._attr_name == "KeepName"
     assert ent._attr_icon == "mdi:keep"
     assert ent._attr_options == {"keep": 1}
+
+
+async def test_discovery_config_unrecorded_attributes(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Discovery config can keep attributes or the whole entity out of history."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+    discovery = {
+        "type": "nodered/discovery",
+        "component": "sensor",
+        "server_id": "s",
+        "node_id": "noisy",
+        "state": 1,
+        "attributes": {"payload": [1, 2, 3], "small": 1},
+    }
+
+    await client.send_json(
+        {
+            "id": 1,
+            **discovery,
+            # A single attribute may be given as a string
+            "config": {"name": "noisy", CONF_UNRECORDED_ATTRIBUTES: "payload"},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.noisy")
+    assert state is not None
+    assert state.state_info is not None
+    assert "payload" in state.state_info["unrecorded_attributes"]
+    assert "p" not in state.state_info["unrecorded_attributes"]
+    assert "small" not in state.state_info["unrecorded_attributes"]
+
+    await client.send_json(
+        {
+            "id": 2,
+            **discovery,
+            "config": {"name": "noisy", CONF_EXCLUDE_FROM_RECORDER: True},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    # Applies from the next state change
+    await client.send_json(
+        {
+            "id": 3,
+            "type": "nodered/entity",
+            "server_id": "s",
+            "node_id": "noisy",
+            "state": 2,
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    state = hass.states.get("sensor.noisy")
+    assert state.state_info is not None
+    assert state.state_info["unrecorded_attributes"] >= {MATCH_ALL}
+    assert "payload" not in state.state_info["unrecorded_attributes"]
+
+
+def test_attribute_budget_drops_and_offloads(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Oversized attributes are kept out of the state and counted."""
+    ent = DummyEntity(
+        hass,
+        {
+            "server_id": "s",
+            "node_id": "budget",
+            CONF_CONFIG: {CONF_ATTRIBUTE_BUDGET: 50, CONF_ATTRIBUTE_OFFLOAD: True},
+        },
+    )
+    stats = async_get_stats(hass)
+    before = stats.oversized_attributes
+    big = list(range(100))
+
+    ent.update_entity_state_attributes({CONF_ATTRIBUTES: {"ok": 1, "big": big}})
+    ent.update_entity_state_attributes({CONF_ATTRIBUTES: {"ok": 2, "big": big}})
+
+    assert ent.extra_state_attributes == {"ok": 2}
+    assert ent.full_attributes() == {"ok": 2, "big": big}
+    assert stats.oversized_attributes == before + 2
+    # Only the first overflow is logged
+    assert caplog.text.count("exceed its budget") == 1
+
+
+def test_attribute_budget_truncates_without_offload(hass: HomeAssistant) -> None:
+    """Truncated attributes stay in the state and nothing is offloaded."""
+    ent = DummyEntity(
+        hass,
+        {
+            "server_id": "s",
+            "node_id": "truncate",
+            CONF_CONFIG: {
+                CONF_ATTRIBUTE_BUDGET: 50,
+                CONF_ATTRIBUTE_OVERFLOW: ATTRIBUTE_OVERFLOW_TRUNCATE,
+            },
+        },
+    )
+
+    ent.update_entity_state_attributes({CONF_ATTRIBUTES: {"text": "z" * 200}})
+
+    assert ent.extra_state_attributes is not None
+    assert 0 < len(ent.extra_state_attributes["text"]) < 200
+    assert ent.full_attributes() == ent.extra_state_attributes
@@ -0,0 +1,74 @@
+"""Tests for the Node-RED expiry scheduler."""
+
+from datetime import UTC, datetime
+
+import pytest
+
+from custom_components.nodered import expiry
+from custom_components.nodered.expiry import ExpiryScheduler, async_get_expiry
+from homeassistant.core import HomeAssistant
+
+
+def _at(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=UTC)
+
+
+async def test_expiry_scheduler_expires_untouched_keys(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Keys expire once, after their deadline, unless touched."""
+    now = 1000.0
+    monkeypatch.setattr(expiry, "time", lambda: now)
+    scheduler = ExpiryScheduler(hass)
+    expired: list[str] = []
+
+    scheduler.async_add("a", 10, lambda: expired.append("a"))
+    scheduler.async_add("b", 30, lambda: expired.append("b"))
+
+    now = 1008.0
+    assert scheduler.touch("a") is False
+    scheduler._async_check(_at(1012))
+    assert expired == []
+
+    scheduler._async_check(_at(1019))
+    assert expired == ["a"]
+    scheduler._async_check(_at(1025))
+    assert expired == ["a"]
+
+    scheduler._async_check(_at(1031))
+    assert expired == ["a", "b"]
+
+    # Touching an expired key reports it and tracks it again
+    now = 1040.0
+    assert scheduler.touch("a") is True
+    scheduler._async_check(_at(1051))
+    assert expired == ["a", "b", "a"]
+
+    scheduler.async_remove("a")
+    scheduler.async_remove("b")
+    assert len(scheduler) == 0
+    assert scheduler._cancel_interval is None
+
+
+async def test_expiry_scheduler_ignores_removed_and_readded_keys(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Stale heap entries of removed or re-added keys never fire."""
+    monkeypatch.setattr(expiry, "time", lambda: 1000.0)
+    scheduler = async_get_expiry(hass)
+    assert async_get_expiry(hass) is scheduler
+    expired: list[str] = []
+
+    scheduler.async_add("keep", 100, lambda: expired.append("keep"))
+    scheduler.async_add("gone", 5, lambda: expired.append("gone"))
+    scheduler.async_remove("gone")
+    scheduler.async_add("readd", 5, lambda: expired.append("old"))
+    scheduler.async_add("readd", 50, lambda: expired.append("new"))
+
+    scheduler._async_check(_at(1010))
+    assert expired == []
+    scheduler._async_check(_at(1060))
+    assert expired == ["new"]
+
+    scheduler.async_remove("keep")
+    scheduler.async_remove("readd")
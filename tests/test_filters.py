@@ -0,0 +1,179 @@
+"""Tests for Node-RED state filters."""
+
+import pytest
+
+from custom_components.nodered import filters
+from custom_components.nodered.const import (
+    AGGREGATE_LAST,
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    CONF_DEADBAND,
+    CONF_DEADBAND_PERCENT,
+    CONF_FUNCTION,
+    CONF_MAX_SILENCE,
+    CONF_ROUND,
+    CONF_WINDOW,
+)
+from custom_components.nodered.filters import Deadband, WindowAggregator
+
+
+def test_from_config_returns_none_without_options() -> None:
+    """No filter is created unless a deadband or rounding is configured."""
+    assert Deadband.from_config({}) is None
+    assert Deadband.from_config({CONF_DEADBAND: 0, CONF_MAX_SILENCE: 10}) is None
+    assert Deadband.from_config({CONF_DEADBAND: "1"}) is None
+    assert Deadband.from_config({CONF_ROUND: 1}) is not None
+
+
+def test_absolute_deadband() -> None:
+    """Changes within the absolute deadband are held back."""
+    deadband = Deadband.from_config({CONF_DEADBAND: 0.5})
+    assert deadband is not None
+
+    assert deadband.filter(20.0) == (20.0, True)
+    assert deadband.filter(20.4) == (20.4, False)
+    assert deadband.filter(19.6) == (19.6, False)
+    assert deadband.filter(20.6) == (20.6, True)
+    # Compared with the last published value, not the last received one
+    assert deadband.filter(20.9) == (20.9, False)
+
+
+def test_percent_deadband_and_numeric_strings() -> None:
+    """The percentage is relative to the last published value."""
+    deadband = Deadband.from_config({CONF_DEADBAND_PERCENT: 10})
+    assert deadband is not None
+
+    assert deadband.filter("200") == ("200", True)
+    assert deadband.filter("215") == ("215", False)
+    assert deadband.filter("221") == ("221", True)
+
+
+def test_rounding() -> None:
+    """Values are rounded before comparison and publishing."""
+    deadband = Deadband.from_config({CONF_ROUND: 1})
+    assert deadband is not None
+
+    assert deadband.filter(21.04) == (21.0, True)
+    assert deadband.filter(20.96) == (21.0, False)
+    assert deadband.filter(21.06) == (21.1, True)
+
+    deadband = Deadband.from_config({CONF_ROUND: 0})
+    assert deadband is not None
+    assert deadband.filter(21.4) == (21, True)
+
+
+def test_non_numeric_values_are_published() -> None:
+    """Non numeric values pass through and reset the reference value."""
+    deadband = Deadband.from_config({CONF_DEADBAND: 5})
+    assert deadband is not None
+
+    assert deadband.filter(10) == (10, True)
+    assert deadband.filter("unknown") == ("unknown", True)
+    assert deadband.filter(None) == (None, True)
+    assert deadband.filter(11) == (11, True)
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", float("inf")])
+def test_non_finite_values_are_published(value: str | float) -> None:
+    """Non finite numbers pass through unrounded and reset the reference."""
+    deadband = Deadband.from_config({CONF_ROUND: 0})
+    assert deadband is not None
+
+    assert deadband.filter(5.2) == (5, True)
+    assert deadband.filter(value) == (value, True)
+    assert deadband.filter(5.2) == (5, True)
+
+
+def test_max_silence(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A held back value is published once max_silence has passed."""
+    now = 1000.0
+    monkeypatch.setattr(filters, "monotonic", lambda: now)
+    deadband = Deadband.from_config({CONF_DEADBAND: 1, CONF_MAX_SILENCE: 60})
+    assert deadband is not None
+
+    assert deadband.filter(5) == (5, True)
+    now += 30
+    assert deadband.filter(5.5) == (5.5, False)
+    now += 30
+    assert deadband.filter(5.5) == (5.5, True)
+    now += 1
+    assert deadband.filter(5.2) == (5.2, False)
+
+
+def test_forced_values_are_published() -> None:
+    """A forced value is published and becomes the reference value."""
+    deadband = Deadband.from_config({CONF_DEADBAND: 1})
+    assert deadband is not None
+
+    assert deadband.filter(5) == (5, True)
+    assert deadband.filter(5.5, force=True) == (5.5, True)
+    assert deadband.filter(6.4) == (6.4, False)
+
+
+def test_flush_held_value(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The last held back value is due max_silence after the last publish."""
+    now = 1000.0
+    monkeypatch.setattr(filters, "monotonic", lambda: now)
+    deadband = Deadband.from_config({CONF_DEADBAND: 1, CONF_MAX_SILENCE: 60})
+    assert deadband is not None
+
+    assert deadband.filter(5) == (5, True)
+    assert deadband.flush_delay() is None
+    assert deadband.flush() is None
+    now += 20
+    deadband.filter(5.5)
+    deadband.filter(5.2)
+    assert deadband.flush_delay() == 40
+    now += 40
+    assert deadband.flush() == 5.2
+    assert deadband.flush_delay() is None
+    # The flushed value is the new reference
+    assert deadband.filter(6.1) == (6.1, False)
+
+
+def test_window_aggregator_from_config() -> None:
+    """An aggregator needs a positive window; unknown functions use mean."""
+    assert WindowAggregator.from_config({}) is None
+    assert WindowAggregator.from_config({CONF_WINDOW: 0}) is None
+
+    aggregator = WindowAggregator.from_config({CONF_WINDOW: 10, CONF_FUNCTION: "x"})
+    assert aggregator is not None
+    assert aggregator.window == 10
+    assert aggregator.function == AGGREGATE_MEAN
+
+
+@pytest.mark.parametrize(
+    ("function", "expected"),
+    [
+        (AGGREGATE_MEAN, 2.5),
+        (AGGREGATE_MIN, 1),
+        (AGGREGATE_MAX, 4),
+        (AGGREGATE_LAST, 2),
+    ],
+)
+def test_window_aggregator_functions(function: str, expected: float) -> None:
+    """Each function aggregates the samples of the window."""
+    aggregator = WindowAggregator(10, function)
+    for value in (3, 1, 4, 2):
+        aggregator.add(value)
+
+    assert aggregator.flush() == (
+        expected,
+        {"window_min": 1, "window_max": 4, "window_count": 4},
+    )
+    # The next window starts empty
+    assert len(aggregator) == 0
+    assert aggregator.flush() is None
+
+
+def test_window_aggregator_overwrites_oldest_when_full() -> None:
+    """Only the most recent samples are kept once the buffer is full."""
+    aggregator = WindowAggregator(10, AGGREGATE_MEAN, capacity=3)
+    for value in (100, 1, 2, 3):
+        aggregator.add(value)
+
+    assert aggregator.flush() == (
+        2,
+        {"window_min": 1, "window_max": 3, "window_count": 4},
+    )
@@ -0,0 +1,256 @@
+"""Tests for the Node-RED in-memory entity history."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+from pytest_homeassistant_custom_component.typing import (
+    RecorderInstanceContextManager,
+    WebSocketGenerator,
+)
+
+from custom_components.nodered import history, websocket
+from custom_components.nodered.const import DOWNSAMPLE_LTTB
+from custom_components.nodered.history import (
+    HistoryBuffer,
+    HistoryCache,
+    HistoryQuery,
+    bucket_downsample,
+    lttb,
+)
+from homeassistant.components.recorder import Recorder
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceContextManager,
+) -> None:
+    """Prepare the recorder database before hass is set up."""
+
+
+def test_buffer_keeps_newest_samples_in_order() -> None:
+    """Once full, the oldest samples are overwritten."""
+    buffer = HistoryBuffer(3)
+    for timestamp in range(1, 6):
+        buffer.add(timestamp, timestamp * 10)
+
+    times, values = buffer.window()
+    assert len(buffer) == 3
+    assert list(times) == [3, 4, 5]
+    assert list(values) == [30, 40, 50]
+
+
+def test_window_starts_at_timestamp() -> None:
+    """Only samples at or after the start are returned."""
+    buffer = HistoryBuffer(10)
+    for timestamp in range(1, 6):
+        buffer.add(timestamp, timestamp)
+
+    times, values = buffer.window(3.5)
+    assert list(times) == [4, 5]
+    assert list(values) == [4, 5]
+    assert list(buffer.window(10)[0]) == []
+
+
+def test_aggregate() -> None:
+    """Aggregates cover the samples in the window."""
+    buffer = HistoryBuffer(4)
+    assert buffer.aggregate() == {"count": 0}
+    for timestamp, value in ((1, 5), (2, 1), (3, 9), (4, 3), (5, 7)):
+        buffer.add(timestamp, value)
+
+    assert buffer.aggregate() == {
+        "count": 4,
+        "start": 2,
+        "end": 5,
+        "first": 1,
+        "last": 7,
+        "min": 1,
+        "max": 9,
+        "mean": 5,
+    }
+    assert buffer.aggregate(4)["mean"] == 5
+
+
+def test_resized_keeps_newest_samples() -> None:
+    """Resizing keeps as many of the newest samples as fit."""
+    buffer = HistoryBuffer(4)
+    for timestamp in range(1, 5):
+        buffer.add(timestamp, timestamp)
+
+    smaller = buffer.resized(2)
+    assert smaller.capacity == 2
+    assert list(smaller.window()[1]) == [3, 4]
+    assert list(buffer.resized(8).window()[1]) == [1, 2, 3, 4]
+
+
+def test_lttb_keeps_endpoints_and_peaks() -> None:
+    """LTTB returns the requested points, keeping the ends and the spike."""
+    times = [float(t) for t in range(100)]
+    values = [0.0] * 100
+    values[42] = 50.0
+
+    sampled = lttb(times, values, 10)
+    assert len(sampled) == 10
+    assert sampled[0] == (0, 0)
+    assert sampled[-1] == (99, 0)
+    assert (42, 50) in sampled
+    assert lttb(times[:5], values[:5], 10) == list(
+        zip(times[:5], values[:5], strict=True)
+    )
+
+
+def test_bucket_downsample() -> None:
+    """Buckets split the time range evenly and skip empty buckets."""
+    times = [0, 1, 2, 3, 8, 10]
+    values = [1, 3, 5, 7, 2, 4]
+
+    assert bucket_downsample(times, values, 5) == [
+        (0, 2, 1, 3),
+        (2, 6, 5, 7),
+        (8, 3, 2, 4),
+    ]
+    assert bucket_downsample([], [], 5) == []
+
+
+async def test_history_cache_expiry_and_failures(
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Every query expires, live ones first, and failed queries are dropped."""
+    loop = asyncio.get_running_loop()
+    cache = HistoryCache(max_size=2, ttl=30, past_ttl=600)
+    now = datetime(2026, 1, 1, tzinfo=UTC)
+    live = HistoryQuery(("sensor.a",), now, None, 10, DOWNSAMPLE_LTTB)
+    past = HistoryQuery(("sensor.a",), now, now, 10, DOWNSAMPLE_LTTB)
+    failing = HistoryQuery(("sensor.b",), now, now, 10, DOWNSAMPLE_LTTB)
+
+    live_future = loop.create_future()
+    cache.add(live, live_future, live=True)
+    past_future = loop.create_future()
+    cache.add(past, past_future, live=False)
+    assert cache.get(live) is live_future
+
+    freezer.tick(timedelta(seconds=31))
+    assert cache.get(live) is None
+    assert cache.get(past) is past_future
+
+    freezer.tick(timedelta(seconds=600))
+    assert cache.get(past) is None
+
+    failing_future = loop.create_future()
+    cache.add(failing, failing_future, live=False)
+    failing_future.set_exception(ValueError)
+    await asyncio.sleep(0)
+    assert cache.get(failing) is None
+    assert len(cache) == 0
+
+
+async def test_websocket_history(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    start = dt_util.utcnow()
+    for value in ("1", "unavailable", "5", "2", "8", "3"):
+        hass.states.async_set("sensor.power", value)
+    await async_wait_recording_done(hass)
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    with patch(
+        "custom_components.nodered.websocket.fetch_recorder_history",
+        wraps=history.fetch_recorder_history,
+    ) as mock_fetch:
+        for msg_id in (4, 5):
+            await client.send_json(
+                {
+                    "id": msg_id,
+                    "type": "nodered/history",
+                    "entity_id": "sensor.power",
+                    "start_time": start.isoformat(),
+                }
+            )
+            resp = await client.receive_json()
+            assert [value for _time, value in resp["result"]["sensor.power"]] == [
+                1,
+                5,
+                2,
+                8,
+                3,
+            ]
+    # Raw results are not cached
+    assert mock_fetch.call_count == 2
+
+    with patch(
+        "custom_components.nodered.history.lttb", wraps=history.lttb
+    ) as mock_lttb:
+        for msg_id in (6, 7):
+            await client.send_json(
+                {
+                    "id": msg_id,
+                    "type": "nodered/history",
+                    "entity_id": ["sensor.power"],
+                    "start_time": start.isoformat(),
+                    "points": 3,
+                }
+            )
+            resp = await client.receive_json()
+            assert [value for _time, value in resp["result"]["sensor.power"]] == [
+                1,
+                8,
+                3,
+            ]
+    assert mock_lttb.call_count == 1
+
+    await client.send_json(
+        {
+            "id": 8,
+            "type": "nodered/history",
+            "entity_id": "sensor.power",
+            "start_time": start.isoformat(),
+            "points": 3,
+            "method": "bucket",
+        }
+    )
+    resp = await client.receive_json()
+    assert [len(bucket) for bucket in resp["result"]["sensor.power"]] == [4] * len(
+        resp["result"]["sensor.power"]
+    )
+
+    await client.send_json(
+        {
+            "id": 9,
+            "type": "nodered/history",
+            "entity_id": "sensor.power",
+            "start_time": start.isoformat(),
+            "method": "bucket",
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["error"]["code"] == "invalid_format"
+
+
+async def test_websocket_history_without_recorder(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/history",
+            "entity_id": "sensor.power",
+            "start_time": "2026-01-01T00:00:00+00:00",
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["error"]["code"] == "not_supported"
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import json
+from pathlib import Path
+import subprocess
+import sys
 from types import SimpleNamespace
 from typing import Any
 from unittest.mock import patch
@@ -16,8 +20,23 @@ from custom_components.nodered import (
     PLATFORMS_LOADED,
     async_remove_config_entry_device,
 )
-from custom_components.nodered.const import CONF_VERSION, DOMAIN, WEBHOOKS
+from custom_components.nodered.const import (
+    CONF_PROFILING,
+    CONF_VERSION,
+    DOMAIN,
+    WEBHOOKS,
+)
+from custom_components.nodered.discovery import ALREADY_DISCOVERED
 from custom_components.nodered.entity import NodeRedEntity, generate_device_identifiers
+from custom_components.nodered.history import (
+    DATA_HISTORY_CACHE,
+    async_get_history_cache,
+)
+from custom_components.nodered.profiler import async_get_profiler
+from custom_components.nodered.registry import (
+    DATA_REGISTRY_TRACKER,
+    async_get_registry_tracker,
+)
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
@@ -71,9 +90,9 @@ async def test_async_setup_entry_invokes_start_and_registers(
 
     # Verify domain data was initialized
     assert DOMAIN_DATA in hass.data
-    # Verify platforms were loaded
-    assert PLATFORMS_LOADED in hass.data[DOMAIN_DATA]
-    assert len(hass.data[DOMAIN_DATA][PLATFORMS_LOADED]) > 0
+    # Other platforms are only loaded once Node-RED discovers an entity for
+    # them; the switch platform provides the trigger service from the start
+    assert hass.data[DOMAIN_DATA][PLATFORMS_LOADED] == {"switch"}
 
 
 @pytest.mark.asyncio
@@ -90,6 +109,8 @@ async def test_async_unload_entry_stops_discovery_and_cleans_data(
 
     # Verify data is present
     assert DOMAIN_DATA in hass.data
+    async_get_history_cache(hass)
+    async_get_registry_tracker(hass).async_listen(lambda version, change: None)
 
     # Unload the integration
     assert await hass.config_entries.async_unload(config_entry.entry_id)
@@ -97,11 +118,83 @@ async def test_async_unload_entry_stops_discovery_and_cleans_data(
 
     # Verify cleanup happened
     assert DOMAIN_DATA not in hass.data
+    assert DATA_HISTORY_CACHE not in hass.data
+    assert DATA_REGISTRY_TRACKER not in hass.data
+
+
+async def _async_discover(
+    client: Any, msg_id: int, component: str, node_id: str
+) -> None:
+    """Send a discovery message for a new entity."""
+    await client.send_json(
+        {
+            "id": msg_id,
+            "type": "nodered/discovery",
+            "component": component,
+            "server_id": "srv",
+            "node_id": node_id,
+            "config": {"name": node_id},
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["success"]
+
+
+@pytest.mark.asyncio
+async def test_platform_loaded_on_first_discovery(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test a platform is only set up once an entity is discovered for it."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await _async_discover(client, 1, "sensor", "first")
+    await _async_discover(client, 2, "sensor", "second")
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN_DATA][PLATFORMS_LOADED] == {"sensor", "switch"}
+    assert hass.states.get("sensor.first") is not None
+    assert hass.states.get("sensor.second") is not None
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.first").state == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_options_update_applied_in_place(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test an options change keeps entities and discovery state alive."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await _async_discover(client, 1, "sensor", "kept")
+    await hass.async_block_till_done()
+    domain_data = hass.data[DOMAIN_DATA]
+
+    with patch.object(hass.config_entries, "async_reload") as mock_reload:
+        hass.config_entries.async_update_entry(
+            config_entry, options={CONF_PROFILING: True}
+        )
+        await hass.async_block_till_done()
+
+    mock_reload.assert_not_called()
+    assert hass.data[DOMAIN_DATA] is domain_data
+    assert ("srv", "kept") in domain_data[ALREADY_DISCOVERED]
+    assert hass.states.get("sensor.kept").state != "unavailable"
+    assert async_get_profiler(hass).enabled
 
 
 @pytest.mark.asyncio
 async def test_async_unload_entry_partial_failure(
-    hass: HomeAssistant,
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
     """Test unload when some platforms fail to unload."""
 
@@ -111,6 +204,12 @@ async def test_async_unload_entry_partial_failure(
     assert await hass.config_entries.async_setup(config_entry.entry_id)
     await hass.async_block_till_done()
 
+    # Discover entities so there are platforms to unload
+    client = await hass_ws_client(hass)
+    await _async_discover(client, 1, "sensor", "sensor_node")
+    await _async_discover(client, 2, "switch", "switch_node")
+    await hass.async_block_till_done()
+
     # Mock one platform to fail unload
     call_count = 0
     original_unload = hass.config_entries.async_forward_entry_unload
@@ -313,3 +412,95 @@ async def test_webhooks_cleaned_up_on_unload(
     assert DOMAIN_DATA not in hass.data or WEBHOOKS not in hass.data.get(
         DOMAIN_DATA, {}
     )
+
+
+# Platforms are loaded when Node-RED first discovers an entity for them, so
+# importing the integration must not import any of them
+PLATFORM_MODULES = [
+    f"{package}.{platform}"
+    for package in ("custom_components.nodered", "homeassistant.components")
+    for platform in (
+        "binary_sensor",
+        "button",
+        "number",
+        "select",
+        "sensor",
+        "switch",
+        "text",
+        "time",
+    )
+]
+DEFERRED_MODULES = [
+    "hassil",
+    "homeassistant.components.device_automation",
+    "homeassistant.helpers.trigger",
+]
+IMPORT_SCRIPT = """
+import json, sys
+
+import custom_components.nodered
+import custom_components.nodered.websocket
+
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def test_import_skips_platforms_and_on_demand_modules() -> None:
+    """Test importing the integration leaves platforms to be loaded on demand."""
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+    loaded = set(json.loads(result.stdout))
+
+    assert loaded.isdisjoint(PLATFORM_MODULES)
+    assert loaded.isdisjoint(DEFERRED_MODULES)
+
+
+# Home Assistant modules the integration imports at load time; they are shared
+# with every other integration, so they are imported before timing our own.
+IMPORT_TIME_SCRIPT = """
+import homeassistant.core
+import homeassistant.components.webhook
+import homeassistant.components.websocket_api
+import homeassistant.config_entries
+
+import custom_components.nodered
+import custom_components.nodered.websocket
+"""
+
+
+def _cumulative_import_times(stderr: str) -> dict[str, int]:
+    """Return the cumulative import time of each top-level import."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time_is_bounded() -> None:
+    """Test importing the integration costs less than importing the core."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_TIME_SCRIPT],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).parent.parent,
+        text=True,
+    )
+    times = _cumulative_import_times(result.stderr)
+    own = sum(
+        cumulative
+        for name, cumulative in times.items()
+        if name.startswith("custom_components")
+    )
+
+    # Generous bound measured relative to the same interpreter so it holds on
+    # slow machines; the integration currently takes a fraction of the core.
+    assert 0 < own < times["homeassistant.core"]
@@ -1,7 +1,14 @@
 """Tests for Node-RED number entity."""
 
+from unittest.mock import patch
+
 from custom_components.nodered import number
-from custom_components.nodered.const import CONF_CONFIG, CONF_NUMBER
+from custom_components.nodered.const import (
+    CONF_CONFIG,
+    CONF_DEADBAND_PERCENT,
+    CONF_NUMBER,
+    CONF_ROUND,
+)
 from custom_components.nodered.number import NodeRedNumber
 from homeassistant.core import HomeAssistant
 from tests.helpers import FakeConnection
@@ -168,3 +175,76 @@ def test_class_attributes() -> None:
     # These are defined directly on the class
     assert NodeRedNumber._bidirectional is True
     assert NodeRedNumber.component == CONF_NUMBER
+
+
+def test_deadband_applies_to_number_state(
+    hass: HomeAssistant, fake_connection: FakeConnection
+) -> None:
+    """Numbers round and hold back small changes like sensors."""
+    node = NodeRedNumber(
+        hass,
+        {
+            number.CONF_ID: 1,
+            "server_id": "s1",
+            "node_id": "n1",
+            "state": 100.04,
+            CONF_CONFIG: {CONF_DEADBAND_PERCENT: 1, CONF_ROUND: 1},
+        },
+        fake_connection,
+    )
+    assert node.native_value == 100.0
+
+    with patch.object(node, "async_write_ha_state") as write:
+        node.handle_entity_update({"state": 100.9})
+        assert node.native_value == 100.0
+        node.handle_entity_update({"state": 101.26})
+        assert node.native_value == 101.3
+
+    assert write.call_count == 1
+
+
+async def test_commanded_value_bypasses_deadband(
+    hass: HomeAssistant, fake_connection: FakeConnection
+) -> None:
+    """A value set from Home Assistant is shown however small the change."""
+    node = NodeRedNumber(
+        hass,
+        {
+            number.CONF_ID: 1,
+            "server_id": "s1",
+            "node_id": "n1",
+            "state": 100,
+            CONF_CONFIG: {CONF_DEADBAND_PERCENT: 1},
+        },
+        fake_connection,
+    )
+
+    with patch.object(node, "async_write_ha_state"):
+        await node.async_set_native_value(100.5)
+        node.handle_entity_update({"state": 100.5})
+        assert node.native_value == 100.5
+        # Only the echo of the command bypasses the deadband
+        node.handle_entity_update({"state": 100.9})
+        assert node.native_value == 100.5
+
+
+def test_deadband_kept_when_options_unchanged(
+    hass: HomeAssistant, fake_connection: FakeConnection
+) -> None:
+    """Discovery updates only rebuild the deadband when its options change."""
+    config = {CONF_DEADBAND_PERCENT: 1, CONF_ROUND: 1}
+    node = NodeRedNumber(
+        hass,
+        {number.CONF_ID: 1, "server_id": "s1", "node_id": "n1", CONF_CONFIG: config},
+        fake_connection,
+    )
+    deadband = node._deadband
+    assert deadband is not None
+
+    node.update_discovery_config(
+        {CONF_CONFIG: {**config, number.CONF_ICON: "mdi:dial"}}
+    )
+    assert node._deadband is deadband
+
+    node.update_discovery_config({CONF_CONFIG: {**config, CONF_ROUND: 2}})
+    assert node._deadband is not deadband
@@ -0,0 +1,145 @@
+"""Tests for the opt-in handler profiler."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.nodered.const import (
+    CONF_PROFILING,
+    CONF_PROFILING_SAMPLES,
+    CONF_PROFILING_THRESHOLD,
+)
+from custom_components.nodered.profiler import (
+    KIND_ENTITY,
+    PROFILE_DIR,
+    NodeRedProfiler,
+    async_get_profiler,
+)
+from custom_components.nodered.sensor import NodeRedSensor
+from custom_components.nodered.stats import async_response
+from homeassistant.core import HomeAssistant
+
+
+def test_async_get_profiler_is_shared_and_disabled(hass: HomeAssistant) -> None:
+    profiler = async_get_profiler(hass)
+    assert async_get_profiler(hass) is profiler
+    assert profiler.enabled is False
+
+
+def test_run_passes_through_when_disabled(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    profiler = NodeRedProfiler(hass)
+
+    assert profiler.run(KIND_ENTITY, "sensor.x", "s", "n", lambda a: a * 2, 21) == 42
+    assert "Slow" not in caplog.text
+
+
+def test_run_logs_slow_handlers_with_ids(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    profiler = NodeRedProfiler(hass)
+    profiler.async_configure({CONF_PROFILING: True, CONF_PROFILING_THRESHOLD: 0})
+
+    profiler.run(KIND_ENTITY, "sensor.x", "srv-1", "node-1", lambda: None)
+
+    assert "Slow entity handler sensor.x" in caplog.text
+    assert "server_id: srv-1" in caplog.text
+    assert "node_id: node-1" in caplog.text
+
+
+def test_run_does_not_log_fast_handlers(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    profiler = NodeRedProfiler(hass)
+    profiler.async_configure({CONF_PROFILING: True, CONF_PROFILING_THRESHOLD: 1000})
+
+    profiler.run(KIND_ENTITY, "sensor.x", "s", "n", lambda: None)
+
+    assert "Slow" not in caplog.text
+
+
+def test_wrap_handler_reads_ids_from_message(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    profiler = NodeRedProfiler(hass)
+    profiler.async_configure({CONF_PROFILING: True, CONF_PROFILING_THRESHOLD: 0})
+    calls: list[dict[str, Any]] = []
+
+    def handler(_hass: Any, _connection: Any, msg: dict[str, Any]) -> None:
+        calls.append(msg)
+
+    wrapped = profiler.wrap_handler("nodered/entity", handler)
+    wrapped(hass, None, {"server_id": "srv", "node_id": "node"})
+
+    assert len(calls) == 1
+    assert "Slow websocket handler nodered/entity" in caplog.text
+    assert "node_id: node" in caplog.text
+
+
+async def test_async_handlers_are_profiled_around_their_coroutine(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """The time of an async handler covers its awaited work."""
+    async_get_profiler(hass).async_configure(
+        {CONF_PROFILING: True, CONF_PROFILING_THRESHOLD: 10}
+    )
+
+    @async_response
+    async def handler(_hass: Any, _connection: Any, _msg: dict[str, Any]) -> None:
+        await asyncio.sleep(0.02)
+
+    handler(
+        hass,
+        None,
+        {"id": 1, "type": "nodered/slow", "server_id": "srv", "node_id": "node"},
+    )
+    assert "Slow" not in caplog.text
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert "Slow websocket handler nodered/slow" in caplog.text
+    assert "node_id: node" in caplog.text
+
+
+def test_entity_config_updates_are_profiled(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    async_get_profiler(hass).async_configure(
+        {CONF_PROFILING: True, CONF_PROFILING_THRESHOLD: 0}
+    )
+    sensor = NodeRedSensor(hass, {"server_id": "s", "node_id": "n", "config": {}})
+    sensor.entity_id = "sensor.profiled"
+
+    with patch.object(sensor, "async_write_ha_state"):
+        sensor.handle_config_update({"config": {"name": "renamed"}})
+
+    assert "Slow entity handler sensor.profiled" in caplog.text
+
+
+async def test_slowest_samples_written_to_config_dir(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    hass.config.config_dir = str(tmp_path)
+    profiler = NodeRedProfiler(hass)
+    profiler.async_configure(
+        {
+            CONF_PROFILING: True,
+            CONF_PROFILING_THRESHOLD: 0,
+            CONF_PROFILING_SAMPLES: 1,
+        }
+    )
+
+    with patch("custom_components.nodered.profiler.PROFILE_SAMPLE_INTERVAL", 1):
+        for _ in range(3):
+            profiler.run(KIND_ENTITY, "sensor.x", "s", "n", sum, range(1000))
+            await hass.async_block_till_done()
+
+    files = await hass.async_add_executor_job(
+        lambda: list((tmp_path / PROFILE_DIR).glob("*.prof"))
+    )
+    # Only the slowest trace is kept
+    assert len(files) == 1
+    assert files[0].name.startswith("entity_sensor_x_")
@@ -0,0 +1,123 @@
+"""Tests for the Node-RED registry change stream."""
+
+from collections import deque
+
+from custom_components.nodered.const import DOMAIN
+from custom_components.nodered.registry import (
+    DATA_REGISTRY_TRACKER,
+    RegistryTracker,
+    async_get_registry_tracker,
+    async_stop_registry_tracker,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, entity_registry as er
+
+
+async def test_tracker_records_changes(hass: HomeAssistant) -> None:
+    """Registry events are numbered and passed to listeners."""
+    tracker = async_get_registry_tracker(hass)
+    assert async_get_registry_tracker(hass) is tracker
+    tracker.async_start()
+    seen: list[tuple[int, dict]] = []
+    tracker.async_listen(lambda version, change: seen.append((version, change)))
+
+    area = ar.async_get(hass).async_create("Kitchen")
+    ent_reg = er.async_get(hass)
+    entry = ent_reg.async_get_or_create("sensor", DOMAIN, "a", suggested_object_id="a")
+    ent_reg.async_update_entity(entry.entity_id, new_entity_id="sensor.renamed")
+    await hass.async_block_till_done()
+
+    assert [version for version, _ in seen] == [1, 2, 3, 4]
+    assert seen[0][1] == {
+        "registry": "area",
+        "action": "create",
+        "id": area.id,
+        "data": {
+            "area_id": area.id,
+            "name": "Kitchen",
+            "floor_id": None,
+            "icon": None,
+            "labels": [],
+        },
+    }
+    assert seen[1][1]["registry"] == "entity"
+    assert seen[1][1]["data"]["entity_id"] == "sensor.a"
+    # A rename removes the old id and updates the new one
+    assert seen[2][1] == {"registry": "entity", "action": "remove", "id": "sensor.a"}
+    assert seen[3][1]["id"] == "sensor.renamed"
+    assert seen[3][1]["action"] == "update"
+
+    snapshot = tracker.async_snapshot()
+    assert snapshot["version"] == 4
+    assert snapshot["epoch"] == tracker.epoch
+    assert [area["area_id"] for area in snapshot["areas"]] == [area.id]
+    assert [entity["entity_id"] for entity in snapshot["entities"]] == [
+        "sensor.renamed"
+    ]
+
+
+async def test_tracker_records_without_listeners(hass: HomeAssistant) -> None:
+    """Changes are recorded while nobody listens, until the tracker stops."""
+    tracker = RegistryTracker(hass)
+    tracker.async_start()
+    epoch = tracker.epoch
+    remove = tracker.async_listen(lambda version, change: None)
+    remove()
+    area_registry = ar.async_get(hass)
+    area_registry.async_create("One")
+    await hass.async_block_till_done()
+    assert [change["data"]["name"] for change in tracker.changes_since(epoch, 0)] == [
+        "One"
+    ]
+
+    # Starting again has no effect while the tracker is running
+    tracker.async_start()
+    assert tracker.epoch == epoch
+
+    tracker.async_stop()
+    area_registry.async_create("Two")
+    await hass.async_block_till_done()
+    assert tracker.version == 1
+
+    # Changes made meanwhile were missed, so old versions need a snapshot
+    tracker.async_start()
+    assert tracker.epoch != epoch
+    assert tracker.version == 0
+    assert tracker.changes_since(epoch, 1) is None
+
+
+async def test_stop_registry_tracker(hass: HomeAssistant) -> None:
+    """Stopping the tracker removes its registry listeners and listeners."""
+    tracker = async_get_registry_tracker(hass)
+    tracker.async_start()
+    seen: list[int] = []
+    tracker.async_listen(lambda version, change: seen.append(version))
+
+    async_stop_registry_tracker(hass)
+    ar.async_get(hass).async_create("Kitchen")
+    await hass.async_block_till_done()
+
+    assert DATA_REGISTRY_TRACKER not in hass.data
+    assert seen == []
+    assert tracker.version == 0
+
+
+async def test_tracker_changes_since(hass: HomeAssistant) -> None:
+    """Clients only catch up from versions that are still kept."""
+    tracker = RegistryTracker(hass)
+    tracker._changes = deque(maxlen=2)
+    tracker.async_start()
+    area_registry = ar.async_get(hass)
+    for name in ("One", "Two", "Three"):
+        area_registry.async_create(name)
+    await hass.async_block_till_done()
+
+    assert tracker.version == 3
+    assert tracker.changes_since(tracker.epoch, 3) == []
+    assert [
+        change["data"]["name"] for change in tracker.changes_since(tracker.epoch, 1)
+    ] == ["Two", "Three"]
+    # Dropped from the log, from the future or from another run
+    assert tracker.changes_since(tracker.epoch, 0) is None
+    assert tracker.changes_since(tracker.epoch, 4) is None
+    assert tracker.changes_since("other", 3) is None
@@ -1,16 +1,39 @@
 """Tests for Node-RED sensor last_reset handling."""
 
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 from typing import Any, cast
+from unittest.mock import patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
 
 from custom_components.nodered.const import (
     CONF_CONFIG,
+    CONF_DEADBAND,
+    CONF_DIAGNOSTIC_SENSORS,
+    CONF_EXPIRE_AFTER,
+    CONF_FUNCTION,
     CONF_LAST_RESET,
+    CONF_MAX_SILENCE,
     CONF_STATE_CLASS,
+    CONF_WINDOW,
+    DIAGNOSTICS_SERVER_ID,
+    DOMAIN,
+    NODERED_DISCOVERY,
+    NODERED_ENTITY,
+)
+from custom_components.nodered.entity import async_get_device_index
+from custom_components.nodered.sensor import (
+    DIAGNOSTIC_SENSORS,
+    NodeRedDiagnosticSensor,
+    NodeRedSensor,
 )
-from custom_components.nodered.sensor import NodeRedSensor
+from custom_components.nodered.stats import async_get_stats
 from homeassistant.components.sensor import SensorDeviceClass
 from homeassistant.const import (
     CONF_DEVICE_CLASS,
@@ -18,6 +41,10 @@ from homeassistant.const import (
     EntityCategory,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.util import dt as dt_util
+from tests.helpers import FakeConnection
 
 
 def test_update_discovery_config_sets_last_reset_for_timestamp(
@@ -463,3 +490,327 @@ def test_update_discovery_config_overwrites_existing_last_reset(
 
     assert "last_reset" in node.__dict__
     assert node.last_reset == datetime.fromisoformat("2023-01-02T03:04:05+00:00")
+
+
+async def test_diagnostic_sensors_created_when_enabled(hass: HomeAssistant) -> None:
+    """Throughput sensors are only created when the option is enabled."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data={}, options={CONF_DIAGNOSTIC_SENSORS: True}
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    ent_reg = er.async_get(hass)
+    entries = [
+        entry
+        for entry in er.async_entries_for_config_entry(ent_reg, config_entry.entry_id)
+        if entry.domain == "sensor"
+    ]
+    assert len(entries) == len(DIAGNOSTIC_SENSORS)
+    assert all(entry.entity_category == EntityCategory.DIAGNOSTIC for entry in entries)
+
+    state = hass.states.get("sensor.node_red_managed_entities")
+    assert state is not None
+    assert state.attributes["state_class"] == "measurement"
+    # The diagnostic sensors do not count themselves
+    assert int(state.state) == 0
+
+
+async def test_diagnostic_sensors_ignore_node_red_messages(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Messages for the diagnostics ids cannot change the sensors."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data={}, options={CONF_DIAGNOSTIC_SENSORS: True}
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    before = hass.states.get("sensor.node_red_managed_entities")
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "nodered/entity",
+            "server_id": DIAGNOSTICS_SERVER_ID,
+            "node_id": "managed_entities",
+            "state": 99,
+            "attributes": {"injected": True},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "nodered/entity/update_config",
+            "server_id": DIAGNOSTICS_SERVER_ID,
+            "node_id": "managed_entities",
+            "config": {"name": "Hijacked"},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+
+    after = hass.states.get("sensor.node_red_managed_entities")
+    assert after.state == before.state
+    assert after.attributes == before.attributes
+
+
+async def test_diagnostic_sensors_not_created_by_default(hass: HomeAssistant) -> None:
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.node_red_messages_per_minute") is None
+
+
+async def test_diagnostic_sensors_follow_options_in_place(
+    hass: HomeAssistant,
+) -> None:
+    """Toggling the option adds and removes the sensors without a reload."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_DIAGNOSTIC_SENSORS: True}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.node_red_messages_per_minute") is not None
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_DIAGNOSTIC_SENSORS: False}
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.node_red_messages_per_minute") is None
+    assert not er.async_entries_for_config_entry(
+        er.async_get(hass), config_entry.entry_id
+    )
+
+
+def test_diagnostic_sensor_config(hass: HomeAssistant) -> None:
+    sensor = NodeRedDiagnosticSensor(hass, "messages_per_minute")
+
+    assert sensor.unique_id == f"{DOMAIN}-diagnostics-messages_per_minute"
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.native_unit_of_measurement == "messages/min"
+    assert sensor.state_class == "measurement"
+
+
+def test_deadband_suppresses_small_changes(hass: HomeAssistant) -> None:
+    """Updates within the deadband skip the state write."""
+    node = NodeRedSensor(
+        hass,
+        {
+            "server_id": "s1",
+            "node_id": "deadband",
+            "state": 20.0,
+            CONF_CONFIG: {CONF_DEADBAND: 0.5},
+        },
+    )
+    stats = async_get_stats(hass)
+    suppressed = stats.suppressed_writes
+    writes = stats.state_writes
+
+    with patch.object(node, "async_write_ha_state") as write:
+        node.handle_entity_update({"state": 20.2})
+        assert node.native_value == 20.0
+        assert not write.called
+
+        # A new attribute value still writes, with the held back state
+        node.handle_entity_update({"state": 20.3, "attributes": {"a": 1}})
+        assert node.native_value == 20.0
+        assert write.call_count == 1
+
+        node.handle_entity_update({"state": 21, "attributes": {"a": 1}})
+        assert node.native_value == 21
+        assert write.call_count == 2
+
+    assert stats.suppressed_writes == suppressed + 1
+    assert stats.state_writes == writes + 2
+
+
+async def test_deadband_flushes_held_value_after_max_silence(
+    hass: HomeAssistant,
+    fake_connection: FakeConnection,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A held back value is published after max_silence without new updates."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_dispatcher_send(
+        hass,
+        NODERED_DISCOVERY,
+        {
+            "component": "sensor",
+            "server_id": "s1",
+            "node_id": "quiet",
+            "state": 5,
+            CONF_CONFIG: {"name": "quiet", CONF_DEADBAND: 1, CONF_MAX_SILENCE: 60},
+        },
+        fake_connection,
+    )
+    await hass.async_block_till_done()
+    async_dispatcher_send(hass, NODERED_ENTITY.format("s1", "quiet"), {"state": 5.5})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.quiet").state == "5"
+
+    freezer.tick(timedelta(seconds=61))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.quiet").state == "5.5"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_window_aggregate_published_once_per_window(
+    hass: HomeAssistant, fake_connection: FakeConnection
+) -> None:
+    """Samples are held back and the aggregate is published each window."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_dispatcher_send(
+        hass,
+        NODERED_DISCOVERY,
+        {
+            "component": "sensor",
+            "server_id": "s1",
+            "node_id": "power",
+            CONF_CONFIG: {"name": "power", CONF_WINDOW: 10, CONF_FUNCTION: "max"},
+        },
+        fake_connection,
+    )
+    await hass.async_block_till_done()
+
+    for value in (5, 9, "7"):
+        async_dispatcher_send(
+            hass, NODERED_ENTITY.format("s1", "power"), {"state": value}
+        )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.power").state == "unknown"
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.power")
+    assert state.state == "9.0"
+    assert state.attributes["window_min"] == 5
+    assert state.attributes["window_max"] == 9
+    assert state.attributes["window_count"] == 3
+
+
+def test_window_aggregator_kept_and_node_attributes_win(
+    hass: HomeAssistant,
+) -> None:
+    """Unrelated config changes keep the window; Node-RED attributes win."""
+    config = {CONF_WINDOW: 10, CONF_FUNCTION: "max"}
+    node = NodeRedSensor(
+        hass, {"server_id": "s1", "node_id": "power", CONF_CONFIG: config}
+    )
+    aggregator = node._aggregator
+    assert aggregator is not None
+
+    node.update_discovery_config({CONF_CONFIG: {**config, "icon": "mdi:flash"}})
+    assert node._aggregator is aggregator
+    node.update_discovery_config({CONF_CONFIG: {**config, CONF_WINDOW: 20}})
+    assert node._aggregator is not aggregator
+
+    with patch.object(node, "async_write_ha_state"):
+        node.handle_entity_update({"state": 5, "attributes": {"window_max": "mine"}})
+        node._async_publish_window(dt_util.utcnow())
+    assert node.extra_state_attributes == {
+        "window_min": 5,
+        "window_max": "mine",
+        "window_count": 1,
+    }
+
+
+async def test_expire_after_marks_sensor_unavailable(
+    hass: HomeAssistant,
+    fake_connection: FakeConnection,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """A sensor without updates within expire_after becomes unavailable."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    async_dispatcher_send(
+        hass,
+        NODERED_DISCOVERY,
+        {
+            "component": "sensor",
+            "server_id": "s1",
+            "node_id": "stale",
+            "state": 1,
+            "device_info": {"id": "dev-1", "name": "Device"},
+            CONF_CONFIG: {"name": "stale", CONF_EXPIRE_AFTER: 30},
+        },
+        fake_connection,
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.stale").state == "1"
+
+    freezer.tick(timedelta(seconds=31))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.stale").state == "unavailable"
+
+    async_dispatcher_send(hass, NODERED_ENTITY.format("s1", "stale"), {"state": 2})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.stale").state == "2"
+    assert len(async_get_device_index(hass).entities("dev-1")) == 1
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert not async_get_device_index(hass).entities("dev-1")
+
+
+async def test_expiry_keeps_device_unavailable(
+    hass: HomeAssistant,
+    fake_connection: FakeConnection,
+) -> None:
+    """Restarting the expire_after deadline does not override the device."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    discovery = {
+        "component": "sensor",
+        "server_id": "s1",
+        "node_id": "stale",
+        "state": 1,
+        "device_info": {"id": "dev-1", "name": "Device"},
+        CONF_CONFIG: {"name": "stale", CONF_EXPIRE_AFTER: 30},
+    }
+    async_dispatcher_send(hass, NODERED_DISCOVERY, discovery, fake_connection)
+    await hass.async_block_till_done()
+    (entity,) = async_get_device_index(hass).entities("dev-1")
+    entity.handle_device_availability(False)
+
+    discovery[CONF_CONFIG] = {"name": "stale", CONF_EXPIRE_AFTER: 60}
+    async_dispatcher_send(hass, NODERED_DISCOVERY, discovery, fake_connection)
+    await hass.async_block_till_done()
+    async_dispatcher_send(hass, NODERED_ENTITY.format("s1", "stale"), {"state": 2})
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.stale").state == "unavailable"
+
+    entity.handle_device_availability(True)
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.stale").state == "2"
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
@@ -28,7 +28,7 @@ def test_convert_recognize_result_to_dict_various(
             self.text = text
             self.pattern = None
 
-    monkeypatch.setattr(sentence_mod, "Sentence", DummySentence)
+    monkeypatch.setattr("hassil.expression.Sentence", DummySentence)
 
     s = DummySentence("hello")
     assert convert_recognize_result_to_dict(s) == {"text": "hello", "pattern": None}
@@ -0,0 +1,108 @@
+"""Tests for Node-RED state matching and projection."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.nodered.const import DOMAIN
+from custom_components.nodered.states import StateMatcher, project_state
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.json import json_bytes
+
+
+def test_matcher_ids_globs_and_domains(hass: HomeAssistant) -> None:
+    """Exact ids, globs and domains are combined with OR."""
+    matcher = StateMatcher(
+        hass,
+        entity_ids=["sensor.exact", "light.kitchen_*", "switch.fan_?"],
+        domains=["binary_sensor"],
+    )
+
+    assert matcher("sensor.exact")
+    assert matcher("light.kitchen_ceiling")
+    assert matcher("switch.fan_1")
+    assert matcher("binary_sensor.door")
+    assert not matcher("sensor.exact_2")
+    assert not matcher("light.living_room")
+    assert not matcher("switch.fan_10")
+
+
+def test_matcher_without_selectors_matches_all(hass: HomeAssistant) -> None:
+    """A matcher with no selectors matches every entity."""
+    matcher = StateMatcher(hass)
+
+    assert matcher.match_all
+    assert matcher("anything.at_all")
+
+
+async def test_matcher_areas_and_labels(hass: HomeAssistant) -> None:
+    """Areas come from the entity or its device, labels from the entity."""
+    config_entry = MockConfigEntry(domain=DOMAIN)
+    config_entry.add_to_hass(hass)
+    area = ar.async_get(hass).async_create("Kitchen")
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=config_entry.entry_id, identifiers={(DOMAIN, "dev")}
+    )
+    dr.async_get(hass).async_update_device(device.id, area_id=area.id)
+    ent_reg = er.async_get(hass)
+    on_device = ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "a", suggested_object_id="a", device_id=device.id
+    )
+    labelled = ent_reg.async_get_or_create(
+        "sensor", DOMAIN, "b", suggested_object_id="b"
+    )
+    ent_reg.async_update_entity(labelled.entity_id, labels={"power"})
+    other = ent_reg.async_get_or_create("sensor", DOMAIN, "c", suggested_object_id="c")
+
+    matcher = StateMatcher(hass, areas=[area.id], labels=["power"])
+    stop = matcher.async_track_registries()
+
+    assert StateMatcher(hass, devices=[device.id])(on_device.entity_id)
+    assert matcher(on_device.entity_id)
+    assert matcher(labelled.entity_id)
+    assert not matcher(other.entity_id)
+    assert not matcher("sensor.unregistered")
+
+    # Cached results are dropped when the registry changes
+    ent_reg.async_update_entity(other.entity_id, area_id=area.id)
+    await hass.async_block_till_done()
+    assert matcher(other.entity_id)
+
+    stop()
+
+
+async def test_matcher_async_states(hass: HomeAssistant) -> None:
+    """Matching states are returned, looking up exact ids directly."""
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+    hass.states.async_set("light.c", "on")
+
+    def entity_ids(matcher: StateMatcher) -> list[str]:
+        return sorted(state.entity_id for state in matcher.async_states())
+
+    assert entity_ids(StateMatcher(hass)) == ["light.c", "sensor.a", "sensor.b"]
+    assert entity_ids(StateMatcher(hass, entity_ids=["sensor.a", "sensor.x"])) == [
+        "sensor.a"
+    ]
+    assert entity_ids(StateMatcher(hass, entity_ids=["sensor.*"])) == [
+        "sensor.a",
+        "sensor.b",
+    ]
+    assert entity_ids(StateMatcher(hass, domains=["light"])) == ["light.c"]
+
+
+async def test_project_state(hass: HomeAssistant) -> None:
+    """Projection keeps the requested attributes only."""
+    hass.states.async_set("sensor.power", "5", {"unit": "W", "friendly_name": "P"})
+    state = hass.states.get("sensor.power")
+
+    projected = project_state(state, frozenset({"unit", "missing"}))
+    assert projected["state"] == "5"
+    assert projected["attributes"] == {"unit": "W"}
+
+    # Without a projection the cached JSON is reused
+    assert json_bytes(project_state(state, None)) == state.as_dict_json
+    assert project_state(None, None) is None
@@ -0,0 +1,164 @@
+"""Tests for the integration runtime counters."""
+
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+
+from custom_components.nodered.const import DOMAIN_DATA, WEBHOOKS
+from custom_components.nodered.stats import (
+    ASYNC_HANDLER,
+    DATA_STATS,
+    NS_PER_MS,
+    WINDOW_SECONDS,
+    NodeRedStats,
+    RollingCounter,
+    async_get_stats,
+    async_response,
+    async_stats_snapshot,
+    counted_handler,
+    timed_handler,
+    timed_schema,
+)
+from homeassistant.core import HomeAssistant
+
+
+def test_async_get_stats_is_shared(hass: HomeAssistant) -> None:
+    stats = async_get_stats(hass)
+    assert isinstance(stats, NodeRedStats)
+    assert async_get_stats(hass) is stats
+    assert hass.data[DATA_STATS] is stats
+
+
+def test_command_stats_created_once() -> None:
+    stats = NodeRedStats()
+    assert stats.command("nodered/entity") is stats.command("nodered/entity")
+    assert set(stats.as_dict()["commands"]) == {"nodered/entity"}
+
+
+def test_timed_handler_counts_messages_and_time() -> None:
+    stats = NodeRedStats()
+    command_stats = stats.command("nodered/entity")
+    calls: list[dict[str, Any]] = []
+
+    def handler(_hass: Any, _connection: Any, msg: dict[str, Any]) -> None:
+        calls.append(msg)
+
+    wrapped = timed_handler(handler, stats, "nodered/entity")
+    wrapped(None, None, {"id": 1})
+    wrapped(None, None, {"id": 2})
+
+    assert [msg["id"] for msg in calls] == [1, 2]
+    assert command_stats.messages == 2
+    assert command_stats.dispatch_ns > 0
+    assert stats.throughput()["messages_per_minute"] == 2
+
+
+def test_timed_handler_counts_time_when_handler_raises() -> None:
+    stats = NodeRedStats()
+    command_stats = stats.command("nodered/entity")
+
+    def handler(_hass: Any, _connection: Any, _msg: dict[str, Any]) -> None:
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        timed_handler(handler, stats, "nodered/entity")(None, None, {})
+    assert command_stats.messages == 1
+    assert command_stats.dispatch_ns > 0
+
+
+def test_messages_per_second_covers_recent_window() -> None:
+    stats = NodeRedStats()
+    wrapped = timed_handler(lambda *_args: None, stats, "nodered/entity")
+    wrapped(None, None, {})
+    wrapped(None, None, {})
+
+    command = stats.as_dict()["commands"]["nodered/entity"]
+    assert command["messages_per_second"] == round(2 / WINDOW_SECONDS, 3)
+
+
+async def test_async_response_times_the_coroutine(hass: HomeAssistant) -> None:
+    """Dispatch time covers the awaited handler, not scheduling its task."""
+    stats = async_get_stats(hass)
+    command_stats = stats.command("nodered/slow")
+
+    @async_response
+    async def handler(_hass: Any, _connection: Any, _msg: dict[str, Any]) -> None:
+        await asyncio.sleep(0.02)
+
+    assert getattr(handler, ASYNC_HANDLER)
+    counted_handler(handler, stats, "nodered/slow")(
+        hass, None, {"id": 1, "type": "nodered/slow"}
+    )
+    assert command_stats.messages == 1
+    assert command_stats.dispatch_ns == 0
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert command_stats.dispatch_ns >= 20 * NS_PER_MS
+    assert stats.throughput()["average_handler_latency"] >= 20
+
+
+def test_timed_schema_counts_invalid_messages() -> None:
+    command_stats = NodeRedStats().command("nodered/entity")
+    validate = timed_schema(vol.Schema({vol.Required("id"): int}), command_stats)
+
+    assert validate({"id": 1}) == {"id": 1}
+    with pytest.raises(vol.Invalid):
+        validate({"id": "x"})
+
+    assert command_stats.invalid == 1
+    assert command_stats.validation_ns > 0
+
+
+def test_entity_counts_never_go_negative() -> None:
+    stats = NodeRedStats()
+    stats.entity_added("sensor")
+    stats.entity_removed("sensor")
+    stats.entity_removed("sensor")
+    assert stats.as_dict()["entities"] == {"sensor": 0}
+
+
+def test_snapshot_includes_webhooks(hass: HomeAssistant) -> None:
+    hass.data[DOMAIN_DATA] = {WEBHOOKS: {"a", "b"}}
+    async_get_stats(hass).state_writes = 3
+
+    snapshot = async_stats_snapshot(hass)
+
+    assert snapshot["webhooks"] == 2
+    assert snapshot["state_writes"] == 3
+    assert snapshot["suppressed_writes"] == 0
+
+
+def test_rolling_counter_drops_values_outside_window() -> None:
+    counter = RollingCounter(size=3)
+    with patch("custom_components.nodered.stats.monotonic", return_value=100.0):
+        counter.add()
+        counter.add(2)
+        assert counter.total() == 3
+    with patch("custom_components.nodered.stats.monotonic", return_value=102.0):
+        counter.add()
+        assert counter.total() == 4
+    with patch("custom_components.nodered.stats.monotonic", return_value=103.5):
+        # Bucket for second 100 has aged out
+        assert counter.total() == 1
+        counter.add()
+        assert counter.total() == 2
+
+
+def test_throughput_reports_recent_activity() -> None:
+    stats = NodeRedStats()
+    stats.record_state_write()
+    stats.record_webhook_request()
+    stats.entity_added("sensor")
+    stats.entity_added("switch")
+
+    throughput = stats.throughput()
+
+    assert throughput["state_writes_per_minute"] == 1
+    assert throughput["webhook_requests_per_minute"] == 1
+    assert throughput["messages_per_minute"] == 0
+    assert throughput["average_handler_latency"] == 0.0
+    assert throughput["managed_entities"] == 2
+    assert stats.command("nodered/webhook").events == 1
@@ -0,0 +1,40 @@
+"""Tests for the Node-RED template cache."""
+
+from custom_components.nodered.templates import (
+    TemplateCache,
+    async_get_template_cache,
+    async_render_will_timeout,
+    render_template,
+)
+from homeassistant.core import HomeAssistant
+
+
+def test_cache_reuses_and_evicts_least_recently_used(hass: HomeAssistant) -> None:
+    """Templates are reused by source and the least recently used is dropped."""
+    cache = TemplateCache(hass, max_size=2)
+
+    first = cache.get("{{ 1 }}")
+    second = cache.get("{{ 2 }}")
+    assert cache.get("{{ 1 }}") is first
+
+    cache.get("{{ 3 }}")
+    assert len(cache) == 2
+    assert cache.get("{{ 1 }}") is first
+    assert cache.get("{{ 2 }}") is not second
+
+
+def test_render_template_returns_result_or_error(hass: HomeAssistant) -> None:
+    """Render errors are returned instead of raised."""
+    cache = async_get_template_cache(hass)
+    assert async_get_template_cache(hass) is cache
+
+    assert render_template(cache.get("{{ a + b }}"), {"a": 1, "b": 2}) == {"result": 3}
+    assert "error" in render_template(cache.get("{{ 1 | no_such_filter }}"), {})
+
+
+async def test_render_will_timeout(hass: HomeAssistant) -> None:
+    """Fast templates and templates that fail to compile do not time out."""
+    cache = async_get_template_cache(hass)
+
+    assert not await async_render_will_timeout(cache.get("{{ a }}"), {"a": 1}, 5)
+    assert not await async_render_will_timeout(cache.get("{{ 1 +"), None, 5)
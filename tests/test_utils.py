@@ -4,7 +4,11 @@ from datetime import timedelta
 
 import pytest
 
-from custom_components.nodered.utils import NodeRedJSONEncoder
+from custom_components.nodered.utils import (
+    NodeRedJSONEncoder,
+    StringPool,
+    apply_attribute_budget,
+)
 
 
 def test_json_encoder() -> None:
@@ -47,3 +51,81 @@ def test_json_encoder_delegates_and_raises_for_unknown_types() -> None:
         # Expected: JSONEncoder.default raises TypeError for unknown objects
         return
     pytest.fail("Expected TypeError when encoding an unsupported object type")
+
+
+def _fresh(value: str) -> str:
+    """Build an equal string that is a distinct object from the literal."""
+    return "".join(list(value))
+
+
+def test_string_pool_returns_shared_instance() -> None:
+    pool = StringPool()
+    first = pool.intern(_fresh("on"))
+    second = pool.intern(_fresh("on"))
+    assert first == "on"
+    assert first is second
+
+
+def test_string_pool_skips_long_and_non_string_values() -> None:
+    pool = StringPool(max_length=4)
+    long_value = "x" * 5
+    assert pool.intern(long_value) is long_value
+    assert pool.intern(12) == 12
+    assert pool.intern(None) is None
+    assert len(pool) == 0
+
+
+def test_string_pool_is_bounded() -> None:
+    pool = StringPool(max_size=2)
+    for value in ("a", "b", "c"):
+        pool.intern(value)
+    assert len(pool) <= 2
+
+
+def test_string_pool_intern_attributes_copies_and_pools() -> None:
+    pool = StringPool()
+    attrs = {_fresh("source"): _fresh("idle"), "count": 3}
+    first = pool.intern_attributes(attrs)
+    second = pool.intern_attributes({_fresh("source"): _fresh("idle"), "count": 3})
+    assert first == attrs
+    assert first is not attrs
+    assert next(iter(first)) is next(iter(second))
+    assert first["source"] is second["source"]
+
+
+def test_apply_attribute_budget_drops_overflow() -> None:
+    """Attributes that no longer fit the budget are dropped in order."""
+    attributes = {"small": 1, "large": "x" * 100, "after": 2}
+
+    kept, overflow = apply_attribute_budget(attributes, 40, truncate=False)
+
+    assert kept == {"small": 1, "after": 2}
+    assert overflow == {"large": "x" * 100}
+
+
+def test_apply_attribute_budget_truncates_strings_and_lists() -> None:
+    """Strings and lists are cut down to fit when truncating."""
+    kept, overflow = apply_attribute_budget({"text": "y" * 100}, 30, truncate=True)
+    assert 0 < len(kept["text"]) < 100
+    assert overflow == {"text": "y" * 100}
+
+    kept, _ = apply_attribute_budget({"items": list(range(100))}, 30, truncate=True)
+    assert kept["items"] == list(range(len(kept["items"])))
+    assert 0 < len(kept["items"]) < 100
+
+    # Other types cannot be truncated and are dropped
+    kept, overflow = apply_attribute_budget(
+        {"mapping": {"k": "v" * 100}}, 30, truncate=True
+    )
+    assert kept == {}
+    assert "mapping" in overflow
+
+
+def test_apply_attribute_budget_within_budget() -> None:
+    """Attributes within the budget are returned unchanged."""
+    attributes = {"a": 1, "b": "two"}
+
+    assert apply_attribute_budget(attributes, 1000, truncate=False) == (
+        attributes,
+        {},
+    )
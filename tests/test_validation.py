@@ -0,0 +1,137 @@
+"""Tests for the fast websocket validators."""
+
+from collections.abc import Callable
+import timeit
+from typing import Any
+
+import pytest
+import voluptuous as vol
+
+from custom_components.nodered import websocket
+from custom_components.nodered.validation import FastSchema
+
+ENTITY: dict[str, Any] = {
+    "id": 5,
+    "type": "nodered/entity",
+    "server_id": "srv",
+    "node_id": "node",
+    "state": 21.5,
+    "attributes": {"unit": "C"},
+}
+CONFIG_UPDATE: dict[str, Any] = {
+    "id": 6,
+    "type": "nodered/entity/update_config",
+    "server_id": "srv",
+    "node_id": "node",
+    "config": {"name": "Kitchen"},
+}
+DISCOVERY: dict[str, Any] = {
+    "id": 7,
+    "type": "nodered/discovery",
+    "component": "sensor",
+    "server_id": "srv",
+    "node_id": "node",
+    "config": {"unrecorded_attributes": ["forecast"]},
+    "state": "on",
+    "attributes": {},
+}
+
+
+class StrSubclass(str):
+    """String subclass that must go through the full schema."""
+
+    __slots__ = ()
+
+
+ODD_VALUES = (
+    None,
+    True,
+    0,
+    -1,
+    1.5,
+    "1",
+    "",
+    StrSubclass("x"),
+    [],
+    {},
+    {"nested": [1]},
+)
+
+
+def _variants(base: dict[str, Any]) -> list[dict[str, Any]]:
+    """Build valid, coercible and invalid variants of a message."""
+    variants = [dict(base)]
+    for key in base:
+        if key == "type":
+            continue
+        without = dict(base)
+        del without[key]
+        variants.append(without)
+        variants.extend({**base, key: value} for value in ODD_VALUES)
+    variants.append({**base, "extra": 1})
+    variants.append({**base, "type": "nodered/other"})
+    return variants
+
+
+def _outcome(validate: Callable[[dict[str, Any]], Any], msg: dict[str, Any]) -> Any:
+    try:
+        return ("ok", validate(dict(msg)))
+    except vol.Invalid as err:
+        return ("invalid", str(err))
+
+
+@pytest.mark.parametrize(
+    ("handler", "base"),
+    [
+        (websocket.websocket_entity, ENTITY),
+        (websocket.websocket_config_update, CONFIG_UPDATE),
+        (websocket.websocket_discovery, DISCOVERY),
+    ],
+)
+def test_fast_schema_matches_voluptuous(handler: Any, base: dict[str, Any]) -> None:
+    """The fast path must accept and reject exactly what voluptuous does."""
+    fast = handler._ws_schema
+    assert isinstance(fast, FastSchema)
+
+    for msg in _variants(base):
+        assert _outcome(fast, msg) == _outcome(fast.schema, msg), msg
+
+
+def test_fast_schema_fills_defaults_and_copies() -> None:
+    fast = websocket.websocket_entity._ws_schema
+    msg = {k: v for k, v in ENTITY.items() if k != "attributes"}
+
+    validated = fast(msg)
+
+    assert validated == {**msg, "attributes": {}}
+    assert validated is not msg
+
+
+def test_fast_schema_sends_device_trigger_to_full_schema() -> None:
+    fast = websocket.websocket_discovery._ws_schema
+    msg = {**DISCOVERY, "device_trigger": {"platform": "invalid"}}
+
+    with pytest.raises(vol.Invalid):
+        fast(msg)
+
+
+def test_fast_schema_is_faster_than_voluptuous() -> None:
+    """Benchmark the hot nodered/entity path against the voluptuous schema."""
+    fast = websocket.websocket_entity._ws_schema
+    number = 2000
+
+    fast_time = timeit.timeit(lambda: fast(ENTITY), number=number)
+    full_time = timeit.timeit(lambda: fast.schema(ENTITY), number=number)
+
+    assert fast_time < full_time
+
+
+@pytest.mark.parametrize("unrecorded", ["forecast", ("forecast",), [1], None])
+def test_discovery_unrecorded_attributes_go_to_full_schema(unrecorded: Any) -> None:
+    """Unrecorded attributes that are not a list of strings are validated."""
+    fast = websocket.websocket_discovery._ws_schema
+    msg = {**DISCOVERY, "config": {"unrecorded_attributes": unrecorded}}
+
+    assert _outcome(fast, msg) == _outcome(fast.schema, msg)
+    if unrecorded == "forecast":
+        assert fast(msg)["config"]["unrecorded_attributes"] == ["forecast"]
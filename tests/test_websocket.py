@@ -1,29 +1,42 @@
 """Tests for websocket handlers."""
 
+import asyncio
 import json
 from typing import Any
 from unittest.mock import AsyncMock, patch
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 from pytest_homeassistant_custom_component.typing import WebSocketGenerator
 import voluptuous as vol
 
 from custom_components.nodered import websocket
-from custom_components.nodered.const import DOMAIN, VERSION
+from custom_components.nodered.const import DOMAIN, DOMAIN_DATA, VERSION
+from custom_components.nodered.discovery import ALREADY_DISCOVERED
 from custom_components.nodered.websocket import websocket_device_trigger
-from homeassistant.components.device_automation.exceptions import DeviceNotFound
+from homeassistant.components.device_automation.exceptions import (
+    DeviceNotFound,
+    InvalidDeviceAutomationConfig,
+)
 from homeassistant.components.webhook import async_register as webhook_real_register
 from homeassistant.components.websocket_api.messages import (
     error_message,
     result_message,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
 from tests.helpers import FakeConnection, create_device_with_entity
 
 
 @pytest.mark.asyncio
-@patch.object(websocket.device_automation, "async_get_device_automation_platform")
+@patch(
+    "homeassistant.components.device_automation.async_get_device_automation_platform"
+)
 async def test_websocket_device_action_calls_platform_and_sends_result(
     mock_get_platform: Any,
     hass: HomeAssistant,
@@ -62,6 +75,488 @@ async def test_websocket_device_action_calls_platform_and_sends_result(
     assert resp == result_message(msg["id"])
 
 
+@pytest.mark.asyncio
+@patch(
+    "homeassistant.components.device_automation.async_get_device_automation_platform"
+)
+async def test_websocket_device_action_batch(
+    mock_get_platform: Any,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    resolved: list[str] = []
+    running = 0
+    max_running = 0
+
+    class Platform:
+        async def async_call_action_from_config(
+            self, _hass: HomeAssistant, action: Any, _variables: Any, _context: Any
+        ) -> None:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0)
+            running -= 1
+            if action["device_id"] == "gone":
+                msg = "no device"
+                raise DeviceNotFound(msg)
+
+    async def fake_get(_hass: HomeAssistant, domain: str, _t: Any) -> Platform:
+        resolved.append(domain)
+        if domain == "bad":
+            msg = "no platform"
+            raise InvalidDeviceAutomationConfig(msg)
+        return Platform()
+
+    mock_get_platform.side_effect = fake_get
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/device/action/batch",
+            "concurrency": 2,
+            "actions": [
+                {"domain": "light", "device_id": "a"},
+                {"domain": "light", "device_id": "gone"},
+                {"domain": "bad", "device_id": "b"},
+                {"domain": "light", "device_id": "c", "entity_id": "missing"},
+                {"domain": "switch", "device_id": "d"},
+                {"domain": "light", "device_id": "e"},
+            ],
+        }
+    )
+    resp = await client.receive_json()
+
+    assert resp["success"]
+    assert resp["result"]["results"] == [
+        {"success": True},
+        {
+            "success": False,
+            "error": {"code": "device_not_found", "message": "no device"},
+        },
+        {
+            "success": False,
+            "error": {"code": "invalid_config", "message": "no platform"},
+        },
+        {
+            "success": False,
+            "error": {
+                "code": "entity_not_found",
+                "message": "Entity 'missing' not found",
+            },
+        },
+        {"success": True},
+        {"success": True},
+    ]
+    # Each platform is resolved once and the concurrency limit is honoured
+    assert resolved == ["light", "bad", "switch"]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+@patch(
+    "homeassistant.components.device_automation.async_get_device_automation_platform"
+)
+async def test_websocket_device_action_batch_isolates_errors(
+    mock_get_platform: Any,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    errors: dict[str, Exception] = {
+        "ha": HomeAssistantError("failed"),
+        "invalid": vol.Invalid("bad option"),
+        "unexpected": KeyError("boom"),
+    }
+    ran: list[str] = []
+
+    class Platform:
+        async def async_call_action_from_config(
+            self, _hass: HomeAssistant, action: Any, _variables: Any, _context: Any
+        ) -> None:
+            ran.append(action["device_id"])
+            if (err := errors.get(action["device_id"])) is not None:
+                raise err
+
+    mock_get_platform.return_value = Platform()
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/device/action/batch",
+            "actions": [
+                {"domain": "light", "device_id": device_id}
+                for device_id in ("a", "ha", "invalid", "unexpected", "b")
+            ],
+        }
+    )
+    resp = await client.receive_json()
+
+    assert resp["success"]
+    results = resp["result"]["results"]
+    assert results[0] == {"success": True}
+    assert results[1]["error"] == {"code": "home_assistant_error", "message": "failed"}
+    assert results[2]["error"]["code"] == "invalid_format"
+    assert results[3]["error"]["code"] == "unknown_error"
+    assert results[4] == {"success": True}
+    assert ran == ["a", "ha", "invalid", "unexpected", "b"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_call_services(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    calls: list[ServiceCall] = []
+
+    async def record(call: ServiceCall) -> None:
+        calls.append(call)
+
+    async def fail(_call: ServiceCall) -> None:
+        msg = "boom"
+        raise HomeAssistantError(msg)
+
+    hass.services.async_register("test", "record", record)
+    hass.services.async_register("test", "fail", fail)
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/call_services",
+            "calls": [
+                {"domain": "test", "service": "record", "data": {"n": 1}},
+                {"domain": "test", "service": "fail"},
+                {"domain": "test", "service": "missing"},
+            ],
+        }
+    )
+    resp = await client.receive_json()
+
+    assert resp["success"]
+    results = resp["result"]["results"]
+    assert [result["success"] for result in results] == [True, False, False]
+    assert results[1]["error"] == {"code": "home_assistant_error", "message": "boom"}
+    assert results[2]["error"]["code"] == "not_found"
+    assert all(result["duration_ms"] >= 0 for result in results)
+    assert resp["result"]["duration_ms"] >= 0
+    assert len(calls) == 1
+    assert calls[0].data == {"n": 1}
+    assert calls[0].context.id == resp["result"]["context"]["id"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_call_services_grouped(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    calls: list[ServiceCall] = []
+
+    async def record(call: ServiceCall) -> None:
+        calls.append(call)
+
+    hass.services.async_register("test", "record", record)
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/call_services",
+            "group": True,
+            "calls": [
+                {
+                    "domain": "test",
+                    "service": "record",
+                    "target": {"entity_id": "light.a"},
+                },
+                {"domain": "test", "service": "record", "data": {"n": 1}},
+                {
+                    "domain": "test",
+                    "service": "record",
+                    "target": {"entity_id": ["light.b", "light.a"]},
+                },
+            ],
+        }
+    )
+    resp = await client.receive_json()
+
+    assert [result["success"] for result in resp["result"]["results"]] == [
+        True,
+        True,
+        True,
+    ]
+    assert len(calls) == 2
+    targeted = next(call for call in calls if "entity_id" in call.data)
+    assert targeted.data["entity_id"] == ["light.a", "light.b"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_registry_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 5, "type": "nodered/registry/subscribe"})
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]
+    assert snapshot["type"] == "snapshot"
+    assert set(snapshot) >= {"areas", "devices", "entities", "labels"}
+    epoch = snapshot["epoch"]
+    version = snapshot["version"]
+
+    ar.async_get(hass).async_create("Kitchen")
+    await hass.async_block_till_done()
+    diff = (await client.receive_json())["event"]
+    assert diff["type"] == "diff"
+    assert diff["version"] == version + 1
+    assert diff["changes"][0]["data"]["name"] == "Kitchen"
+
+    # The only client goes away while the registry changes
+    await client.send_json({"id": 6, "type": "unsubscribe_events", "subscription": 5})
+    assert (await client.receive_json())["success"]
+    ar.async_get(hass).async_create("Garage")
+    await hass.async_block_till_done()
+
+    # Resuming with the last seen version only returns what was missed
+    await client.send_json(
+        {
+            "id": 7,
+            "type": "nodered/registry/subscribe",
+            "epoch": epoch,
+            "version": version + 1,
+        }
+    )
+    assert (await client.receive_json())["success"]
+    diff = (await client.receive_json())["event"]
+    assert diff["type"] == "diff"
+    assert diff["epoch"] == epoch
+    assert diff["version"] == version + 2
+    assert [change["data"]["name"] for change in diff["changes"]] == ["Garage"]
+
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_websocket_get_states(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    hass.states.async_set("sensor.power_1", "5", {"unit": "W", "extra": "x"})
+    hass.states.async_set("sensor.power_2", "7", {"unit": "W"})
+    hass.states.async_set("light.kitchen", "on")
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {"id": 5, "type": "nodered/get_states", "entity_id": "sensor.power_*"}
+    )
+    resp = await client.receive_json()
+    assert sorted(state["entity_id"] for state in resp["result"]) == [
+        "sensor.power_1",
+        "sensor.power_2",
+    ]
+    power_1 = next(s for s in resp["result"] if s["entity_id"] == "sensor.power_1")
+    assert power_1["attributes"] == {"unit": "W", "extra": "x"}
+
+    await client.send_json(
+        {
+            "id": 6,
+            "type": "nodered/get_states",
+            "entity_id": "sensor.power_1",
+            "attributes": ["unit"],
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["result"][0]["attributes"] == {"unit": "W"}
+
+    await client.send_json(
+        {
+            "id": 7,
+            "type": "nodered/get_states",
+            "domains": ["light", "sensor"],
+            "state_only": True,
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["result"] == {
+        "sensor.power_1": "5",
+        "sensor.power_2": "7",
+        "light.kitchen": "on",
+    }
+
+
+@pytest.mark.asyncio
+async def test_websocket_subscribe_states(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/subscribe_states",
+            "entity_id": ["sensor.power_*"],
+            "domains": "light",
+            "attributes": ["unit"],
+        }
+    )
+    assert (await client.receive_json())["success"]
+
+    hass.states.async_set("sensor.other", "1")
+    hass.states.async_set("sensor.power_1", "5", {"unit": "W", "extra": "x"})
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+
+    event = await client.receive_json()
+    assert event["id"] == 5
+    assert event["type"] == "event"
+    assert event["event"]["entity_id"] == "sensor.power_1"
+    assert event["event"]["old_state"] is None
+    assert event["event"]["new_state"]["state"] == "5"
+    assert event["event"]["new_state"]["attributes"] == {"unit": "W"}
+    event = await client.receive_json()
+    assert event["event"]["entity_id"] == "light.kitchen"
+
+    stats = websocket.async_get_stats(hass).command("nodered/subscribe_states")
+    assert stats.events == 2
+    assert stats.subscriptions == 1
+
+    await client.send_json({"id": 6, "type": "unsubscribe_events", "subscription": 5})
+    assert (await client.receive_json())["success"]
+    assert stats.subscriptions == 0
+
+
+@pytest.mark.asyncio
+async def test_websocket_render_templates(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    hass.states.async_set("sensor.power", "5")
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/render_templates",
+            "templates": [
+                {"template": "{{ states('sensor.power') | int * 2 }}"},
+                {
+                    "template": "{{ name }} is {{ value }}",
+                    "variables": {"name": "x", "value": 1},
+                },
+                {"template": "{{ 1 | no_such_filter }}"},
+            ],
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["success"]
+    results = resp["result"]["results"]
+    assert results[0] == {"result": 10}
+    assert results[1] == {"result": "x is 1"}
+    assert "no_such_filter" in results[2]["error"]
+
+
+@pytest.mark.asyncio
+async def test_websocket_render_templates_timeout(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Templates exceeding the timeout are reported instead of rendered."""
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+    templates = [{"template": "{{ 1 }}"}, {"template": "{{ 2 }}"}]
+
+    with patch(
+        "custom_components.nodered.websocket.async_render_will_timeout",
+        AsyncMock(side_effect=[False, True, False, True]),
+    ) as will_timeout:
+        await client.send_json(
+            {
+                "id": 5,
+                "type": "nodered/render_templates",
+                "templates": templates,
+                "timeout": 2,
+            }
+        )
+        resp = await client.receive_json()
+        assert resp["result"]["results"] == [
+            {"result": 1},
+            {"error": "Exceeded maximum execution time of 2.0s"},
+        ]
+
+        await client.send_json(
+            {
+                "id": 6,
+                "type": "nodered/render_templates",
+                "templates": templates,
+                "timeout": 2,
+                "subscribe": True,
+            }
+        )
+        resp = await client.receive_json()
+        assert resp["error"]["code"] == "template_error"
+        assert resp["error"]["message"].startswith("Template 1 exceeded")
+
+    assert will_timeout.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_websocket_render_templates_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    hass.states.async_set("sensor.power", "5")
+    hass.states.async_set("sensor.energy", "1")
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json(
+        {
+            "id": 5,
+            "type": "nodered/render_templates",
+            "templates": [
+                {"template": "{{ states('sensor.power') }}"},
+                {"template": "{{ states('sensor.energy') }}"},
+                {"template": "{{ states('sensor.power') }}"},
+            ],
+            "subscribe": True,
+        }
+    )
+    assert (await client.receive_json())["success"]
+    event = await client.receive_json()
+    assert sorted(
+        (result["index"], result["result"]) for result in event["event"]["results"]
+    ) == [(0, 5), (1, 1), (2, 5)]
+
+    hass.states.async_set("sensor.other", "3")
+    hass.states.async_set("sensor.energy", "2")
+    await hass.async_block_till_done()
+    event = await client.receive_json()
+    assert event["event"]["results"] == [{"index": 1, "result": 2}]
+
+    stats = websocket.async_get_stats(hass).command("nodered/render_templates")
+    assert stats.events == 2
+    assert stats.subscriptions == 1
+
+    await client.send_json({"id": 6, "type": "unsubscribe_events", "subscription": 5})
+    assert (await client.receive_json())["success"]
+    assert stats.subscriptions == 0
+
+
 @pytest.mark.asyncio
 async def test_websocket_device_action_entity_not_found(
     hass: HomeAssistant,
@@ -86,7 +581,9 @@ async def test_websocket_device_action_entity_not_found(
 
 
 @pytest.mark.asyncio
-@patch.object(websocket.device_automation, "async_get_device_automation_platform")
+@patch(
+    "homeassistant.components.device_automation.async_get_device_automation_platform"
+)
 async def test_websocket_device_action_handles_device_not_found(
     mock_get_platform: Any,
     hass: HomeAssistant,
@@ -209,6 +706,299 @@ async def test_websocket_discovery_and_entity_and_update_config_and_version(
     assert resp4 == result_message(12, VERSION)
 
 
+@pytest.mark.asyncio
+async def test_websocket_stats_counts_commands(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    websocket.register_websocket_handlers(hass)
+    client = await hass_ws_client(hass)
+
+    await client.send_json({"id": 1, "type": "nodered/version"})
+    await client.receive_json()
+    # Invalid message: missing state
+    await client.send_json(
+        {"id": 2, "type": "nodered/entity", "server_id": "s", "node_id": "n"}
+    )
+    await client.receive_json()
+
+    await client.send_json({"id": 3, "type": "nodered/stats"})
+    resp = await client.receive_json()
+
+    assert resp["success"] is True
+    commands = resp["result"]["commands"]
+    assert commands["nodered/version"]["messages"] == 1
+    assert commands["nodered/entity"]["messages"] == 0
+    assert commands["nodered/entity"]["invalid"] == 1
+    assert resp["result"]["webhooks"] == 0
+
+
+async def _async_setup_discovered(
+    hass: HomeAssistant, client: Any, nodes: list[tuple[str, str]]
+) -> None:
+    """Set up the integration and discover a sensor per (server_id, node_id)."""
+    config_entry = MockConfigEntry(domain=DOMAIN, data={})
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    for msg_id, (server_id, node_id) in enumerate(nodes, start=1):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "nodered/discovery",
+                "component": "sensor",
+                "server_id": server_id,
+                "node_id": node_id,
+                "config": {"name": node_id},
+            }
+        )
+        assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+
+
+@pytest.mark.asyncio
+async def test_websocket_discovery_remove_batch_node_ids(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    client = await hass_ws_client(hass)
+    await _async_setup_discovered(
+        hass, client, [("srv", "one"), ("srv", "two"), ("srv", "three")]
+    )
+
+    await client.send_json(
+        {
+            "id": 10,
+            "type": "nodered/discovery/remove_batch",
+            "server_id": "srv",
+            "node_ids": ["one", "two", "missing"],
+        }
+    )
+    resp = await client.receive_json()
+    await hass.async_block_till_done()
+
+    assert resp["success"]
+    assert resp["result"] == {"removed": ["one", "two"], "not_found": ["missing"]}
+    assert hass.states.get("sensor.one") is None
+    assert hass.states.get("sensor.two") is None
+    assert hass.states.get("sensor.three") is not None
+    ent_reg = er.async_get(hass)
+    assert ent_reg.async_get_entity_id("sensor", DOMAIN, "nodered-srv-one") is None
+    assert ent_reg.async_get_entity_id("sensor", DOMAIN, "nodered-srv-three")
+    index = hass.data[DOMAIN_DATA][ALREADY_DISCOVERED]
+    assert index.nodes("srv") == ["three"]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_websocket_discovery_remove_batch_server(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    client = await hass_ws_client(hass)
+    await _async_setup_discovered(
+        hass, client, [("srv", "one"), ("srv", "two"), ("other", "three")]
+    )
+
+    await client.send_json(
+        {"id": 10, "type": "nodered/discovery/remove_batch", "server_id": "srv"}
+    )
+    resp = await client.receive_json()
+    await hass.async_block_till_done()
+
+    assert resp["result"] == {"removed": ["one", "two"], "not_found": []}
+    assert hass.states.get("sensor.one") is None
+    assert hass.states.get("sensor.two") is None
+    assert hass.states.get("sensor.three") is not None
+
+    # Removed nodes can be discovered again
+    await client.send_json(
+        {
+            "id": 11,
+            "type": "nodered/discovery",
+            "component": "sensor",
+            "server_id": "srv",
+            "node_id": "one",
+            "config": {"name": "one"},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.one") is not None
+
+
+@pytest.mark.asyncio
+async def test_websocket_device_availability(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    client = await hass_ws_client(hass)
+    await _async_setup_discovered(hass, client, [])
+
+    async def discover(msg_id: int, node_id: str, device_id: str | None) -> None:
+        msg: dict[str, Any] = {
+            "id": msg_id,
+            "type": "nodered/discovery",
+            "component": "sensor",
+            "server_id": "srv",
+            "node_id": node_id,
+            "state": "on",
+            "config": {"name": node_id},
+        }
+        if device_id is not None:
+            msg["device_info"] = {"id": device_id, "name": device_id}
+        await client.send_json(msg)
+        assert (await client.receive_json())["success"]
+        await hass.async_block_till_done()
+
+    await discover(10, "one", "dev")
+    await discover(11, "two", "dev")
+    await discover(12, "other", None)
+
+    await client.send_json(
+        {
+            "id": 13,
+            "type": "nodered/device/availability",
+            "node_id": "dev",
+            "available": False,
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["result"] == {"entity_ids": ["sensor.one", "sensor.two"]}
+    assert hass.states.get("sensor.one").state == "unavailable"
+    assert hass.states.get("sensor.two").state == "unavailable"
+    assert hass.states.get("sensor.other").state == "on"
+
+    # Entities added to an unavailable device start unavailable
+    await discover(14, "three", "dev")
+    assert hass.states.get("sensor.three").state == "unavailable"
+
+    # Rediscovery without device info unlinks the entity
+    await discover(15, "two", None)
+
+    await client.send_json(
+        {
+            "id": 16,
+            "type": "nodered/device/availability",
+            "node_id": "dev",
+            "available": True,
+        }
+    )
+    resp = await client.receive_json()
+    assert resp["result"] == {"entity_ids": ["sensor.one", "sensor.three"]}
+    assert hass.states.get("sensor.one").state == "on"
+    assert hass.states.get("sensor.three").state == "on"
+
+
+@pytest.mark.asyncio
+async def test_websocket_entity_attributes_returns_offloaded(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    client = await hass_ws_client(hass)
+    await _async_setup_discovered(hass, client, [])
+    big = list(range(100))
+    await client.send_json(
+        {
+            "id": 10,
+            "type": "nodered/discovery",
+            "component": "sensor",
+            "server_id": "srv",
+            "node_id": "big",
+            "state": 1,
+            "attributes": {"ok": 1, "big": big},
+            "config": {
+                "name": "big",
+                "attribute_budget": 50,
+                "attribute_offload": True,
+            },
+        }
+    )
+    assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+    assert "big" not in hass.states.get("sensor.big").attributes
+
+    await client.send_json(
+        {"id": 11, "type": "nodered/entity/attributes", "entity_id": "sensor.big"}
+    )
+    resp = await client.receive_json()
+    assert resp["success"]
+    assert resp["result"]["big"] == big
+    assert resp["result"]["ok"] == 1
+
+    await client.send_json(
+        {"id": 12, "type": "nodered/entity/attributes", "entity_id": "sensor.none"}
+    )
+    resp = await client.receive_json()
+    assert resp["error"]["code"] == "entity_not_found"
+
+
+@pytest.mark.asyncio
+async def test_websocket_entity_history(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    client = await hass_ws_client(hass)
+    await _async_setup_discovered(hass, client, [("srv", "plain")])
+    await client.send_json(
+        {
+            "id": 10,
+            "type": "nodered/discovery",
+            "component": "sensor",
+            "server_id": "srv",
+            "node_id": "power",
+            "state": 1,
+            "config": {"name": "power", "history": 3},
+        }
+    )
+    assert (await client.receive_json())["success"]
+    for msg_id, state in enumerate((2, "bad", 3, 4), start=11):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "nodered/entity",
+                "server_id": "srv",
+                "node_id": "power",
+                "state": state,
+            }
+        )
+        assert (await client.receive_json())["success"]
+    await hass.async_block_till_done()
+
+    await client.send_json(
+        {"id": 20, "type": "nodered/entity/history", "entity_id": "sensor.power"}
+    )
+    resp = await client.receive_json()
+    assert [value for _time, value in resp["result"]["samples"]] == [2, 3, 4]
+
+    await client.send_json(
+        {
+            "id": 21,
+            "type": "nodered/entity/history",
+            "entity_id": "sensor.power",
+            "window": 60,
+            "aggregate": True,
+        }
+    )
+    result = (await client.receive_json())["result"]
+    assert result["count"] == 3
+    assert result["mean"] == 3
+    assert (result["min"], result["max"], result["last"]) == (2, 4, 4)
+
+    await client.send_json(
+        {"id": 22, "type": "nodered/entity/history", "entity_id": "sensor.plain"}
+    )
+    resp = await client.receive_json()
+    assert resp["error"]["code"] == "not_supported"
+
+    await client.send_json(
+        {"id": 23, "type": "nodered/entity/history", "entity_id": "sensor.none"}
+    )
+    resp = await client.receive_json()
+    assert resp["error"]["code"] == "entity_not_found"
+
+
 @pytest.mark.asyncio
 @patch.object(websocket, "webhook_async_register")
 async def test_websocket_webhook_register_handle_and_remove(
@@ -408,8 +1198,8 @@ async def test_websocket_webhook_register_value_error(
 
 
 @pytest.mark.asyncio
-@patch.object(websocket.trigger, "async_initialize_triggers")
-@patch.object(websocket.trigger, "async_validate_trigger_config")
+@patch("homeassistant.helpers.trigger.async_initialize_triggers")
+@patch("homeassistant.helpers.trigger.async_validate_trigger_config")
 async def test_websocket_device_trigger_success_and_errors(
     mock_validate: Any,
     mock_initialize: Any,
@@ -504,8 +1294,8 @@ async def test_websocket_device_trigger_success_and_errors(
 
 
 @pytest.mark.asyncio
-@patch.object(websocket.trigger, "async_initialize_triggers")
-@patch.object(websocket.trigger, "async_validate_trigger_config")
+@patch("homeassistant.helpers.trigger.async_initialize_triggers")
+@patch("homeassistant.helpers.trigger.async_validate_trigger_config")
 async def test_websocket_device_trigger_remove_on_connection_close(
     mock_validate: Any,
     mock_initialize: Any,